@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Compares the time and memory required to build and query the coverage of a
+large, synthetic test suite when each test stores its own set of lines (the
+representation previously used by BugZoo) against the bit matrix that is
+now used by `TestSuiteCoverage`.
+
+Usage (with BugZoo installed):
+    python benchmarks/coverage_matrix.py --tests 2000 --lines 100000
+"""
+from typing import Any, Callable, Dict, List, Set, Tuple
+from timeit import default_timer as timer
+import argparse
+import gc
+import random
+import tracemalloc
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.coverage import TestCoverage, TestSuiteCoverage
+from bugzoo.core.fileline import FileLine, FileLineSet
+from bugzoo.core.test import TestOutcome
+
+
+def generate(num_tests: int,
+             num_lines: int,
+             num_files: int,
+             density: float,
+             seed: int = 0
+             ) -> List[Tuple[str, bool, Dict[str, List[int]]]]:
+    """
+    Generates the coverage of a synthetic test suite, in which each test
+    covers a random fraction of the lines of the program.
+    """
+    rng = random.Random(seed)
+    lines_per_file = max(num_lines // num_files, 1)
+    suite = []
+    for i in range(num_tests):
+        lines = {}  # type: Dict[str, List[int]]
+        for k in rng.sample(range(num_lines), int(num_lines * density)):
+            fn = 'src/file{}.c'.format(k // lines_per_file)
+            lines.setdefault(fn, []).append(k % lines_per_file + 1)
+        suite.append(('t{}'.format(i), rng.random() < 0.9, lines))
+    return suite
+
+
+def build_dict(suite) -> Dict[str, TestCoverage]:
+    """
+    Builds the previous representation: a set of lines for each test.
+    """
+    cov = {}
+    for (name, passed, lines) in suite:
+        outcome = TestOutcome(ExecResponse(0, 1.0, ''), passed)
+        cov[name] = TestCoverage(name, outcome, FileLineSet.from_dict(lines))
+    return cov
+
+
+def build_matrix(suite) -> TestSuiteCoverage:
+    return TestSuiteCoverage(build_dict(suite))
+
+
+def legacy_operations(cov: Dict[str, TestCoverage],
+                      queries: List[FileLine],
+                      files: List[str],
+                      num_union: int
+                      ) -> Dict[str, Callable[[], Any]]:
+    """
+    Implements the queries of `TestSuiteCoverage` as they were previously
+    implemented, over the set of lines for each test.
+    """
+    def covering_tests():
+        return [set(t for (t, c) in cov.items() if line in c)
+                for line in queries]
+
+    def passing():
+        return {t: c for (t, c) in cov.items() if c.outcome.passed}
+
+    def restricted_to_files():
+        return {t: c.restricted_to_files(files) for (t, c) in cov.items()}
+
+    def lines():
+        output = FileLineSet()
+        for c in list(cov.values())[:num_union]:
+            output = output.union(c.lines)
+        return output
+
+    def covering_tests_union():
+        return set(t for (t, c) in cov.items()
+                   if any(line in c for line in queries))
+
+    return {'covering_tests': covering_tests,
+            'covering_tests (union)': covering_tests_union,
+            'passing': passing,
+            'restricted_to_files': restricted_to_files,
+            'lines': lines}
+
+
+def matrix_operations(cov: TestSuiteCoverage,
+                      queries: List[FileLine],
+                      files: List[str],
+                      num_union: int
+                      ) -> Dict[str, Callable[[], Any]]:
+    subset = cov.matrix.select((1 << num_union) - 1)
+    subset = TestSuiteCoverage(subset)
+    return {'covering_tests': lambda: [cov.covering_tests(l) for l in queries],
+            'covering_tests (union)':
+                lambda: cov.covering_tests_many(queries, union=True),
+            'passing': lambda: cov.passing,
+            'restricted_to_files': lambda: cov.restricted_to_files(files),
+            'lines': lambda: subset.lines}
+
+
+def memory(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """
+    Returns the result of a given function and the memory that it retains.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    (current, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (result, current)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tests', type=int, default=2000,
+                        help='the number of tests in the suite.')
+    parser.add_argument('--lines', type=int, default=100000,
+                        help='the number of lines in the program.')
+    parser.add_argument('--files', type=int, default=500,
+                        help='the number of files in the program.')
+    parser.add_argument('--density', type=float, default=0.02,
+                        help='the fraction of lines covered by each test.')
+    parser.add_argument('--queries', type=int, default=100,
+                        help='the number of lines given to covering_tests.')
+    parser.add_argument('--union', type=int, default=100,
+                        help='the number of tests whose lines are merged by `lines` (the previous implementation is quadratic).')  # noqa: pycodestyle
+    args = parser.parse_args()
+
+    suite = generate(args.tests, args.lines, args.files, args.density)
+    rng = random.Random(1)
+    lines_per_file = max(args.lines // args.files, 1)
+    queries = [FileLine('src/file{}.c'.format(rng.randrange(args.files)),
+                        rng.randrange(lines_per_file) + 1)
+               for _ in range(args.queries)]
+    files = ['src/file{}.c'.format(i) for i in range(0, args.files, 10)]
+    num_union = min(args.union, args.tests)
+    print("suite: {} tests x {} lines ({:.0%} covered per test)".format(
+        args.tests, args.lines, args.density))
+
+    (legacy, mem_legacy) = memory(lambda: build_dict(suite))
+    del legacy
+    (matrix, mem_matrix) = memory(lambda: build_matrix(suite))
+    del matrix
+    print("{:<24} {:>12} {:>12}".format('', 'legacy', 'matrix'))
+    print("{:<24} {:>9.1f} MB {:>9.1f} MB".format(
+        'memory', mem_legacy / 2**20, mem_matrix / 2**20))
+
+    legacy = build_dict(suite)
+    matrix = TestSuiteCoverage(legacy)
+    ops_legacy = legacy_operations(legacy, queries, files, num_union)
+    ops_matrix = matrix_operations(matrix, queries, files, num_union)
+
+    # the first query to covering_tests prepares the inverted index
+    time_start = timer()
+    matrix.covering_tests(queries[0])
+    print("{:<24} {:>12} {:>10.3f} s".format('first covering_tests', '-',
+                                             timer() - time_start))
+    for name in ops_legacy:
+        durations = []
+        for op in (ops_legacy[name], ops_matrix[name]):
+            gc.collect()
+            time_start = timer()
+            op()
+            durations.append(timer() - time_start)
+        print("{:<24} {:>10.3f} s {:>10.3f} s".format(name, *durations))
+
+
+if __name__ == '__main__':
+    main()
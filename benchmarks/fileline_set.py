@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmarks for the set operations of `FileLineSet`, comparing them
+against the previous implementations, which converted sets to lists of
+`FileLine` objects.
+
+Usage (with BugZoo installed):
+    python benchmarks/fileline_set.py --files 200 --lines 500 --sets 50
+"""
+from typing import Any, Callable, Dict, List
+from timeit import default_timer as timer
+import argparse
+import random
+
+from bugzoo.core.fileline import FileLine, FileLineSet
+
+
+def legacy_union(a: FileLineSet, b: FileLineSet) -> FileLineSet:
+    return FileLineSet.from_list(list(a) + list(b))
+
+
+def legacy_intersection(a: FileLineSet, b: FileLineSet) -> FileLineSet:
+    return FileLineSet.from_list(list(set(a) & set(b)))
+
+
+def legacy_filter(s: FileLineSet,
+                  predicate: Callable[[FileLine], bool]
+                  ) -> FileLineSet:
+    return FileLineSet.from_list([line for line in s if predicate(line)])
+
+
+def legacy_union_all(sets: List[FileLineSet]) -> FileLineSet:
+    output = FileLineSet()
+    for s in sets:
+        output = legacy_union(output, s)
+    return output
+
+
+def generate(num_sets: int,
+             num_files: int,
+             num_lines: int,
+             density: float,
+             seed: int = 0
+             ) -> List[FileLineSet]:
+    """
+    Generates a number of random sets of file lines.
+    """
+    rng = random.Random(seed)
+    sets = []
+    for _ in range(num_sets):
+        d = {}  # type: Dict[str, List[int]]
+        for i in range(num_files):
+            k = int(num_lines * density)
+            d['file{}.c'.format(i)] = rng.sample(range(1, num_lines + 1), k)
+        sets.append(FileLineSet.from_dict(d))
+    return sets
+
+
+def time(func: Callable[[], Any], repeats: int) -> float:
+    """
+    Returns the mean number of seconds taken to call a given function.
+    """
+    time_start = timer()
+    for _ in range(repeats):
+        func()
+    return (timer() - time_start) / repeats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=200,
+                        help='the number of files in each set.')
+    parser.add_argument('--lines', type=int, default=500,
+                        help='the number of lines in each file.')
+    parser.add_argument('--density', type=float, default=0.3,
+                        help='the fraction of lines in each set.')
+    parser.add_argument('--sets', type=int, default=50,
+                        help='the number of sets given to union_all.')
+    parser.add_argument('--repeats', type=int, default=5,
+                        help='the number of times each operation is timed.')
+    args = parser.parse_args()
+
+    sets = generate(args.sets, args.files, args.lines, args.density)
+    (a, b) = sets[:2]
+    predicate = lambda line: line.num % 2 == 0
+    print("sets: {} files x {} lines ({:.0%} present)".format(
+        args.files, args.lines, args.density))
+
+    benchmarks = [
+        ('union', lambda: legacy_union(a, b), lambda: a.union(b)),
+        ('intersection',
+         lambda: legacy_intersection(a, b),
+         lambda: a.intersection(b)),
+        ('filter',
+         lambda: legacy_filter(a, predicate),
+         lambda: a.filter(predicate)),
+        ('union_all ({})'.format(args.sets),
+         lambda: legacy_union_all(sets),
+         lambda: FileLineSet.union_all(sets)),
+        ('intersect_all ({})'.format(args.sets),
+         None,
+         lambda: FileLineSet.intersect_all(sets)),
+    ]
+
+    print("{:<20} {:>12} {:>12} {:>8}".format('', 'legacy', 'current', ''))
+    for (name, legacy, current) in benchmarks:
+        repeats = max(args.repeats // 5, 1) if 'all' in name else args.repeats
+        t_current = time(current, repeats)
+        if legacy is None:
+            print("{:<20} {:>12} {:>10.4f} s".format(name, '-', t_current))
+            continue
+        t_legacy = time(legacy, repeats)
+        print("{:<20} {:>10.4f} s {:>10.4f} s {:>7.1f}x".format(
+            name, t_legacy, t_current, t_legacy / t_current))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Compares the time and peak memory required to parse a large, synthetic gcovr
+XML report by loading the whole report into memory (the approach previously
+used by BugZoo) against incremental parsing via `parse_gcovr_report`.
+
+Usage (with BugZoo installed):
+    python benchmarks/gcovr_report.py --files 2000 --lines 2000
+"""
+from typing import Callable, Dict, List, Set, Tuple
+from timeit import default_timer as timer
+import argparse
+import gc
+import os
+import random
+import tempfile
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+from bugzoo.mgr.coverage import parse_gcovr_report
+
+
+def generate_report(fn: str,
+                    num_files: int,
+                    num_lines: int,
+                    coverage: float,
+                    seed: int = 0
+                    ) -> None:
+    """
+    Writes a synthetic gcovr report, describing a given number of files with
+    a given number of lines each, to a given file.
+    """
+    rng = random.Random(seed)
+    with open(fn, 'w') as f:
+        f.write('<?xml version="1.0" ?>\n')
+        f.write('<coverage line-rate="0.5" branch-rate="0.5" version="gcovr">\n')  # noqa: pycodestyle
+        f.write('<sources><source>.</source></sources>\n<packages>\n')
+        f.write('<package name="src" line-rate="0.5" branch-rate="0.5">\n<classes>\n')  # noqa: pycodestyle
+        for i in range(num_files):
+            name = 'src/dir{}/file{}.c'.format(i % 50, i)
+            f.write('<class name="file{0}_c" filename="{1}" line-rate="0.5" branch-rate="0.5">\n'.format(i, name))  # noqa: pycodestyle
+            f.write('<methods/>\n<lines>\n')
+            for n in range(1, num_lines + 1):
+                hits = rng.randint(1, 100) if rng.random() < coverage else 0
+                f.write('<line number="{}" hits="{}" branch="false"/>\n'.format(n, hits))  # noqa: pycodestyle
+            f.write('</lines>\n</class>\n')
+        f.write('</classes>\n</package>\n</packages>\n</coverage>\n')
+
+
+def parse_in_memory(fn: str) -> Dict[str, Set[int]]:
+    """
+    Parses a report by reading it into a string and building its full
+    element tree.
+    """
+    with open(fn, 'rb') as f:
+        s = f.read().decode('utf-8')
+
+    def read_line_coverage(cls) -> Set[int]:
+        lines = cls.find('lines').findall('line')
+        return set(int(l.attrib['number']) for l in lines
+                   if int(l.attrib['hits']) > 0)
+
+    root = ET.fromstring(s)
+    packages = root.find('packages').findall('package')
+    classes = [c for p in packages
+               for c in p.find('classes').findall('class')]
+    report = [(cls.attrib['filename'], read_line_coverage(cls))
+              for cls in classes]
+    return {fn: lines for (fn, lines) in report if lines}
+
+
+def parse_streaming(fn: str) -> Dict[str, Set[int]]:
+    """
+    Parses a report incrementally.
+    """
+    with open(fn, 'rb') as f:
+        return dict(parse_gcovr_report(f))
+
+
+def measure(parse: Callable[[str], Dict[str, Set[int]]],
+            fn: str
+            ) -> Tuple[float, int, Dict[str, Set[int]]]:
+    """
+    Measures the time taken and the peak memory allocated by a given parser.
+    Since tracing memory allocations slows down parsing, time and memory are
+    measured in separate runs.
+    """
+    gc.collect()
+    time_start = timer()
+    result = parse(fn)
+    duration = timer() - time_start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = parse(fn)
+    (_, peak) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return (duration, peak, result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--files', type=int, default=1000,
+                        help='the number of files in the report.')
+    parser.add_argument('--lines', type=int, default=1000,
+                        help='the number of lines in each file.')
+    parser.add_argument('--coverage', type=float, default=0.3,
+                        help='the fraction of lines that are covered.')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as d:
+        fn = os.path.join(d, 'coverage.xml')
+        generate_report(fn, args.files, args.lines, args.coverage)
+        size = os.path.getsize(fn) / (1024 * 1024)
+        print("report: {} files x {} lines ({:.1f} MB)".format(args.files,
+                                                              args.lines,
+                                                              size))
+
+        rows = []  # type: List[Tuple[str, float, int]]
+        results = []  # type: List[Dict[str, Set[int]]]
+        for (name, parse) in [('in-memory', parse_in_memory),
+                              ('streaming', parse_streaming)]:
+            (duration, peak, result) = measure(parse, fn)
+            rows.append((name, duration, peak))
+            results.append(result)
+        assert results[0] == results[1], "parsers disagree"
+
+    for (name, duration, peak) in rows:
+        print("{:<10} {:8.2f} s {:10.1f} MB peak".format(name,
+                                                        duration,
+                                                        peak / (1024 * 1024)))
+
+
+if __name__ == '__main__':
+    main()
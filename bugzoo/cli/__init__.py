@@ -1,6 +1,7 @@
 from typing import List, Optional, Dict
 import sys
 import os
+import time
 import argparse
 import logging
 from operator import itemgetter
@@ -156,6 +157,44 @@ def list_bugs(rbox: 'BugZoo',
     print(tbl)
 
 
+###############################################################################
+# [coverage-cache] group
+###############################################################################
+def list_coverage_cache(rbox: 'BugZoo') -> None:
+    stats = rbox.bugs.coverage_cache.stats()
+    tbl = []
+    hdrs = ['Bug', 'Key', 'Size (bytes)', 'Last Used', 'Stale?']
+    for entry in stats['entries']:
+        key = entry['key'][:12] if entry['key'] else '-'
+        accessed = time.strftime('%Y-%m-%d %H:%M:%S',
+                                 time.localtime(entry['accessed']))
+        stale = 'Yes' if entry['stale'] else 'No'
+        tbl.append([entry['bug'], key, entry['size'], accessed, stale])
+    tbl = tabulate.tabulate(tbl, headers=hdrs, tablefmt='simple')
+    print('')
+    print(tbl)
+    print('')
+    max_size = stats['max-size']
+    max_size = '{} bytes'.format(max_size) if max_size is not None else 'unbounded'  # noqa: pycodestyle
+    print('total: {} bytes (max: {})'.format(stats['size'], max_size))
+
+
+def prune_coverage_cache(rbox: 'BugZoo') -> None:
+    removed = rbox.bugs.coverage_cache.prune()
+    for entry in removed:
+        print('removed stale coverage for bug: {}'.format(entry['bug']))
+    print('pruned {} entries'.format(len(removed)))
+
+
+def evict_coverage_cache(rbox: 'BugZoo', max_size: int) -> None:
+    if max_size < 0:
+        error("maximum size must be non-negative")
+    removed = rbox.bugs.coverage_cache.evict(max_size)
+    for entry in removed:
+        print('evicted coverage for bug: {}'.format(entry['bug']))
+    print('evicted {} entries'.format(len(removed)))
+
+
 ###############################################################################
 # [tool] group
 ###############################################################################
@@ -523,6 +562,27 @@ def build_parser():
                                                  quiet=args.quiet,
                                                  show_installed=args.installed))
 
+    ###########################################################################
+    # [coverage-cache] group
+    ###########################################################################
+    g_cache = subparsers.add_parser('coverage-cache')
+    g_subparsers = g_cache.add_subparsers()
+
+    # [coverage-cache list]
+    cmd = g_subparsers.add_parser('list')
+    cmd.set_defaults(func=lambda args: list_coverage_cache(rbox))
+
+    # [coverage-cache prune]
+    cmd = g_subparsers.add_parser('prune')
+    cmd.set_defaults(func=lambda args: prune_coverage_cache(rbox))
+
+    # [coverage-cache evict :max-size]
+    cmd = g_subparsers.add_parser('evict')
+    cmd.add_argument('max_size',
+                     type=int,
+                     help='the maximum number of bytes that may be occupied by the cache.')  # noqa: pycodestyle
+    cmd.set_defaults(func=lambda args: evict_coverage_cache(rbox, args.max_size))  # noqa: pycodestyle
+
     return parser
 
 
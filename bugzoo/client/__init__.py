@@ -5,6 +5,7 @@ from .bug import BugManager
 from .container import ContainerManager
 from .file import FileManager
 from .dockerm import DockerManager
+from .job import JobManager
 from ..exceptions import ConnectionFailure
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
@@ -38,6 +39,7 @@ class Client(object):
         self.__containers = ContainerManager(self.__api)
         self.__files = FileManager(self.__api, self.__bugs)
         self.__docker = DockerManager(self.__api)
+        self.__jobs = JobManager(self.__api)
 
     @property
     def bugs(self) -> BugManager:
@@ -55,6 +57,10 @@ class Client(object):
     def docker(self) -> DockerManager:
         return self.__docker
 
+    @property
+    def jobs(self) -> JobManager:
+        return self.__jobs
+
     def shutdown(self) -> None:
         r = self.__api.post("shutdown")
         if r.status_code != 202:
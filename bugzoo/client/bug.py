@@ -1,9 +1,10 @@
-from typing import Iterator
+from typing import Iterator, Dict, Any, List
 import logging
 
 from .api import APIClient
 from ..core.bug import Bug
 from ..core.coverage import TestSuiteCoverage
+from ..core.job import JobStatus
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
 
@@ -82,13 +83,86 @@ class BugManager(object):
         if r.status_code == 200:
             jsn = r.json()
             coverage = TestSuiteCoverage.from_dict(jsn)  # type: ignore
-            logger.info("Fetched coverage information for snapshot: %s",
-                        bug.name)
+            cached = r.headers.get('X-BugZoo-Coverage-Cached') == 'yes'
+            logger.info("Fetched coverage information for snapshot: %s (cached: %s)",  # noqa: pycodestyle
+                        bug.name, cached)
             return coverage
         logger.error("Failed to fetch coverage information for snapshot: %s",
                      bug.name)
         self.__api.handle_erroneous_response(r)
 
+    def coverage_async(self, bug: Bug) -> JobStatus:
+        """
+        Computes coverage information for a given bug in the background.
+
+        Returns:
+            the status of the job that computes coverage. Once the job has
+            succeeded, its result is a description of the coverage (see
+            `TestSuiteCoverage.from_dict`).
+        """
+        r = self.__api.get('bugs/{}/coverage'.format(bug.name),
+                           params={'async': 'yes'})
+        if r.status_code == 202:
+            return JobStatus.from_dict(r.json())
+        self.__api.handle_erroneous_response(r)
+
+    def history(self, bug: Bug) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns statistics about the recorded executions of each test for a
+        given bug, including its failure rate and the percentiles of its
+        durations.
+        """
+        r = self.__api.get('bugs/{}/history'.format(bug.name))
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
+    def history_stats(self) -> Dict[str, Any]:
+        """
+        Returns aggregate statistics over all of the test executions that
+        have been recorded by the server.
+        """
+        r = self.__api.get('history')
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
+    def coverage_cache(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the contents of the coverage cache of the
+        server, describing each of its entries and whether it is stale.
+        """
+        r = self.__api.get('coverage-cache')
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
+    def prune_coverage_cache(self) -> List[Dict[str, Any]]:
+        """
+        Removes all stale entries from the coverage cache of the server.
+
+        Returns:
+            a description of each removed entry.
+        """
+        r = self.__api.post('coverage-cache/prune')
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
+    def evict_coverage_cache(self, max_size: int) -> List[Dict[str, Any]]:
+        """
+        Removes the least recently used entries from the coverage cache of
+        the server until it occupies no more than a given number of bytes.
+
+        Returns:
+            a description of each removed entry.
+        """
+        r = self.__api.post('coverage-cache/evict',
+                            params={'max-size': max_size})
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
     def uninstall(self, bug: Bug) -> bool:
         r = self.__api.post('bugs/{}/uninstall'.format(bug.name))
         raise NotImplementedError
@@ -115,3 +189,16 @@ class BugManager(object):
           raise KeyError("no bug found with given name: {}".format(bug.name))
 
         self.__api.handle_erroneous_response(r)
+
+    def build_async(self, bug: Bug) -> JobStatus:
+        """
+        Builds the Docker image for a given bug in the background.
+
+        Returns:
+            the status of the job that builds the image.
+        """
+        r = self.__api.post('bugs/{}/build'.format(bug.name),
+                            params={'async': 'yes'})
+        if r.status_code == 202:
+            return JobStatus.from_dict(r.json())
+        self.__api.handle_erroneous_response(r)
@@ -1,5 +1,6 @@
-from typing import Iterator, Optional
+from typing import Iterator, Optional, Dict, Any, List, Tuple
 import logging
+import json
 
 from .api import APIClient
 from ..compiler import CompilationOutcome
@@ -9,6 +10,7 @@ from ..core.bug import Bug
 from ..core.container import Container
 from ..core.coverage import TestSuiteCoverage
 from ..core.test import TestCase, TestOutcome
+from ..core.job import JobStatus
 from ..cmd import ExecResponse
 from ..exceptions import BugZooException
 
@@ -104,9 +106,18 @@ class ContainerManager(object):
 
         self.__api.handle_erroneous_response(r)
 
-    def provision(self, bug: Bug) -> Container:
+    def provision(self, bug: Bug, *, reset: bool = False) -> Container:
+        """
+        Provisions a container for a given bug.
+
+        Parameters:
+            bug: the bug for which a container should be provisioned.
+            reset: if `True`, the baseline for the container is recorded
+                once it has been provisioned, allowing it to be reset.
+        """
         logger.info("provisioning container for bug: %s", bug.name)
-        r = self.__api.post('bugs/{}/provision'.format(bug.name))
+        r = self.__api.post('bugs/{}/provision'.format(bug.name),
+                            params={'reset': 'yes' if reset else 'no'})
 
         if r.status_code == 200:
             container = Container.from_dict(r.json())
@@ -120,6 +131,140 @@ class ContainerManager(object):
 
         self.__api.handle_erroneous_response(r)
 
+    def provision_async(self, bug: Bug, *, reset: bool = False) -> JobStatus:
+        """
+        Provisions a container for a given bug in the background.
+
+        See: `provision`
+
+        Returns:
+            the status of the job that provisions the container. Once the
+            job has succeeded, its result is a description of the container
+            (see `Container.from_dict`).
+        """
+        r = self.__api.post('bugs/{}/provision'.format(bug.name),
+                            params={'async': 'yes',
+                                    'reset': 'yes' if reset else 'no'})
+        if r.status_code == 202:
+            return JobStatus.from_dict(r.json())
+        self.__api.handle_erroneous_response(r)
+
+    def provision_many(self,
+                       bug: Bug,
+                       n: int,
+                       *,
+                       workers: Optional[int] = None,
+                       reset: bool = False
+                       ) -> Iterator[Container]:
+        """
+        Concurrently provisions a number of containers for a given bug.
+
+        Parameters:
+            bug: the bug for which containers should be provisioned.
+            n: the number of containers that should be provisioned.
+            workers: the maximum number of containers that the server may
+                provision at the same time.
+            reset: if `True`, the baseline for each container is recorded
+                once it has been provisioned.
+
+        Returns:
+            an iterator over the provisioned containers, in the order in which
+            they became ready.
+
+        Raises:
+            KeyError: if no bug is registered with the given name.
+            BugZooException: if the server failed to provision one or more of
+                the containers. The exception is raised once the containers
+                that were successfully provisioned have been returned.
+        """
+        logger.info("provisioning %d containers for bug: %s", n, bug.name)
+        path = 'bugs/{}/provision-many'.format(bug.name)
+        payload = {'n': n, 'workers': workers, 'reset': reset}
+        r = self.__api.post(path, json=payload, stream=True)
+
+        if r.status_code == 404:
+            raise KeyError("no bug registered with given name: {}".format(bug.name))
+        if r.status_code != 200:
+            self.__api.handle_erroneous_response(r)
+
+        def read() -> Iterator[Container]:
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                jsn = json.loads(line.decode('utf-8'))
+                if 'error' in jsn:
+                    raise BugZooException.from_dict(jsn)
+                container = Container.from_dict(jsn)
+                logger.info("provisioned container (id: %s) for bug: %s",
+                            container.uid, bug.name)
+                yield container
+        return read()
+
+    def warm(self, bug: Bug) -> None:
+        """
+        Instructs the server to begin keeping warm containers for a given bug
+        in its container pool, allowing future provisioning requests for that
+        bug to be answered immediately.
+
+        Raises:
+            KeyError: if no bug is registered with the given name.
+        """
+        r = self.__api.post('pool/{}'.format(bug.name))
+
+        if r.status_code == 202:
+            return
+        if r.status_code == 404:
+            raise KeyError("no bug registered with given name: {}".format(bug.name))
+
+        self.__api.handle_erroneous_response(r)
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the configuration and hit/miss statistics of the
+        server's pool of warm containers.
+        """
+        r = self.__api.get('pool')
+
+        if r.status_code == 200:
+            return r.json()
+
+        self.__api.handle_erroneous_response(r)
+
+    def test_stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the number of tests that have been executed by
+        the server, the number of test outcomes that were obtained from its
+        cache, and the number of test executions that were saved by
+        terminating test runs early.
+        """
+        r = self.__api.get('test-stats')
+
+        if r.status_code == 200:
+            return r.json()
+
+        self.__api.handle_erroneous_response(r)
+
+    def outcome_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns a summary of the configuration and hit/miss statistics of the
+        server's test outcome cache.
+        """
+        r = self.__api.get('outcome-cache')
+
+        if r.status_code == 200:
+            return r.json()
+
+        self.__api.handle_erroneous_response(r)
+
+    def clear_outcome_cache(self) -> None:
+        """
+        Removes all outcomes from the server's test outcome cache.
+        """
+        r = self.__api.delete('outcome-cache')
+
+        if r.status_code != 204:
+            self.__api.handle_erroneous_response(r)
+
     def is_alive(self, container: Container) -> bool:
         """
         Determines whether or not a given container is still alive.
@@ -135,17 +280,39 @@ class ContainerManager(object):
 
         self.__api.handle_erroneous_response(r)
 
-    def extract_coverage(self, container: Container) -> FileLineSet:
+    def extract_coverage(self,
+                         container: Container,
+                         *,
+                         reset: bool = True
+                         ) -> FileLineSet:
         """
-        Extracts a report of the lines that have been executed since the last
-        time that a coverage report was extracted.
+        Extracts a report of the lines that have been executed since the
+        coverage counters were last reset.
+
+        Parameters:
+            container: the container from which coverage should be extracted.
+            reset: if True, the coverage counters are reset once the report
+                has been extracted.
         """
         uid = container.uid
-        r = self.__api.post('containers/{}/read-coverage'.format(uid))
+        r = self.__api.post('containers/{}/read-coverage'.format(uid),
+                            params={'reset': 'yes' if reset else 'no'})
         if r.status_code == 200:
             return FileLineSet.from_dict(r.json())
         self.__api.handle_erroneous_response(r)
 
+    def reset_coverage(self, container: Container) -> None:
+        """
+        Resets the coverage counters for the program inside a given
+        container without extracting a coverage report.
+
+        Raises:
+            FailedToComputeCoverage: if the counters could not be reset.
+        """
+        r = self.__api.post('containers/{}/reset-coverage'.format(container.uid))  # noqa: pycodestyle
+        if r.status_code != 204:
+            self.__api.handle_erroneous_response(r)
+
     def instrument(self,
                    container: Container
                    ) -> None:
@@ -192,6 +359,29 @@ class ContainerManager(object):
 
     build = compile
 
+    def compile_async(self,
+                      container: Container,
+                      verbose: bool = False
+                      ) -> JobStatus:
+        """
+        Compiles the program inside a given container in the background.
+
+        Returns:
+            the status of the job that compiles the program. Once the job
+            has succeeded, its result is a description of the outcome of the
+            compilation (see `CompilationOutcome.from_dict`).
+        """
+        path = "containers/{}/build".format(container.uid)
+        params = {'async': 'yes'}
+        if verbose:
+            params['verbose'] = 'yes'
+        r = self.__api.post(path, params=params)
+        if r.status_code == 202:
+            return JobStatus.from_dict(r.json())
+        self.__api.handle_erroneous_response(r)
+
+    build_async = compile_async
+
     def test(self,
              container: Container,
              test: TestCase
@@ -217,6 +407,137 @@ class ContainerManager(object):
             return TestOutcome.from_dict(r.json())
         self.__api.handle_erroneous_response(r)
 
+    def run_tests(self,
+                  container: Container,
+                  tests: Optional[List[TestCase]] = None,
+                  *,
+                  workers: Optional[int] = None,
+                  stop_on_failure: bool = False,
+                  stop_on_unexpected: bool = False,
+                  fitness_threshold: Optional[int] = None,
+                  order: str = 'given',
+                  batch_size: Optional[int] = None
+                  ) -> Iterator[Tuple[TestCase, TestOutcome]]:
+        """
+        Runs a number of tests inside a given container. The tests are
+        executed concurrently if the test harness for the bug permits it.
+
+        Parameters:
+            container: the container in which the tests should be executed.
+            tests: the tests that should be executed. Defaults to all of the
+                tests for the bug.
+            workers: the maximum number of tests that the server may execute
+                at the same time.
+            stop_on_failure: if `True`, no further tests will be executed
+                once a test has failed.
+            stop_on_unexpected: if `True`, no further tests will be executed
+                once a test has produced an outcome that differs from its
+                expected outcome.
+            fitness_threshold: if given, no further tests will be executed
+                once it is no longer possible for this many tests to pass.
+            order: the order in which the tests should be started: either
+                `given`, `longest-first`, `shortest-first`, or `priority`.
+                The latter three options are based on the durations and
+                outcomes of recent executions; `priority` starts the tests
+                that are most likely to fail, relative to their duration,
+                first.
+            batch_size: if given, the server executes the tests in batches
+                of up to this many tests, using a single command per batch.
+                Reduces the overhead of executing many short tests.
+
+        Returns:
+            an iterator over the tests and their outcomes, in the order in
+            which the tests finished.
+
+        Raises:
+            ContainerNotFound: if the container no longer exists.
+            TestNotFound: if one of the given tests doesn't exist.
+            BugZooException: if the server failed to execute one or more of
+                the tests. The exception is raised once the outcomes of the
+                remaining tests have been returned.
+        """
+        path = "containers/{}/tests".format(container.uid)
+        payload = self.__tests_payload(tests,
+                                       workers,
+                                       stop_on_failure,
+                                       stop_on_unexpected,
+                                       fitness_threshold,
+                                       order,
+                                       batch_size)
+        payload['stream'] = True
+        r = self.__api.post(path, json=payload, stream=True)
+        if r.status_code != 200:
+            self.__api.handle_erroneous_response(r)
+
+        def read() -> Iterator[Tuple[TestCase, TestOutcome]]:
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                jsn = json.loads(line.decode('utf-8'))
+                if 'error' in jsn:
+                    raise BugZooException.from_dict(jsn)
+                test = TestCase.from_dict(jsn['test'])
+                outcome = TestOutcome.from_dict(jsn['outcome'])
+                yield (test, outcome)
+        return read()
+
+    def test_many(self,
+                  container: Container,
+                  tests: Optional[List[TestCase]] = None,
+                  *,
+                  workers: Optional[int] = None,
+                  stop_on_failure: bool = False,
+                  stop_on_unexpected: bool = False,
+                  fitness_threshold: Optional[int] = None,
+                  order: str = 'given',
+                  batch_size: Optional[int] = None
+                  ) -> List[Tuple[TestCase, TestOutcome]]:
+        """
+        Runs a number of tests inside a given container using a single
+        request, and returns their outcomes once all of the tests have
+        finished.
+
+        See: `run_tests`
+
+        Returns:
+            a list of the tests and their outcomes, in the order in which the
+            tests finished.
+        """
+        path = "containers/{}/tests".format(container.uid)
+        payload = self.__tests_payload(tests,
+                                       workers,
+                                       stop_on_failure,
+                                       stop_on_unexpected,
+                                       fitness_threshold,
+                                       order,
+                                       batch_size)
+        payload['stream'] = False
+        r = self.__api.post(path, json=payload)
+        if r.status_code == 200:
+            return [(TestCase.from_dict(jsn['test']),
+                     TestOutcome.from_dict(jsn['outcome']))
+                    for jsn in r.json()]
+        self.__api.handle_erroneous_response(r)
+
+    def __tests_payload(self,
+                        tests: Optional[List[TestCase]],
+                        workers: Optional[int],
+                        stop_on_failure: bool,
+                        stop_on_unexpected: bool,
+                        fitness_threshold: Optional[int],
+                        order: str,
+                        batch_size: Optional[int]
+                        ) -> Dict[str, Any]:
+        payload = {'workers': workers,
+                   'stop-on-failure': stop_on_failure,
+                   'stop-on-unexpected': stop_on_unexpected,
+                   'fitness-threshold': fitness_threshold,
+                   'order': order,
+                   'batch-size': batch_size}  # type: Dict[str, Any]
+        if tests is not None:
+            payload['tests'] = [t.name for t in tests]
+        return payload
+
     def coverage(self,
                  container: Container,
                  *,
@@ -251,6 +572,28 @@ class ContainerManager(object):
             logger.exception("Failed to fetch coverage information for container %s due to unexpected failure: %s", uid, err)  # noqa: pycodestyle
             raise
 
+    def coverage_async(self,
+                       container: Container,
+                       *,
+                       instrument: bool = True
+                       ) -> JobStatus:
+        """
+        Computes complete test suite coverage for a given container in the
+        background.
+
+        Returns:
+            the status of the job that computes coverage. Once the job has
+            succeeded, its result is a description of the coverage (see
+            `TestSuiteCoverage.from_dict`).
+        """
+        uri = 'containers/{}/coverage'.format(container.uid)
+        params = {'instrument': 'yes' if instrument else 'no',
+                  'async': 'yes'}
+        r = self.__api.post(uri, params=params)
+        if r.status_code == 202:
+            return JobStatus.from_dict(r.json())
+        self.__api.handle_erroneous_response(r)
+
     def exec(self,
              container: Container,
              command: str,
@@ -319,6 +662,81 @@ class ContainerManager(object):
 
         return r.status_code == 204
 
+    def reset(self,
+              container: Container,
+              build_outputs: bool = False
+              ) -> None:
+        """
+        Restores the source code for the program inside a given container to
+        its baseline state, without destroying the container. The container
+        must have been provisioned with `reset` enabled.
+
+        Parameters:
+            container: the container that should be reset.
+            build_outputs: if `True`, any build outputs are also removed.
+
+        Raises:
+            ContainerNotFound: if the given container does not exist on the
+                server.
+            FailedToResetContainer: if the container could not be reset, or
+                if it was not provisioned with `reset` enabled.
+        """
+        path = "containers/{}/reset".format(container.uid)
+        params = {}
+        if build_outputs:
+            params['build-outputs'] = 'yes'
+        r = self.__api.post(path, params=params)
+        if r.status_code != 204:
+            logger.info("failed to reset container: %s", container.uid)
+            self.__api.handle_erroneous_response(r)
+
+    def clone(self,
+              container: Container,
+              n: int,
+              *,
+              workers: Optional[int] = None
+              ) -> Iterator[Container]:
+        """
+        Creates a number of copies of a given container, including any build
+        artifacts and changes to its file system.
+
+        Parameters:
+            container: the container that should be copied.
+            n: the number of copies that should be made.
+            workers: the maximum number of copies that the server may start
+                at the same time.
+
+        Returns:
+            an iterator over the copies, in the order in which they became
+            ready.
+
+        Raises:
+            ContainerNotFound: if the given container does not exist on the
+                server.
+            BugZooException: if the server failed to create one or more of
+                the copies. The exception is raised once the copies that were
+                successfully created have been returned.
+        """
+        logger.info("cloning container %s %d times", container.uid, n)
+        path = 'containers/{}/clone'.format(container.uid)
+        payload = {'n': n, 'workers': workers}
+        r = self.__api.post(path, json=payload, stream=True)
+        if r.status_code != 200:
+            self.__api.handle_erroneous_response(r)
+
+        def read() -> Iterator[Container]:
+            for line in r.iter_lines():
+                if not line:
+                    continue
+                jsn = json.loads(line.decode('utf-8'))
+                if 'error' in jsn:
+                    raise BugZooException.from_dict(jsn)
+                clone = Container.from_dict(jsn)
+                logger.info("cloned container %s: %s",
+                            container.uid, clone.uid)
+                yield clone
+        return read()
+
     def persist(self, container: Container, image_name: str) -> None:
         """
         Persists the state of a given container as a Docker image on the
@@ -1,4 +1,4 @@
-from typing import Iterator, Optional
+from typing import Iterator, Optional, Dict, List
 import logging
 import os
 
@@ -54,3 +54,65 @@ class FileManager(object):
             logger.exception("failed to read contents of file [%s] in container [%s]: %s",  # noqa: pycodestyle
                              filepath, container.uid, err)
             raise
+
+    def read_many(self,
+                  container: Container,
+                  filepaths: List[str]
+                  ) -> Dict[str, str]:
+        """
+        Retrieves the contents of a number of files in a running container
+        using a single request.
+
+        Parameters:
+            container: the container from which the files should be fetched.
+            filepaths: the paths to the files. Relative paths are interpreted
+                as being relative to the source directory for the program
+                under test inside the container.
+
+        Returns:
+            a dictionary that maps each of the given paths to the contents of
+            its file.
+
+        Raises:
+            FileNotFound: if one or more of the files were not found.
+        """
+        logger.debug("reading contents of files %s in container [%s].",
+                     filepaths, container.uid)
+        path = "files/{}".format(container.uid)
+        response = self.__api.post(path, json=filepaths)
+        if response.status_code == 200:
+            return response.json()
+        try:
+            self.__api.handle_erroneous_response(response)
+        except BugZooException as err:
+            logger.exception("failed to read contents of files %s in container [%s]: %s",  # noqa: pycodestyle
+                             filepaths, container.uid, err)
+            raise
+
+    def write_many(self,
+                   container: Container,
+                   files: Dict[str, str]
+                   ) -> None:
+        """
+        Writes the contents of a number of files in a running container using
+        a single request, replacing any existing files.
+
+        Parameters:
+            container: the container to which the files should be written.
+            files: a dictionary that maps the path of each file to its
+                contents. Relative paths are interpreted as being relative to
+                the source directory for the program under test inside the
+                container.
+        """
+        logger.debug("writing contents of files %s in container [%s].",
+                     list(files), container.uid)
+        path = "files/{}".format(container.uid)
+        response = self.__api.put(path, json=files)
+        if response.status_code == 204:
+            return
+        try:
+            self.__api.handle_erroneous_response(response)
+        except BugZooException as err:
+            logger.exception("failed to write contents of files %s in container [%s]: %s",  # noqa: pycodestyle
+                             list(files), container.uid, err)
+            raise
@@ -0,0 +1,131 @@
+from typing import Iterator, Optional, Any
+from timeit import default_timer as timer
+import logging
+
+from .api import APIClient
+from ..core.job import JobStatus
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['JobManager']
+
+
+class JobManager(object):
+    """
+    Provides access to the long-running operations (i.e., jobs) that are
+    being performed in the background by the server.
+    """
+    # the maximum number of seconds that the server is asked to wait for a
+    # job to finish before responding to each status request
+    POLL_INTERVAL = 30.0
+
+    def __init__(self, api: APIClient) -> None:
+        self.__api = api
+
+    def __getitem__(self, id: str) -> JobStatus:
+        """
+        Retrieves the current status of a given job.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+        """
+        return self.status(id)
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Returns an iterator over the IDs of the jobs on the server.
+        """
+        r = self.__api.get('jobs')
+        if r.status_code == 200:
+            yield from r.json()
+            return
+        self.__api.handle_erroneous_response(r)
+
+    def status(self, id: str, wait: float = 0.0) -> JobStatus:
+        """
+        Retrieves the status of a given job.
+
+        Parameters:
+            id: the ID of the job.
+            wait: the maximum number of seconds that the server should wait
+                for the job to finish before returning its status.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+        """
+        params = {'wait': wait} if wait > 0 else {}
+        r = self.__api.get('jobs/{}'.format(id), params=params)
+        if r.status_code == 200:
+            return JobStatus.from_dict(r.json())
+        self.__api.handle_erroneous_response(r)
+
+    def wait(self, id: str, timeout: Optional[float] = None) -> JobStatus:
+        """
+        Blocks until a given job has finished.
+
+        Parameters:
+            id: the ID of the job.
+            timeout: the maximum number of seconds to wait for the job to
+                finish. If unspecified, waits indefinitely.
+
+        Returns:
+            the status of the job once it has finished, or its latest status
+            if the timeout expired.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+        """
+        logger.debug("waiting for job to finish: %s", id)
+        time_start = timer()
+        while True:
+            wait = JobManager.POLL_INTERVAL
+            if timeout is not None:
+                wait = min(wait, timeout - (timer() - time_start))
+            status = self.status(id, wait=max(wait, 0.0))
+            if status.done:
+                logger.debug("job finished (%s): %s", status.state, id)
+                return status
+            if timeout is not None and timer() - time_start >= timeout:
+                logger.debug("timed out waiting for job to finish: %s", id)
+                return status
+
+    def result(self, id: str, timeout: Optional[float] = None) -> Any:
+        """
+        Waits for a given job to finish and retrieves its JSON-ready result.
+
+        Parameters:
+            id: the ID of the job.
+            timeout: the maximum number of seconds to wait for the job to
+                finish. If unspecified, waits indefinitely.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+            JobNotFinished: if the job did not finish within the timeout.
+            JobCancelled: if the job was cancelled.
+            BugZooException: the exception that caused the job to fail.
+        """
+        self.wait(id, timeout)
+        r = self.__api.get('jobs/{}/result'.format(id))
+        if r.status_code == 200:
+            return r.json()
+        self.__api.handle_erroneous_response(r)
+
+    def cancel(self, id: str) -> bool:
+        """
+        Requests the cancellation of a given job.
+
+        Returns:
+            `True` if cancellation was requested, or `False` if the job had
+            already finished.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+            JobNotCancellable: if the job has started and cannot be
+                cancelled.
+        """
+        r = self.__api.delete('jobs/{}'.format(id))
+        if r.status_code == 202:
+            return True
+        if r.status_code == 204:
+            return False
+        self.__api.handle_erroneous_response(r)
@@ -174,7 +174,8 @@ class SimpleCompiler(Compiler):
         cmd_outcome = manager_container.command(container,
                                                 command,
                                                 context=context,
-                                                stderr=True)
+                                                stderr=True,
+                                                modifies_source=False)
         logger.debug("compiled container [%s]", container.uid)
         return CompilationOutcome(cmd_outcome)
 
@@ -189,7 +190,8 @@ class SimpleCompiler(Compiler):
         response = manager_container.command(container,
                                              self.__command_clean,
                                              context=context,
-                                             stderr=True)
+                                             stderr=True,
+                                             modifies_source=False)
 
     # TODO decouple!
     def compile(self, # type: ignore
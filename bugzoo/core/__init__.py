@@ -1,4 +1,4 @@
 from .language import Language
 from .patch import Patch
-from .fileline import FileLine, FileLineSet
+from .fileline import FileLine, FileLineSet, FileLineSetBuilder
 from .test import TestCase, TestOutcome, TestSuite
@@ -12,6 +12,9 @@ class Bug(object):
     point in time, allowing it to be empirically studied and inspected in a
     transparent and reproducible manner.
     """
+    # the tools that may be used to extract coverage information
+    COVERAGE_BACKENDS = ('gcovr', 'gcov-json', 'gcov')
+
     @staticmethod
     def from_dict(d: Dict[str, Any]) -> 'Bug':
         # TODO refactor
@@ -24,6 +27,11 @@ class Bug(object):
         else:
             files_to_instrument = None
 
+        coverage_backend = d.get('coverage', {}).get('backend', 'gcovr')
+        if coverage_backend not in Bug.COVERAGE_BACKENDS:
+            msg = "failed to unpack bug: unknown coverage backend: {}"
+            raise ValueError(msg.format(coverage_backend))
+
         return Bug(name=d['name'],
                    image=d['image'],
                    dataset=d['dataset'],
@@ -33,7 +41,8 @@ class Bug(object):
                    languages=languages,
                    harness=harness,
                    compiler=compiler,
-                   files_to_instrument=files_to_instrument)
+                   files_to_instrument=files_to_instrument,
+                   coverage_backend=coverage_backend)
 
     def __init__(self,
                  name: str,
@@ -45,7 +54,8 @@ class Bug(object):
                  languages: List[Language],
                  harness: TestSuite,
                  compiler: Compiler,
-                 files_to_instrument: Optional[List[str]]
+                 files_to_instrument: Optional[List[str]],
+                 coverage_backend: str = 'gcovr'
                  ) -> None:
         """
         Constructs a new bug description.
@@ -63,6 +73,12 @@ class Bug(object):
                 execution environment for this bug.
             compiler: instructions for compiling the bug.
             files_to_instrument: a list of the 
+            coverage_backend: the name of the tool that should be used to
+                extract coverage information: `gcovr`, which produces an XML
+                report; `gcov-json`, which invokes gcov directly using its
+                JSON format (GCC 9 and later); or `gcov`, which invokes gcov
+                directly using its intermediate text format (GCC 8 and
+                earlier).
         """
         assert name != ""
         assert program != ""
@@ -70,6 +86,7 @@ class Bug(object):
         assert source != ""
         assert image != ""
         assert languages != []
+        assert coverage_backend in Bug.COVERAGE_BACKENDS
 
         if files_to_instrument is None:
             files_to_instrument = []
@@ -87,6 +104,7 @@ class Bug(object):
         self.__test_harness = harness
         self.__compiler = compiler
         self.__files_to_instrument = files_to_instrument
+        self.__coverage_backend = coverage_backend
 
     def to_dict(self) -> dict:
         """
@@ -104,7 +122,8 @@ class Bug(object):
             'compiler': self.compiler.to_dict(),
             'test-harness': self.harness.to_dict(),
             'coverage': {
-                'files-to-instrument': self.files_to_instrument.copy()
+                'files-to-instrument': self.files_to_instrument.copy(),
+                'backend': self.coverage_backend
             }
         }
         return jsn
@@ -193,3 +212,11 @@ class Bug(object):
         instrumented when computing coverage.
         """
         return self.__files_to_instrument.copy()
+
+    @property
+    def coverage_backend(self) -> str:
+        """
+        The name of the tool that is used to extract coverage information
+        for this bug.
+        """
+        return self.__coverage_backend
@@ -1,8 +1,10 @@
-from typing import Dict, List, Set, Iterator, Any
+from typing import Dict, List, Set, Iterator, Iterable, Any, Union
 
 import yaml
 
 from .fileline import FileLine, FileLineSet
+from .matrix import CoverageMatrix
+from . import coverage_file
 from .test import TestSuite, TestOutcome
 from ..util import indent
 
@@ -97,42 +99,123 @@ class TestCoverage(object):
 class TestSuiteCoverage(object):
     """
     Holds coverage information for all tests belonging to a particular program
-    version.
+    version. Coverage is stored as a compact bit matrix of tests and lines
+    (see `CoverageMatrix`), and the coverage of individual tests is
+    materialised on demand.
     """
     @staticmethod
     def from_dict(d: dict) -> 'TestSuiteCoverage':
-        coverage_by_test = {}
-        for test_coverage_dict in d.values():
-            test_coverage = TestCoverage.from_dict(test_coverage_dict)
-            coverage_by_test[test_coverage.test] = test_coverage
-        return TestSuiteCoverage(coverage_by_test)
+        matrix = CoverageMatrix.build(
+            (cov['test'],
+             TestOutcome.from_dict(cov['outcome']),
+             FileLineSet.from_dict(cov['coverage']))
+            for cov in d.values())
+        return TestSuiteCoverage(matrix)
 
     @staticmethod
     def from_file(fn: str) -> 'TestSuiteCoverage':
+        """
+        Loads coverage from a given file, written either in the binary
+        coverage format (see `bugzoo.core.coverage_file`) or as YAML.
+
+        Raises:
+            ValueError: if the file is written in an unsupported version of
+                the binary coverage format, or is corrupt.
+        """
+        if coverage_file.is_coverage_file(fn):
+            return TestSuiteCoverage(coverage_file.load(fn))
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
         with open(fn, 'r') as f:
-            d = yaml.load(f)
+            d = yaml.load(f, Loader=loader)
             return TestSuiteCoverage.from_dict(d)
 
-    def __init__(self, test_coverage: Dict[str, TestCoverage]) -> None:
-        self.__test_coverage = test_coverage
+    def to_file(self, fn: str) -> None:
+        """
+        Writes this coverage to a given file using the binary coverage
+        format.
+        """
+        with open(fn, 'wb') as f:
+            coverage_file.dump(self.__matrix, f)
+
+    def __init__(self,
+                 test_coverage: Union[Dict[str, TestCoverage], CoverageMatrix]
+                 ) -> None:
+        """
+        Parameters:
+            test_coverage: either the coverage for each test, indexed by the
+                name of the test, or a coverage matrix.
+        """
+        if not isinstance(test_coverage, CoverageMatrix):
+            test_coverage = CoverageMatrix.build(
+                (name, cov.outcome, cov.lines)
+                for (name, cov) in test_coverage.items())
+        self.__matrix = test_coverage
 
     def __repr__(self) -> str:
         output = [repr(self[name_test]) for name_test in self]
         return '\n'.join(output)
 
+    @property
+    def matrix(self) -> CoverageMatrix:
+        """
+        The bit matrix that describes the coverage of each test.
+        """
+        return self.__matrix
+
     def covering_tests(self, line: FileLine) -> Set[str]:
         """
-        Returns the names of all test cases that cover a given line.
+        Returns the names of all test cases that cover a given line. Results
+        are cached in an inverted index that is built lazily.
         """
-        return set(test for (test, cov) in self.__test_coverage.items() \
-                   if line in cov)
+        line_id = self.__matrix.index.id(line)
+        if line_id is None:
+            return set()
+        return set(self.__matrix.names(self.__matrix.covering(line_id)))
+
+    def covering_tests_many(self,
+                            lines: Iterable[FileLine],
+                            *,
+                            union: bool = False
+                            ) -> Union[Dict[FileLine, Set[str]], Set[str]]:
+        """
+        Determines the test cases that cover each of a given set of lines.
+
+        Parameters:
+            lines: the lines whose covering tests should be determined.
+            union: if True, returns the names of the test cases that cover
+                any of the given lines, rather than those that cover each
+                line.
+
+        Returns:
+            either a mapping from each given line to the names of the test
+            cases that cover it, or, if `union` is set, the names of all
+            test cases that cover at least one of the given lines.
+        """
+        matrix = self.__matrix
+        index = matrix.index
+        if union:
+            tests = 0
+            for line in lines:
+                line_id = index.id(line)
+                if line_id is not None:
+                    tests |= matrix.covering(line_id)
+            return set(matrix.names(tests))
+
+        covering = {}  # type: Dict[FileLine, Set[str]]
+        for line in lines:
+            line_id = index.id(line)
+            if line_id is None:
+                covering[line] = set()
+            else:
+                covering[line] = set(matrix.names(matrix.covering(line_id)))
+        return covering
 
     def __iter__(self) -> Iterator[str]:
         """
         Returns an iterator over the names of the test cases that are
         represented by this coverage report.
         """
-        return self.__test_coverage.keys().__iter__()
+        return iter(self.__matrix.tests)
 
     def __getitem__(self, name: str) -> TestCoverage:
         """
@@ -145,18 +228,19 @@ class TestSuiteCoverage(object):
             KeyError: if there is no coverage information for the given test
                 case.
         """
-        return self.__test_coverage[name]
+        matrix = self.__matrix
+        lines = matrix.index.decode(matrix.row(name))
+        return TestCoverage(name, matrix.outcome(name), lines)
 
     def __contains__(self, name: str) -> bool:
         """
         Determines whether this report contains coverage information for a given
         test case.
         """
-        return name in self.__test_coverage
+        return name in self.__matrix
 
     def to_dict(self) -> dict:
-        return {test: cov.to_dict() \
-                for (test, cov) in self.__test_coverage.items()}
+        return {test: self[test].to_dict() for test in self}
 
     def restricted_to_files(self,
                             filenames: List[str]
@@ -165,10 +249,8 @@ class TestSuiteCoverage(object):
         Returns a variant of this coverage that is restricted to a given list
         of files.
         """
-        cov_suite = {}
-        for test in self:
-            cov_suite[test] = self[test].restricted_to_files(filenames)
-        return TestSuiteCoverage(cov_suite)
+        mask = self.__matrix.index.mask(filenames)
+        return TestSuiteCoverage(self.__matrix.restricted(mask))
 
     @property
     def failing(self) -> 'TestSuiteCoverage':
@@ -176,26 +258,23 @@ class TestSuiteCoverage(object):
         Returns a variant of this coverage report that only contains coverage
         for failing test executions.
         """
-        return TestSuiteCoverage({t: cov \
-                                  for (t, cov) in self.__test_coverage.items() \
-                                  if not cov.outcome.passed})
+        matrix = self.__matrix
+        return TestSuiteCoverage(matrix.select(matrix.all & ~matrix.passed))
 
     @property
     def passing(self) -> 'TestSuiteCoverage':
         """
         Returns a variant of this coverage report that only contains coverage
-        for failing test executions.
+        for passing test executions.
         """
-        return TestSuiteCoverage({t: cov \
-                                  for (t, cov) in self.__test_coverage.items() \
-                                  if cov.outcome.passed})
+        return TestSuiteCoverage(self.__matrix.select(self.__matrix.passed))
 
     def __len__(self) -> int:
         """
         Returns a count of the number of test executions that are included
         within this coverage report.
         """
-        return len(self.__test_coverage)
+        return len(self.__matrix)
 
     @property
     def lines(self) -> FileLineSet:
@@ -203,7 +282,4 @@ class TestSuiteCoverage(object):
         Returns the set of all file lines that were covered.
         """
         assert len(self) > 0
-        output = FileLineSet()
-        for coverage in self.__test_coverage.values():
-            output = output.union(coverage.lines)
-        return output
+        return self.__matrix.index.decode(self.__matrix.covered())
@@ -0,0 +1,188 @@
+"""
+Provides a compact binary file format for coverage matrices, which is used
+to cache test suite coverage on disk.
+
+All integers are little-endian. A file begins with a header, consisting of
+the magic bytes `BZCV`, a 16-bit format version, and 16 reserved bits,
+followed by the number of files and the number of tests, each as a 32-bit
+unsigned integer. The header is followed by a table of the names of the
+files that are covered by any test, each encoded as a length-prefixed UTF-8
+string, and by the description of each test:
+
+* the name of the test, as a length-prefixed UTF-8 string.
+* whether or not the test passed, as a single byte.
+* the exit code (signed 32-bit) and duration (64-bit float) of the test.
+* the output of the test, as a length-prefixed UTF-8 string.
+* the number of files covered by the test, followed, for each file, by its
+  position in the file table, its number of covered lines, the width in
+  bytes (1, 2 or 4) of its line deltas, and the line deltas themselves:
+  the sorted line numbers, each given as the difference from the previous
+  line number.
+"""
+from typing import BinaryIO, Dict, FrozenSet, List, Tuple
+from array import array
+from itertools import accumulate
+import struct
+import sys
+
+from .fileline import FileLineSet
+from .matrix import CoverageMatrix
+from .test import TestOutcome
+from ..cmd import ExecResponse
+
+__all__ = ['MAGIC', 'VERSION', 'is_coverage_file', 'dump', 'load']
+
+MAGIC = b'BZCV'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sHHII')
+_U32 = struct.Struct('<I')
+_RESPONSE = struct.Struct('<Bid')
+_LINES = struct.Struct('<IIB')
+_TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+
+
+def is_coverage_file(fn: str) -> bool:
+    """
+    Determines whether a given file begins with the magic bytes of the
+    binary coverage format, regardless of its version.
+    """
+    with open(fn, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def _write_str(f: BinaryIO, s: str) -> None:
+    b = s.encode('utf-8')
+    f.write(_U32.pack(len(b)))
+    f.write(b)
+
+
+def _deltas(nums: FrozenSet[int]) -> Tuple[int, array]:
+    """
+    Returns the sorted differences between the given line numbers, encoded
+    as an array of the narrowest unsigned integers that can hold them.
+    """
+    lines = sorted(nums)
+    deltas = [b - a for (a, b) in zip([0] + lines, lines)]
+    largest = max(deltas, default=0)
+    width = 1 if largest < 0x100 else 2 if largest < 0x10000 else 4
+    arr = array(_TYPECODES[width], deltas)
+    if sys.byteorder == 'big':
+        arr.byteswap()
+    return (width, arr)
+
+
+def dump(matrix: CoverageMatrix, f: BinaryIO) -> None:
+    """
+    Writes a coverage matrix to a given binary file-like object.
+    """
+    index = matrix.index
+    tests = [(name, matrix.outcome(name), index.decode(matrix.row(name)))
+             for name in matrix.tests]
+    files = {}  # type: Dict[str, int]
+    for (_, _, lines) in tests:
+        for fn in lines.files:
+            files.setdefault(fn, len(files))
+
+    f.write(_HEADER.pack(MAGIC, VERSION, 0, len(files), len(tests)))
+    for fn in files:
+        _write_str(f, fn)
+
+    for (name, outcome, lines) in tests:
+        response = outcome.response
+        _write_str(f, name)
+        f.write(_RESPONSE.pack(outcome.passed,
+                               response.code,
+                               response.duration))
+        _write_str(f, response.output)
+
+        f.write(_U32.pack(len(lines.files)))
+        for fn in lines.files:
+            nums = lines.lines(fn)
+            (width, deltas) = _deltas(nums)
+            f.write(_LINES.pack(files[fn], len(nums), width))
+            f.write(deltas.tobytes())
+
+
+def _read_str(buff: memoryview, offset: int) -> Tuple[str, int]:
+    (size,) = _U32.unpack_from(buff, offset)
+    offset += _U32.size
+    end = offset + size
+    if end > len(buff):
+        raise ValueError("unexpected end of coverage file")
+    return (str(buff[offset:end], 'utf-8'), end)
+
+
+def _parse(buff: memoryview) -> CoverageMatrix:
+    """
+    Parses the contents of a coverage file.
+
+    Raises:
+        ValueError: if the contents are not a coverage file of the current
+            version, or if they are corrupt (e.g., truncated).
+    """
+    try:
+        return _parse_unchecked(buff)
+    except (struct.error, IndexError, UnicodeDecodeError) as err:
+        raise ValueError("corrupt coverage file: {}".format(err))
+
+
+def _parse_unchecked(buff: memoryview) -> CoverageMatrix:
+    (magic, version, _, num_files, num_tests) = _HEADER.unpack_from(buff, 0)
+    if magic != MAGIC:
+        raise ValueError("not a coverage file")
+    if version != VERSION:
+        msg = "unsupported coverage file version: {} (expected {})"
+        raise ValueError(msg.format(version, VERSION))
+    offset = _HEADER.size
+
+    files = []  # type: List[str]
+    for _ in range(num_files):
+        (fn, offset) = _read_str(buff, offset)
+        files.append(fn)
+
+    def tests():
+        nonlocal offset
+        for _ in range(num_tests):
+            (name, offset) = _read_str(buff, offset)
+            (passed, code, duration) = _RESPONSE.unpack_from(buff, offset)
+            offset += _RESPONSE.size
+            (output, offset) = _read_str(buff, offset)
+
+            (num_covered,) = _U32.unpack_from(buff, offset)
+            offset += _U32.size
+            contents = {}  # type: Dict[str, FrozenSet[int]]
+            for _ in range(num_covered):
+                (i, count, width) = _LINES.unpack_from(buff, offset)
+                offset += _LINES.size
+                end = offset + count * width
+                if width not in _TYPECODES or end > len(buff):
+                    raise ValueError("corrupt coverage file")
+                deltas = array(_TYPECODES[width])
+                deltas.frombytes(buff[offset:end])
+                if sys.byteorder == 'big':
+                    deltas.byteswap()
+                contents[files[i]] = frozenset(accumulate(deltas))
+                offset = end
+
+            response = ExecResponse(code, duration, output)
+            outcome = TestOutcome(response, bool(passed))
+            yield (name, outcome, FileLineSet._wrap(contents))
+
+    return CoverageMatrix.build(tests())
+
+
+def load(fn: str) -> CoverageMatrix:
+    """
+    Reads a coverage matrix from a given file.
+
+    Raises:
+        ValueError: if the file is not a coverage file, if it was written
+            using a different version of the format, or if it is corrupt.
+    """
+    with open(fn, 'rb') as f:
+        contents = f.read()
+    if len(contents) < _HEADER.size:
+        raise ValueError("not a coverage file")
+    with memoryview(contents) as buff:
+        return _parse(buff)
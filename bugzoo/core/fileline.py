@@ -42,7 +42,11 @@ class FileLine(object):
 
 class FileLineSet(object):
     """
-    Used to describe a set of file lines.
+    Used to describe a set of file lines. Lines are stored as a frozenset of
+    line numbers for each file, and set operations are performed file by
+    file on those frozensets, without materialising individual `FileLine`
+    objects. Since sets are immutable, the frozensets for each file are
+    shared between sets wherever possible.
     """
     @staticmethod
     def from_dict(d: Dict[str, List[int]]) -> 'FileLineSet':
@@ -58,12 +62,50 @@ class FileLineSet(object):
 
     @staticmethod
     def from_iter(itr: Iterable[FileLine]) -> 'FileLineSet':
-        d = {} # type: Dict[str, Set[int]]
+        builder = FileLineSetBuilder()
         for line in itr:
-            if not line.filename in d:
-                d[line.filename] = set()
-            d[line.filename].add(line.num)
-        return FileLineSet(d)
+            builder.add(line)
+        return builder.build()
+
+    @staticmethod
+    def union_all(sets: Iterable['FileLineSet']) -> 'FileLineSet':
+        """
+        Returns the union of any number of sets of file lines, computed in a
+        single pass over the given sets.
+        """
+        builder = FileLineSetBuilder()
+        for other in sets:
+            builder.update(other)
+        return builder.build()
+
+    @staticmethod
+    def intersect_all(sets: Iterable['FileLineSet']) -> 'FileLineSet':
+        """
+        Returns the intersection of one or more sets of file lines.
+
+        Raises:
+            ValueError: if no sets are given.
+        """
+        itr = iter(sets)
+        try:
+            output = next(itr)
+        except StopIteration:
+            raise ValueError("expected at least one set of file lines")
+        for other in itr:
+            if not output:
+                break
+            output = output.intersection(other)
+        return output
+
+    @staticmethod
+    def _wrap(contents: Dict[str, FrozenSet[int]]) -> 'FileLineSet':
+        """
+        Constructs a set directly from a given dictionary of frozensets,
+        which becomes owned by the set, without copying it.
+        """
+        s = FileLineSet.__new__(FileLineSet)
+        s.__contents = contents
+        return s
 
     def __init__(self,
                  contents: Optional[Dict[str, Set[int]]] = None
@@ -116,9 +158,7 @@ class FileLineSet(object):
         Returns an iterator over all lines contained in this set that belong
         to a given file.
         """
-        if not fn in self.__contents:
-            raise StopIteration
-        for num in self.__contents[fn]:
+        for num in self.__contents.get(fn, ()):
             yield FileLine(fn, num)
 
     def __contains__(self, file_line: FileLine) -> bool:
@@ -128,28 +168,40 @@ class FileLineSet(object):
         return file_line.filename in self.__contents and \
                file_line.num in self.__contents[file_line.filename]
 
+    def lines(self, fn: str) -> FrozenSet[int]:
+        """
+        Returns the numbers of the lines contained in this set that belong to
+        a given file.
+        """
+        return self.__contents.get(fn, frozenset())
+
     def filter(self,
-               predicate: Callable[[FileLine], 'FileLineSet']
+               predicate: Callable[[FileLine], bool]
                ) -> 'FileLineSet':
         """
         Returns a subset of the file lines within this set that satisfy a given
         filtering criterion.
         """
-        filtered = [fileline for fileline in self if predicate(fileline)]
-        return FileLineSet.from_list(filtered)
+        filtered = {}  # type: Dict[str, FrozenSet[int]]
+        for (fn, nums) in self.__contents.items():
+            kept = frozenset(n for n in nums if predicate(FileLine(fn, n)))
+            if kept:
+                filtered[fn] = kept
+        return FileLineSet._wrap(filtered)
 
     def union(self, other: 'FileLineSet') -> 'FileLineSet':
         """
         Returns a set of file lines that contains the union of the lines within
         this set and a given set.
         """
-        # this isn't the most efficient implementation, but frankly, it doesn't
-        # need to be.
         assert isinstance(other, FileLineSet)
-        l_self = list(self)
-        l_other = list(other)
-        l_union = l_self + l_other
-        return FileLineSet.from_list(l_union)
+        contents = dict(self.__contents)
+        for (fn, nums) in other.__contents.items():
+            if fn in contents:
+                contents[fn] = contents[fn] | nums
+            else:
+                contents[fn] = nums
+        return FileLineSet._wrap(contents)
 
     def intersection(self, other: 'FileLineSet') -> 'FileLineSet':
         """
@@ -157,10 +209,13 @@ class FileLineSet(object):
         within this set and a given set.
         """
         assert isinstance(other, FileLineSet)
-        set_self = set(self)
-        set_other = set(other)
-        set_union = set_self & set_other
-        return FileLineSet.from_list(list(set_union))
+        contents = {}  # type: Dict[str, FrozenSet[int]]
+        for (fn, nums) in self.__contents.items():
+            if fn in other.__contents:
+                common = nums & other.__contents[fn]
+                if common:
+                    contents[fn] = common
+        return FileLineSet._wrap(contents)
 
     def restricted_to_files(self, filenames: List[str]) -> 'FileLineSet':
         """
@@ -168,11 +223,9 @@ class FileLineSet(object):
         any one of the given files. (I.e., returns the intersection of this set
         and the set of all lines from a given set of files.)
         """
-        restricted = {} # type: Dict[str, Set[int]]
-        for fn in filenames:
-            if fn in self.__contents:
-                restricted[fn] = set(self.__contents[fn])
-        return FileLineSet(restricted)
+        restricted = {fn: self.__contents[fn]
+                      for fn in filenames if fn in self.__contents}
+        return FileLineSet._wrap(restricted)
 
     @property
     def files(self) -> List[str]:
@@ -188,3 +241,59 @@ class FileLineSet(object):
         """
         return {fn: list(lines)
                 for (fn, lines) in self.__contents.items()}
+
+
+class FileLineSetBuilder(object):
+    """
+    Incrementally constructs a set of file lines by adding lines, or the
+    contents of other sets, in place, before producing an immutable
+    `FileLineSet` via `build`.
+    """
+    def __init__(self) -> None:
+        self.__contents = {}  # type: Dict[str, Set[int]]
+
+    def __len__(self) -> int:
+        return sum(len(lines) for lines in self.__contents.values())
+
+    def add(self, line: FileLine) -> None:
+        """
+        Adds a single file line to the set.
+        """
+        try:
+            self.__contents[line.filename].add(line.num)
+        except KeyError:
+            self.__contents[line.filename] = {line.num}
+
+    def add_lines(self, fn: str, nums: Iterable[int]) -> None:
+        """
+        Adds a number of lines that belong to a given file to the set.
+        """
+        try:
+            self.__contents[fn].update(nums)
+        except KeyError:
+            self.__contents[fn] = set(nums)
+
+    def update(self, other: FileLineSet) -> None:
+        """
+        Adds all of the lines within a given set to this set.
+        """
+        for fn in other.files:
+            self.add_lines(fn, other.lines(fn))
+
+    def intersection_update(self, other: FileLineSet) -> None:
+        """
+        Removes all lines from this set that do not belong to a given set.
+        """
+        for fn in list(self.__contents):
+            nums = self.__contents[fn]
+            nums.intersection_update(other.lines(fn))
+            if not nums:
+                del self.__contents[fn]
+
+    def build(self) -> FileLineSet:
+        """
+        Returns an immutable set that contains the lines within this builder.
+        """
+        return FileLineSet._wrap({fn: frozenset(nums)
+                                  for (fn, nums) in self.__contents.items()
+                                  if nums})
@@ -0,0 +1,81 @@
+from typing import Dict, Any, Optional
+
+import attr
+
+__all__ = ['JobStatus']
+
+
+@attr.s(frozen=True)
+class JobStatus(object):
+    """
+    Describes the state of a long-running operation (i.e., a job) that is
+    being performed by the server.
+
+    Attributes:
+        id: the unique identifier of the job.
+        kind: the kind of operation that is performed by the job (e.g.,
+            `build-bug`).
+        state: the state of the job: either `pending`, `running`,
+            `succeeded`, `failed`, or `cancelled`.
+        progress: an estimate of the fraction of the job that has been
+            completed, between zero and one.
+        message: an optional description of the current activity of the job.
+        error: the dictionary-based description of the exception that caused
+            the job to fail or be cancelled, if any.
+        created: the time at which the job was submitted.
+        started: the time at which the job was started, if it has started.
+        finished: the time at which the job finished, if it has finished.
+        cancellable: indicates whether or not the job can be cancelled once
+            it has started. Jobs that cannot be cancelled may still be
+            cancelled before they start.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    id = attr.ib(type=str)
+    kind = attr.ib(type=str)
+    state = attr.ib(type=str)
+    progress = attr.ib(type=float, default=0.0)
+    message = attr.ib(type=Optional[str], default=None)
+    error = attr.ib(type=Optional[Dict[str, Any]], default=None)
+    created = attr.ib(type=Optional[float], default=None)
+    started = attr.ib(type=Optional[float], default=None)
+    finished = attr.ib(type=Optional[float], default=None)
+    cancellable = attr.ib(type=bool, default=True)
+
+    @property
+    def done(self) -> bool:
+        """
+        Indicates whether or not the job has finished.
+        """
+        return self.state in (JobStatus.SUCCEEDED,
+                              JobStatus.FAILED,
+                              JobStatus.CANCELLED)
+
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'JobStatus':
+        return JobStatus(id=d['id'],
+                         kind=d['kind'],
+                         state=d['state'],
+                         progress=d.get('progress', 0.0),
+                         message=d.get('message'),
+                         error=d.get('error'),
+                         created=d.get('created'),
+                         started=d.get('started'),
+                         finished=d.get('finished'),
+                         cancellable=d.get('cancellable', True))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'id': self.id,
+                'kind': self.kind,
+                'state': self.state,
+                'progress': self.progress,
+                'message': self.message,
+                'error': self.error,
+                'created': self.created,
+                'started': self.started,
+                'finished': self.finished,
+                'cancellable': self.cancellable}
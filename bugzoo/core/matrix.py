@@ -0,0 +1,320 @@
+from typing import Dict, List, Iterable, Iterator, Optional, Tuple
+import threading
+
+from .fileline import FileLine, FileLineSet
+from .test import TestOutcome
+
+__all__ = ['LineIndex', 'CoverageMatrix']
+
+# for each bit position, a translation table that maps each byte to the
+# binary digit of that bit
+_BIT_DIGITS = [bytes(ord('1') if b >> i & 1 else ord('0') for b in range(256))
+               for i in range(8)]
+
+
+def bits(n: int) -> Iterator[int]:
+    """
+    Returns an iterator, in ascending order, over the positions of the bits
+    that are set in a given non-negative integer.
+    """
+    s = bin(n)[:1:-1]
+    i = s.find('1')
+    while i != -1:
+        yield i
+        i = s.find('1', i + 1)
+
+
+def from_bits(positions: Iterable[int]) -> int:
+    """
+    Constructs the integer in which exactly the bits at the given positions
+    are set.
+    """
+    positions = list(positions)
+    if not positions:
+        return 0
+    buff = bytearray((max(positions) >> 3) + 1)
+    for i in positions:
+        buff[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(buff, 'little')
+
+
+class LineIndex(object):
+    """
+    Interns file-lines by assigning each a unique, dense integer ID, allowing
+    sets of file-lines to be represented as integer bitsets, in which bit `i`
+    is set if the line with ID `i` belongs to the set. Lines are never
+    removed from an index, and so the IDs of interned lines remain valid
+    as the index grows.
+    """
+    def __init__(self) -> None:
+        self.__ids = {}  # type: Dict[str, Dict[int, int]]
+        self.__lines = []  # type: List[Tuple[str, int]]
+        self.__masks = {}  # type: Dict[str, int]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of lines in this index.
+        """
+        return len(self.__lines)
+
+    def __getitem__(self, line_id: int) -> FileLine:
+        """
+        Returns the file-line with a given ID.
+        """
+        return FileLine(*self.__lines[line_id])
+
+    @property
+    def files(self) -> List[str]:
+        """
+        The names of the files whose lines belong to this index.
+        """
+        return list(self.__ids.keys())
+
+    def id(self, line: FileLine) -> Optional[int]:
+        """
+        Returns the ID of a given file-line, or None if the line is not in
+        this index.
+        """
+        try:
+            return self.__ids[line.filename][line.num]
+        except KeyError:
+            return None
+
+    def mask(self, filenames: Iterable[str]) -> int:
+        """
+        Returns a bitset of all lines in this index that belong to any of a
+        given set of files.
+        """
+        mask = 0
+        for fn in filenames:
+            if fn in self.__ids:
+                if fn not in self.__masks:
+                    self.__masks[fn] = from_bits(self.__ids[fn].values())
+                mask |= self.__masks[fn]
+        return mask
+
+    def encode(self, lines: FileLineSet) -> int:
+        """
+        Returns a bitset of the lines within a given set, adding any lines
+        that are not yet in this index.
+        """
+        positions = []  # type: List[int]
+        for (fn, nums) in lines.to_dict().items():
+            try:
+                ids = self.__ids[fn]
+            except KeyError:
+                ids = self.__ids[fn] = {}
+            # the mask for this file is rebuilt when next requested
+            self.__masks.pop(fn, None)
+            for num in nums:
+                try:
+                    positions.append(ids[num])
+                except KeyError:
+                    ids[num] = len(self.__lines)
+                    positions.append(ids[num])
+                    self.__lines.append((fn, num))
+        return from_bits(positions)
+
+    def decode(self, bitset: int) -> FileLineSet:
+        """
+        Returns the set of lines that are described by a given bitset.
+        """
+        contents = {}  # type: Dict[str, set]
+        lines = self.__lines
+        for i in bits(bitset):
+            (fn, num) = lines[i]
+            try:
+                contents[fn].add(num)
+            except KeyError:
+                contents[fn] = {num}
+        return FileLineSet(contents)
+
+
+class CoverageMatrix(object):
+    """
+    A compact bit matrix that describes the lines that are covered by each
+    test within a suite. Each row of the matrix describes the lines that were
+    covered by a single test as an integer bitset over the IDs of a shared
+    line index. The outcomes of the tests are described by a bitset over the
+    positions of the tests, in which bit `j` is set if test `j` passed.
+
+    Matrices are immutable: operations that select a subset of the tests or
+    lines within a matrix return a new matrix that shares its line index and
+    rows with the original.
+    """
+    @staticmethod
+    def build(coverage: Iterable[Tuple[str, TestOutcome, FileLineSet]],
+              index: Optional[LineIndex] = None
+              ) -> 'CoverageMatrix':
+        """
+        Constructs a matrix from the coverage of a sequence of tests.
+
+        Parameters:
+            coverage: an iterable of tuples, each containing the name of a
+                test, its outcome, and the set of lines that it covered.
+            index: the line index that should be used by the matrix. If
+                unspecified, a new index is created.
+        """
+        if index is None:
+            index = LineIndex()
+        tests = []  # type: List[str]
+        outcomes = []  # type: List[TestOutcome]
+        rows = []  # type: List[int]
+        for (test, outcome, lines) in coverage:
+            tests.append(test)
+            outcomes.append(outcome)
+            rows.append(index.encode(lines))
+        passed = from_bits(j for (j, o) in enumerate(outcomes) if o.passed)
+        return CoverageMatrix(index, tests, outcomes, rows, passed)
+
+    def __init__(self,
+                 index: LineIndex,
+                 tests: List[str],
+                 outcomes: List[TestOutcome],
+                 rows: List[int],
+                 passed: int
+                 ) -> None:
+        assert len(tests) == len(outcomes) == len(rows)
+        self.__index = index
+        self.__tests = tests
+        self.__positions = {t: j for (j, t) in enumerate(tests)}
+        self.__outcomes = outcomes
+        self.__rows = rows
+        self.__passed = passed
+        self.__inverted = {}  # type: Dict[int, int]
+        self.__inverted_lock = threading.Lock()
+        self.__packed = None  # type: Optional[bytes]
+        self.__width = 0
+
+    @property
+    def index(self) -> LineIndex:
+        """
+        The index of the lines that are described by this matrix.
+        """
+        return self.__index
+
+    @property
+    def tests(self) -> List[str]:
+        """
+        The names of the tests in this matrix, in order.
+        """
+        return list(self.__tests)
+
+    @property
+    def passed(self) -> int:
+        """
+        A bitset over the positions of the tests that passed.
+        """
+        return self.__passed
+
+    @property
+    def all(self) -> int:
+        """
+        A bitset over the positions of all tests.
+        """
+        return (1 << len(self.__tests)) - 1
+
+    def __len__(self) -> int:
+        return len(self.__tests)
+
+    def __contains__(self, test: str) -> bool:
+        return test in self.__positions
+
+    def position(self, test: str) -> int:
+        """
+        Returns the position of a given test within this matrix.
+
+        Raises:
+            KeyError: if the test is not in this matrix.
+        """
+        return self.__positions[test]
+
+    def outcome(self, test: str) -> TestOutcome:
+        """
+        Returns the outcome of a given test.
+        """
+        return self.__outcomes[self.__positions[test]]
+
+    def row(self, test: str) -> int:
+        """
+        Returns a bitset of the lines that were covered by a given test.
+        """
+        return self.__rows[self.__positions[test]]
+
+    def select(self, tests: int) -> 'CoverageMatrix':
+        """
+        Returns a matrix that only contains the tests whose positions are
+        given by a bitset.
+        """
+        if tests == self.all:
+            return self
+        positions = list(bits(tests))
+        passed = from_bits(i for (i, j) in enumerate(positions)
+                           if self.__passed >> j & 1)
+        return CoverageMatrix(self.__index,
+                              [self.__tests[j] for j in positions],
+                              [self.__outcomes[j] for j in positions],
+                              [self.__rows[j] for j in positions],
+                              passed)
+
+    def restricted(self, lines: int) -> 'CoverageMatrix':
+        """
+        Returns a matrix that only contains the lines given by a bitset.
+        """
+        return CoverageMatrix(self.__index,
+                              self.__tests,
+                              self.__outcomes,
+                              [row & lines for row in self.__rows],
+                              self.__passed)
+
+    def covered(self) -> int:
+        """
+        Returns a bitset of the lines that are covered by at least one test.
+        """
+        covered = 0
+        for row in self.__rows:
+            covered |= row
+        return covered
+
+    def covering(self, line_id: int) -> int:
+        """
+        Returns a bitset over the positions of the tests that cover the line
+        with a given ID. Results are cached in the inverted index of this
+        matrix.
+        """
+        with self.__inverted_lock:
+            try:
+                return self.__inverted[line_id]
+            except KeyError:
+                pass
+            if self.__packed is None:
+                self.__pack()
+            (offset, bit) = divmod(line_id, 8)
+            if offset < self.__width:
+                # collect the byte that holds the line from each row, and
+                # rewrite each byte as a binary digit for the given bit
+                column = self.__packed[offset::self.__width]
+                column = column.translate(_BIT_DIGITS[bit])
+                tests = int(column[::-1], 2) if column else 0
+            else:
+                tests = 0
+            self.__inverted[line_id] = tests
+            return tests
+
+    def __pack(self) -> None:
+        """
+        Packs the rows of this matrix into a single buffer, in which each
+        row occupies the same number of bytes, allowing each column of the
+        matrix to be read as a strided slice of the buffer.
+        """
+        width = max((row.bit_length() for row in self.__rows), default=0)
+        width = (width + 7) // 8
+        self.__packed = b''.join(row.to_bytes(width, 'little')
+                                 for row in self.__rows)
+        self.__width = width
+
+    def names(self, tests: int) -> List[str]:
+        """
+        Returns the names of the tests whose positions are given by a bitset.
+        """
+        return [self.__tests[j] for j in bits(tests)]
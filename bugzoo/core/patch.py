@@ -230,6 +230,16 @@ class Patch(object):
         """
         return [fp.old_fn for fp in self.__file_patches]
 
+    @property
+    def new_files(self) -> List[str]:
+        """
+        Returns a list of the names of the files that will exist after this
+        patch has been applied, including any files that are created by the
+        patch.
+        """
+        names = [fp.new_fn.split('\t')[0] for fp in self.__file_patches]
+        return [fn for fn in names if fn != '/dev/null']
+
     def __str__(self) -> str:
         """
         Returns the contents of this patch as a unified format diff.
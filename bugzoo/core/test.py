@@ -1,6 +1,6 @@
-__all__ = ['TestCase', 'TestSuite', 'TestOutcome']
+__all__ = ['TestCase', 'TestSuite', 'TestOutcome', 'TestSuiteOutcome']
 
-from typing import Sequence, Dict, Iterator, Optional, List, Any
+from typing import Sequence, Dict, Iterator, Optional, List, Any, Tuple
 import attr
 import warnings
 
@@ -65,6 +65,16 @@ class TestCase(object):
     oracle = attr.ib(type=TestCaseOracle)
     kill_after = attr.ib(type=int, default=1)
 
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'TestCase':
+        return TestCase(name=d['name'],
+                        time_limit=d['time-limit'],
+                        command=d['command'],
+                        context=d['context'],
+                        expected_outcome=d.get('expected-outcome'),
+                        oracle=TestCaseOracle.from_dict(d.get('oracle', {})),
+                        kill_after=d.get('kill-after', 1))
+
     def to_dict(self) -> Dict[str, Any]:
         return {'name': self.name,
                 'time-limit': self.time_limit,
@@ -101,14 +111,93 @@ class TestOutcome(object):
                 'response': self.response.to_dict()}
 
 
+class TestSuiteOutcome(object):
+    """
+    Describes the outcomes of executing a number of tests from a test suite.
+    """
+    @staticmethod
+    def from_dict(d: Dict[str, Any]) -> 'TestSuiteOutcome':
+        return TestSuiteOutcome({name: TestOutcome.from_dict(o)
+                                 for (name, o) in d.items()})
+
+    def __init__(self, outcomes: Dict[str, TestOutcome]) -> None:
+        """
+        Parameters:
+            outcomes: a dictionary that maps the name of each executed test
+                to its outcome.
+        """
+        self.__outcomes = dict(outcomes)
+
+    def __getitem__(self, name: str) -> TestOutcome:
+        """
+        Returns the outcome for a test with a given name.
+
+        Raises:
+            KeyError: if no outcome exists for the given test.
+        """
+        return self.__outcomes[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.__outcomes
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        Returns an iterator over the names of the executed tests.
+        """
+        yield from self.__outcomes.keys()
+
+    def __len__(self) -> int:
+        return len(self.__outcomes)
+
+    def items(self) -> Iterator[Tuple[str, TestOutcome]]:
+        yield from self.__outcomes.items()
+
+    @property
+    def passing(self) -> List[str]:
+        """
+        The names of the tests that passed.
+        """
+        return [n for (n, o) in self.__outcomes.items() if o.passed]
+
+    @property
+    def failing(self) -> List[str]:
+        """
+        The names of the tests that failed.
+        """
+        return [n for (n, o) in self.__outcomes.items() if not o.passed]
+
+    @property
+    def passed(self) -> bool:
+        """
+        Indicates whether or not all of the executed tests passed.
+        """
+        return all(o.passed for o in self.__outcomes.values())
+
+    @property
+    def duration(self) -> float:
+        """
+        The total time spent executing the tests, measured in seconds.
+        """
+        return sum(o.duration for o in self.__outcomes.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: o.to_dict() for (name, o) in self.__outcomes.items()}
+
+
 @attr.s(frozen=True)
 class TestSuite(object):
     """
     Describes the test suite for a particular snapshot. Test suites are
     composed of a set of uniquely named individual test cases.
+
+    Attributes:
+        parallel: indicates whether or not the test cases may safely be
+            executed concurrently within the same container. Disabled by
+            default, since some test harnesses are not re-entrant.
     """
     _tests = attr.ib(type=Dict[str, TestCase],
                      converter=lambda ts: {t.name: t for t in ts})  # type: ignore
+    parallel = attr.ib(type=bool, default=False)
 
     @staticmethod
     def from_dict(d: dict) -> 'TestSuite':
@@ -117,6 +206,7 @@ class TestSuite(object):
         command_context = d.get('context', '/experiment')  # type: str
         default_oracle = TestCaseOracle()
         default_kill_after = 1
+        parallel = d.get('parallel', False)  # type: bool
         d_tests = d.get('tests', [])
 
         if d.get('type') == 'empty':
@@ -177,7 +267,7 @@ class TestSuite(object):
                             kill_after=test_kill_after)
             tests.append(test)
 
-        return TestSuite(tests)
+        return TestSuite(tests, parallel)
 
     @property
     def tests(self) -> Iterator[TestCase]:
@@ -203,4 +293,5 @@ class TestSuite(object):
         return self._tests[name]
 
     def to_dict(self) -> Dict[str, Any]:
-        return {'tests': [t.to_dict() for t in self.tests]}
+        return {'tests': [t.to_dict() for t in self.tests],
+                'parallel': self.parallel}
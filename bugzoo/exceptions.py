@@ -22,12 +22,17 @@ __all__ = [
     'BugNotInstalledError',
     'ImageBuildFailed',
     'FailedToComputeCoverage',
+    'FailedToResetContainer',
     'ContainerNotFound',
     'FileNotFound',
     'ArgumentNotSpecified',
     'ImageNotInstalled',
     'ImageAlreadyExists',
-    'TestNotFound'
+    'TestNotFound',
+    'JobNotFound',
+    'JobNotFinished',
+    'JobCancelled',
+    'JobNotCancellable'
 ]
 
 
@@ -610,3 +615,149 @@ class FailedToComputeCoverage(BugZooException):
     @property
     def data(self) -> Dict[str, Any]:
         return {'reason': self.reason}
+
+
+class FailedToResetContainer(BugZooException):
+    """
+    An error was encountered inside the container whilst attempting to
+    restore its source code to its baseline state.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'FailedToResetContainer':
+        return FailedToResetContainer(data['uid'], data['reason'])
+
+    def __init__(self, uid: str, reason: str) -> None:
+        self.__uid = uid
+        self.__reason = reason
+        msg = "failed to reset container ({}): {}.".format(uid, reason)
+        super().__init__(msg)
+
+    @property
+    def uid(self) -> str:
+        """
+        The UID of the container that could not be reset.
+        """
+        return self.__uid
+
+    @property
+    def reason(self) -> str:
+        """
+        The reason why the container could not be reset.
+        """
+        return self.__reason
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'uid': self.uid, 'reason': self.reason}
+
+
+class JobNotFound(BugZooException):
+    """
+    No job was found with the given ID.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobNotFound':
+        return JobNotFound(data['id'])
+
+    def __init__(self, id: str) -> None:
+        self.__id = id
+        super().__init__("no job found with ID: {}".format(id))
+
+    @property
+    def id(self) -> str:
+        """
+        The ID of the job.
+        """
+        return self.__id
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'id': self.id}
+
+
+class JobNotFinished(BugZooException):
+    """
+    The result of a job was requested before the job had finished.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobNotFinished':
+        return JobNotFinished(data['id'])
+
+    def __init__(self, id: str) -> None:
+        self.__id = id
+        super().__init__("job has not finished: {}".format(id))
+
+    @property
+    def id(self) -> str:
+        """
+        The ID of the job.
+        """
+        return self.__id
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'id': self.id}
+
+
+class JobCancelled(BugZooException):
+    """
+    A job was cancelled before it could finish.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobCancelled':
+        return JobCancelled(data['id'])
+
+    def __init__(self, id: str) -> None:
+        self.__id = id
+        super().__init__("job was cancelled: {}".format(id))
+
+    @property
+    def id(self) -> str:
+        """
+        The ID of the job.
+        """
+        return self.__id
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'id': self.id}
+
+
+class JobNotCancellable(BugZooException):
+    """
+    Cancellation was requested for a job that cannot be cancelled once it
+    has started.
+    """
+    @classmethod
+    def from_message_and_data(cls,
+                              message: str,
+                              data: Dict[str, Any]
+                              ) -> 'JobNotCancellable':
+        return JobNotCancellable(data['id'])
+
+    def __init__(self, id: str) -> None:
+        self.__id = id
+        super().__init__("job cannot be cancelled: {}".format(id))
+
+    @property
+    def id(self) -> str:
+        """
+        The ID of the job.
+        """
+        return self.__id
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        return {'id': self.id}
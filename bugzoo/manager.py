@@ -14,6 +14,9 @@ from .mgr.bug import BugManager
 from .mgr.container import ContainerManager
 from .mgr.coverage import CoverageManager
 from .mgr.file import FileManager
+from .mgr.history import HistoryManager
+from .mgr.scheduler import TestScheduler
+from .mgr.job import JobManager
 
 logger = logging.getLogger(__name__)
 
@@ -65,16 +68,22 @@ class BugZoo(object):
         logger.debug("Docker server info: %s", self.__docker.info())
 
         self.__mgr_build = BuildManager(self.__docker)
+        self.__history = HistoryManager(os.path.join(self.path, "history.db"))
         self.__bugs = BugManager(self)
         self.__tools = ToolManager(self)
         self.__sources = SourceManager(self)
         self.__containers = ContainerManager(self)
         self.__files = FileManager(self.__bugs, self.__containers)
         self.__coverage = CoverageManager(self)
+        self.__scheduler = TestScheduler(self)
+        self.__jobs = JobManager()
 
     def shutdown(self) -> None:
         logger.info("Shutting down daemon...")
+        self.__jobs.shutdown()
+        self.__containers.pool.clear()
         self.__containers.clear()
+        self.__history.close()
         logger.info("Shut down daemon")
 
     @property
@@ -120,6 +129,29 @@ class BugZoo(object):
         """
         return self.__coverage
 
+    @property
+    def history(self) -> HistoryManager:
+        """
+        Records the durations and outcomes of recent test executions.
+        """
+        return self.__history
+
+    @property
+    def scheduler(self) -> TestScheduler:
+        """
+        The test scheduler is used to distribute the execution of a test
+        suite across a number of containers.
+        """
+        return self.__scheduler
+
+    @property
+    def jobs(self) -> JobManager:
+        """
+        The job manager is used to perform long-running operations in the
+        background.
+        """
+        return self.__jobs
+
     @property
     def files(self) -> FileManager:
         """
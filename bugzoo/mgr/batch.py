@@ -0,0 +1,100 @@
+"""
+Provides a driver script that executes a batch of tests inside a container
+using a single Docker exec instance, rather than one exec instance per test.
+"""
+from typing import Dict, List, Tuple
+import base64
+import shlex
+import logging
+
+from ..cmd import ExecResponse
+from ..core.test import TestCase
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['build_driver', 'parse_driver_output']
+
+# the prefix that is used by the driver to mark each of its records
+RECORD_PREFIX = '@@bugzoo-test'
+
+# executes each test in a fresh shell, subject to its own time limit, and
+# emits a single-line record that describes its outcome. The driver is read
+# from the standard input of the shell, and so each test is prevented from
+# reading it. The output of each
+# test is base64-encoded to ensure that the record fits on a single line.
+DRIVER_HEADER = r"""#!/bin/bash
+BUGZOO_OUT=$(mktemp)
+trap 'rm -f "$BUGZOO_OUT"' EXIT
+
+run_test() {
+  local index="$1" context="$2" time_limit="$3" kill_after="$4"
+  local start end code
+  start=$(date +%s%N)
+  if [ "$time_limit" -gt 0 ]; then
+    BUGZOO_CONTEXT="$context" BUGZOO_COMMAND="$5" \
+      timeout --kill-after="$kill_after" --signal=SIGTERM "$time_limit" \
+      /bin/bash -c 'source /.environment && cd "$BUGZOO_CONTEXT" && eval "$BUGZOO_COMMAND"' \
+      > "$BUGZOO_OUT" 2>&1 < /dev/null
+  else
+    BUGZOO_CONTEXT="$context" BUGZOO_COMMAND="$5" \
+      /bin/bash -c 'source /.environment && cd "$BUGZOO_CONTEXT" && eval "$BUGZOO_COMMAND"' \
+      > "$BUGZOO_OUT" 2>&1 < /dev/null
+  fi
+  code=$?
+  end=$(date +%s%N)
+  echo "@@bugzoo-test $index $code $((end - start)) $(base64 < "$BUGZOO_OUT" | tr -d '\n')"
+}
+
+"""
+
+
+def build_driver(tests: List[Tuple[TestCase, int]]) -> bytes:
+    """
+    Constructs a driver script that executes a given sequence of tests, one
+    after another.
+
+    Parameters:
+        tests: a list of tests, each paired with the time limit, in seconds,
+            that should be used to execute it. A time limit of zero disables
+            the time limit for that test.
+
+    Returns:
+        the contents of the driver script.
+    """
+    lines = [DRIVER_HEADER]
+    for (index, (test, time_limit)) in enumerate(tests):
+        args = [str(index),
+                shlex.quote(test.context),
+                str(max(time_limit, 0)),
+                str(test.kill_after),
+                shlex.quote(test.command)]
+        lines.append('run_test {}\n'.format(' '.join(args)))
+    return ''.join(lines).encode('utf-8')
+
+
+def parse_driver_output(output: str) -> Dict[int, ExecResponse]:
+    """
+    Parses the records that were produced by a driver script.
+
+    Returns:
+        a dictionary that maps the index of each test, within the batch, to
+        the response of its execution. Tests that were not executed (e.g.,
+        because the driver was terminated) are omitted.
+    """
+    responses = {}  # type: Dict[int, ExecResponse]
+    for line in output.splitlines():
+        line = line.strip()
+        if not line.startswith(RECORD_PREFIX + ' '):
+            continue
+        parts = line.split(' ')
+        try:
+            index = int(parts[1])
+            code = int(parts[2])
+            duration = int(parts[3]) / 1e9
+            encoded = parts[4] if len(parts) > 4 else ''
+            contents = base64.b64decode(encoded).decode('utf-8', 'replace')
+        except (IndexError, ValueError):
+            logger.warning("failed to parse test driver record: %s", line)
+            continue
+        responses[index] = ExecResponse(code, duration, contents.rstrip('\n'))
+    return responses
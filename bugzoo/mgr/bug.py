@@ -1,15 +1,17 @@
-from typing import Iterator, Optional, List
-import os
+from typing import Iterator, Optional, List, Callable
+import logging
 
 import docker
 import textwrap
-import yaml
 
+from .coverage_cache import CoverageCache
 from ..core.coverage import TestSuiteCoverage
 from ..core.bug import Bug
 from ..core.spectra import Spectra
 from ..util import print_task_start, print_task_end
 
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
 
 class BugManager(object):
     """
@@ -20,6 +22,14 @@ class BugManager(object):
                  installation: 'BugZoo'):
         self.__installation = installation
         self.__bugs = {}
+        self.__coverage_cache = CoverageCache(installation)
+
+    @property
+    def coverage_cache(self) -> CoverageCache:
+        """
+        The on-disk cache of the coverage for each bug.
+        """
+        return self.__coverage_cache
 
     def __getitem__(self, name: str) -> Bug:
         """
@@ -148,38 +158,21 @@ class BugManager(object):
             self.__installation.containers.compile(c)
             print_task_end('Compiling', 'OK')
 
-            for t in bug.tests:
-                if t.expected_outcome is True:
-                    task = 'Running test: {}'.format(t.name)
-                    print_task_start(task)
-
-                    outcome = \
-                        self.__installation.containers.execute(c, t,
-                                                               verbose=verbose)
-                    if not outcome.passed:
-                        validated = False
-                        print_task_end(task, 'UNEXPECTED: FAIL')
-                        response = textwrap.indent(outcome.response.output,
-                                                   ' ' * 4)
-                        print('\n' + response)
-                    else:
-                        print_task_end(task, 'OK')
-
-                if t.expected_outcome is False:
-                    task = 'Running test: {}'.format(t.name)
-                    print_task_start(task)
-
-                    outcome = \
-                        self.__installation.containers.execute(c, t,
-                                                               verbose=verbose)
-                    if outcome.passed:
-                        validated = False
-                        print_task_end(task, 'UNEXPECTED: PASS')
-                        response = textwrap.indent(outcome.response.output,
-                                                   ' ' * 4)
-                        print('\n' + response)
-                    else:
-                        print_task_end(task, 'OK')
+            tests = [t for t in bug.tests if t.expected_outcome is not None]
+            mgr_ctr = self.__installation.containers
+            for (t, outcome) in mgr_ctr.run_tests(c, tests):
+                task = 'Running test: {}'.format(t.name)
+                if verbose:
+                    print(outcome.response.output, flush=True)
+                if outcome.passed == t.expected_outcome:
+                    print_task_end(task, 'OK')
+                    continue
+
+                validated = False
+                unexpected = 'PASS' if outcome.passed else 'FAIL'
+                print_task_end(task, 'UNEXPECTED: {}'.format(unexpected))
+                response = textwrap.indent(outcome.response.output, ' ' * 4)
+                print('\n' + response)
 
         # ensure that the container is destroyed!
         finally:
@@ -188,36 +181,56 @@ class BugManager(object):
 
         return validated
 
-    def coverage(self, bug: Bug) -> TestSuiteCoverage:
+    def coverage(self,
+                 bug: Bug,
+                 progress: Optional[Callable[[int, int], None]] = None
+                 ) -> TestSuiteCoverage:
         """
         Provides coverage information for each test within the test suite
         for the program associated with this bug.
 
         Parameters:
             bug: the bug for which to compute coverage.
+            progress: an optional callback that is used to report progress
+                if coverage must be computed. See `CoverageManager.coverage`.
 
         Returns:
             a test suite coverage report for the given bug.
         """
-        # determine the location of the coverage map on disk
-        fn = os.path.join(self.__installation.coverage_path,
-                          "{}.coverage.yml".format(bug.name))
-
         # is the coverage already cached? if so, load.
-        if os.path.exists(fn):
-            return TestSuiteCoverage.from_file(fn)
+        coverage = self.__coverage_cache.get(bug)
+        if coverage is not None:
+            return coverage
+        return self.compute_coverage(bug, progress=progress)
 
-        # if we don't have coverage information, compute it
+    def compute_coverage(self,
+                         bug: Bug,
+                         progress: Optional[Callable[[int, int], None]] = None
+                         ) -> TestSuiteCoverage:
+        """
+        Computes coverage information for each test within the test suite
+        for the program associated with this bug, without consulting the
+        coverage cache, and stores it in the cache.
+
+        Parameters:
+            bug: the bug for which to compute coverage.
+            progress: an optional callback that is used to report progress.
+                See `CoverageManager.coverage`.
+
+        Returns:
+            a test suite coverage report for the given bug.
+        """
         try:
             mgr_ctr = self.__installation.containers
             mgr_cov = self.__installation.coverage
             container = None
             container = mgr_ctr.provision(bug)
-            coverage = mgr_cov.coverage(container, bug.tests)
+            coverage = mgr_cov.coverage(container,
+                                        bug.tests,
+                                        progress=progress)
 
             # save to disk
-            with open(fn, 'w') as f:
-                yaml.dump(coverage.to_dict(), f, default_flow_style=False)
+            self.__coverage_cache.put(bug, coverage)
         finally:
             if container:
                 del mgr_ctr[container.id]
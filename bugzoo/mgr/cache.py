@@ -0,0 +1,242 @@
+from typing import Dict, Any, Optional
+import collections
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+from ..core.bug import Bug
+from ..core.test import TestCase, TestOutcome
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['TestOutcomeCache']
+
+
+class TestOutcomeCache(object):
+    """
+    Memoizes the outcomes of test executions, allowing the same test to be
+    skipped when it is executed against a program whose source code has
+    already been evaluated (e.g., when a duplicate patch is evaluated).
+
+    Outcomes are keyed by the bug, a fingerprint of the source code inside
+    the container (see `ContainerManager.fingerprint`), and the description
+    of the test. The most recently used outcomes are kept in memory, and may
+    optionally be written to an SQLite database on disk, allowing them to be
+    reused across server restarts.
+
+    The cache is disabled by default. It assumes that the program inside a
+    container has been built from its current source code, and that tests
+    and arbitrary shell commands do not modify that source code.
+    """
+    def __init__(self,
+                 enabled: bool = False,
+                 max_size: int = 10000,
+                 path: Optional[str] = None,
+                 max_disk_size: int = 1000000
+                 ) -> None:
+        """
+        Parameters:
+            enabled: indicates whether or not the cache should be used.
+            max_size: the maximum number of outcomes that may be kept in
+                memory.
+            path: the path to an optional SQLite database that should be
+                used to store outcomes on disk.
+            max_disk_size: the maximum number of outcomes that may be kept in
+                the database.
+        """
+        assert max_size > 0
+        assert max_disk_size > 0
+        self.__lock = threading.Lock()
+        self.__enabled = enabled
+        self.__max_size = max_size
+        self.__max_disk_size = max_disk_size
+        self.__memory = collections.OrderedDict()  # type: collections.OrderedDict  # noqa: pycodestyle
+        self.__db = None  # type: Optional[sqlite3.Connection]
+        self.__path = None  # type: Optional[str]
+        self.__disk_size = 0
+        self.__num_hits = 0
+        self.__num_misses = 0
+        self.__num_evictions = 0
+        if path:
+            self.__open(path)
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indicates whether or not this cache is enabled.
+        """
+        return self.__enabled
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        The path to the SQLite database used by this cache, if any.
+        """
+        return self.__path
+
+    def configure(self,
+                  enabled: Optional[bool] = None,
+                  max_size: Optional[int] = None,
+                  path: Optional[str] = None,
+                  max_disk_size: Optional[int] = None
+                  ) -> None:
+        """
+        Updates the configuration of this cache. Any unspecified options will
+        retain their current values.
+        """
+        with self.__lock:
+            if enabled is not None:
+                self.__enabled = enabled
+            if max_size is not None:
+                assert max_size > 0
+                self.__max_size = max_size
+                self.__evict_memory()
+            if max_disk_size is not None:
+                assert max_disk_size > 0
+                self.__max_disk_size = max_disk_size
+            if path is not None and path != self.__path:
+                self.__open(path)
+            elif max_disk_size is not None:
+                self.__evict_disk()
+            logger.info("configured test outcome cache (enabled: %s, max. size: %d, path: %s, max. disk size: %d)",  # noqa: pycodestyle
+                        self.__enabled, self.__max_size, self.__path,
+                        self.__max_disk_size)
+
+    def __open(self, path: str) -> None:
+        """
+        Opens the SQLite database at a given path, creating it if necessary.
+        """
+        if self.__db:
+            self.__db.close()
+        dir_db = os.path.dirname(path)
+        if dir_db and not os.path.exists(dir_db):
+            os.makedirs(dir_db)
+        logger.debug("opening test outcome cache database: %s", path)
+        self.__db = sqlite3.connect(path, check_same_thread=False)
+        self.__db.execute(
+            "CREATE TABLE IF NOT EXISTS outcomes ("
+            "key TEXT PRIMARY KEY, outcome TEXT NOT NULL, accessed REAL NOT NULL)")  # noqa: pycodestyle
+        self.__db.execute(
+            "CREATE INDEX IF NOT EXISTS outcomes_accessed ON outcomes (accessed)")  # noqa: pycodestyle
+        self.__db.commit()
+        self.__path = path
+        self.__disk_size = \
+            self.__db.execute("SELECT COUNT(*) FROM outcomes").fetchone()[0]
+        self.__evict_disk()
+
+    @staticmethod
+    def key(bug: Bug, fingerprint: str, test: TestCase) -> str:
+        """
+        Computes the key for the outcome of a given test for a given bug,
+        whose source code has a given fingerprint.
+        """
+        h = hashlib.sha256()
+        h.update(bug.name.encode('utf-8') + b'\0')
+        h.update(fingerprint.encode('utf-8') + b'\0')
+        h.update(json.dumps(test.to_dict(), sort_keys=True).encode('utf-8'))
+        return h.hexdigest()
+
+    def get(self, key: str) -> Optional[TestOutcome]:
+        """
+        Retrieves the outcome with a given key from this cache.
+
+        Returns:
+            the cached outcome, or None if no outcome is stored for the key.
+        """
+        with self.__lock:
+            outcome = self.__memory.get(key)
+            if outcome is not None:
+                self.__memory.move_to_end(key)
+            elif self.__db:
+                row = self.__db.execute(
+                    "SELECT outcome FROM outcomes WHERE key = ?",
+                    (key,)).fetchone()
+                if row:
+                    outcome = TestOutcome.from_dict(json.loads(row[0]))
+                    self.__db.execute(
+                        "UPDATE outcomes SET accessed = ? WHERE key = ?",
+                        (time.time(), key))
+                    self.__db.commit()
+                    self.__memory[key] = outcome
+                    self.__evict_memory()
+
+            if outcome is None:
+                self.__num_misses += 1
+            else:
+                self.__num_hits += 1
+            return outcome
+
+    def put(self, key: str, outcome: TestOutcome) -> None:
+        """
+        Stores a given outcome in this cache.
+        """
+        with self.__lock:
+            self.__memory[key] = outcome
+            self.__memory.move_to_end(key)
+            self.__evict_memory()
+            if self.__db:
+                exists = self.__db.execute(
+                    "SELECT 1 FROM outcomes WHERE key = ?",
+                    (key,)).fetchone() is not None
+                self.__db.execute(
+                    "INSERT OR REPLACE INTO outcomes VALUES (?, ?, ?)",
+                    (key, json.dumps(outcome.to_dict()), time.time()))
+                self.__db.commit()
+                if not exists:
+                    self.__disk_size += 1
+                self.__evict_disk()
+
+    def __evict_memory(self) -> None:
+        while len(self.__memory) > self.__max_size:
+            self.__memory.popitem(last=False)
+            self.__num_evictions += 1
+
+    def __evict_disk(self) -> None:
+        if not self.__db or self.__disk_size <= self.__max_disk_size:
+            return
+        num_excess = self.__disk_size - self.__max_disk_size
+        self.__db.execute(
+            "DELETE FROM outcomes WHERE key IN "
+            "(SELECT key FROM outcomes ORDER BY accessed ASC LIMIT ?)",
+            (num_excess,))
+        self.__db.commit()
+        self.__disk_size -= num_excess
+        self.__num_evictions += num_excess
+
+    def clear(self) -> None:
+        """
+        Removes all outcomes from this cache, including those on disk, and
+        resets its statistics.
+        """
+        with self.__lock:
+            self.__memory.clear()
+            if self.__db:
+                self.__db.execute("DELETE FROM outcomes")
+                self.__db.commit()
+            self.__disk_size = 0
+            self.__num_hits = 0
+            self.__num_misses = 0
+            self.__num_evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Produces a JSON-ready summary of the configuration and usage of this
+        cache.
+        """
+        with self.__lock:
+            num_requests = self.__num_hits + self.__num_misses
+            hit_rate = self.__num_hits / num_requests if num_requests else 0.0
+            return {'enabled': self.__enabled,
+                    'size': len(self.__memory),
+                    'max-size': self.__max_size,
+                    'path': self.__path,
+                    'disk-size': self.__disk_size,
+                    'max-disk-size': self.__max_disk_size,
+                    'hits': self.__num_hits,
+                    'misses': self.__num_misses,
+                    'hit-rate': hit_rate,
+                    'evictions': self.__num_evictions}
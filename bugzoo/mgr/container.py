@@ -1,7 +1,8 @@
-from typing import Iterator, List, Optional, Dict, Union
+from typing import Iterator, List, Optional, Dict, Union, Tuple, IO, Set, Any
+from contextlib import contextmanager
 from ipaddress import IPv4Address, IPv6Address
-from tempfile import NamedTemporaryFile
 from timeit import default_timer as timer
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import sys
 import time
 import subprocess
@@ -11,6 +12,13 @@ import os
 import uuid
 import copy
 import logging
+import threading
+import tarfile
+import io
+import hashlib
+import math
+import socket
+import struct
 
 import docker
 
@@ -24,25 +32,77 @@ from ..core.bug import Bug
 from ..compiler import CompilationOutcome
 from ..cmd import ExecResponse, PendingExecResponse
 from ..util import indent
+from .pool import ContainerPool
+from .session import ShellSession, ShellSessionClosed
+from .cache import TestOutcomeCache
+from .batch import build_driver, parse_driver_output
 
 logger = logging.getLogger(__name__)
 
 __all__ = ['ContainerManager']
 
 
+class _ChunkStream(io.RawIOBase):
+    """
+    A read-only, non-seekable file-like object over an iterator of chunks of
+    bytes, used to consume the archives produced by the Docker API without
+    first loading them into memory.
+    """
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self.__chunks = chunks
+        self.__buffer = memoryview(b'')
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while not self.__buffer:
+            try:
+                self.__buffer = memoryview(next(self.__chunks))
+            except StopIteration:
+                return 0
+        n = min(len(b), len(self.__buffer))
+        b[:n] = self.__buffer[:n]
+        self.__buffer = self.__buffer[n:]
+        return n
+
+
 class ContainerManager(object):
+    MAX_PROVISION_WORKERS = 8
+
+    # the location of the git repository, inside each container, that is used
+    # to record the baseline state of its source code.
+    BASELINE_DIR = '/.bugzoo/baseline'
+
     def __init__(self, installation: 'BugZoo') -> None:
         logger.debug("initialising container manager")
         self.__installation = installation
 
         logger.debug("connecting to low-level Docker API")
         self.__client_docker = installation.docker  # type: docker.Client
-        # self.__api_docker = self.__client_docker.api  # type: docker.APIClient
-        self.__api_docker = \
-            docker.APIClient(base_url=installation.base_url_docker,
-                             timeout=120)  # type: docker.APIClient
+        self.__api_docker = self.__client_docker.api  # type: docker.APIClient
         assert self.__api_docker.ping()
         logger.debug("connected to low-level Docker API")
+        self.__pool = ContainerPool(self)
+        self.__use_sessions = False
+        self.__sessions = {}  # type: Dict[str, ShellSession]
+        self.__sessions_lock = threading.Lock()
+        self.__baselines_lock = threading.Lock()
+        self.__clones_lock = threading.Lock()
+        self.__clone_images = {}  # type: Dict[str, int]
+        self.__clone_image_of = {}  # type: Dict[str, str]
+        self.__outcome_cache = TestOutcomeCache()
+        self.__fingerprints_lock = threading.Lock()
+        self.__stats_lock = threading.Lock()
+        self.__num_tests_executed = 0
+        self.__num_tests_cached = 0
+        self.__num_tests_saved = 0
+        self.__num_time_limits_fired = 0
+        self.__adaptive_time_limits = False
+        self.__time_limit_percentile = 99.0
+        self.__time_limit_multiplier = 3.0
+        self.__time_limit_floor = 5.0
+        self.__time_limit_min_samples = 5
         self.clear()
         logger.debug("initialised container manager")
 
@@ -51,12 +111,139 @@ class ContainerManager(object):
         Closes all running containers.
         """
         logger.debug("clearing all running containers")
+        with self.__sessions_lock:
+            for session in self.__sessions.values():
+                session.close()
+            self.__sessions = {}
         self.__containers = {}
         self.__dockerc = {}
         self.__env_files = {}
         self.__dockerc_tools = {}
+        with self.__baselines_lock:
+            self.__baselines = set()  # type: Set[str]
+            self.__baseline_locks = {}  # type: Dict[str, threading.Lock]
+            self.__touched = {}  # type: Dict[str, Set[str]]
+        with self.__fingerprints_lock:
+            self.__fingerprints = {}  # type: Dict[str, str]
+            self.__modified = set()  # type: Set[str]
+        with self.__clones_lock:
+            for id_image in self.__clone_images:
+                self.__remove_clone_image(id_image)
+            self.__clone_images = {}
+            self.__clone_image_of = {}
         logger.debug("cleared all running containers")
 
+    @property
+    def use_sessions(self) -> bool:
+        """
+        Indicates whether or not blocking commands should be executed using a
+        long-lived shell session inside each container, rather than creating a
+        new Docker exec instance and shell for every command.
+
+        Commands that are executed within a session are not attached to a
+        TTY, and so their output uses `\n` line endings and excludes their
+        standard error, whereas commands that are executed using a separate
+        exec instance are attached to a TTY.
+        """
+        return self.__use_sessions
+
+    @use_sessions.setter
+    def use_sessions(self, enabled: bool) -> None:
+        logger.info("%s shell sessions",
+                    "enabling" if enabled else "disabling")
+        self.__use_sessions = enabled
+
+    @property
+    def adaptive_time_limits(self) -> bool:
+        """
+        Indicates whether or not tests are executed using time limits that
+        are learned from the durations of their previous executions, rather
+        than the static time limits given by their manifest.
+        """
+        return self.__adaptive_time_limits
+
+    def configure_time_limits(self,
+                              enabled: Optional[bool] = None,
+                              percentile: Optional[float] = None,
+                              multiplier: Optional[float] = None,
+                              floor: Optional[float] = None,
+                              min_samples: Optional[int] = None
+                              ) -> None:
+        """
+        Configures the use of adaptive time limits. Any unspecified options
+        will retain their current values.
+
+        Parameters:
+            enabled: toggles the use of adaptive time limits.
+            percentile: the percentile of the durations of the previous
+                executions of a test that is used to compute its time limit.
+            multiplier: the number by which the percentile is multiplied.
+            floor: the minimum time limit, in seconds.
+            min_samples: the minimum number of previous executions that are
+                required before an adaptive time limit is used for a test.
+        """
+        if enabled is not None:
+            self.__adaptive_time_limits = enabled
+        if percentile is not None:
+            assert 0 < percentile <= 100
+            self.__time_limit_percentile = percentile
+        if multiplier is not None:
+            assert multiplier >= 1
+            self.__time_limit_multiplier = multiplier
+        if floor is not None:
+            assert floor > 0
+            self.__time_limit_floor = floor
+        if min_samples is not None:
+            assert min_samples > 0
+            self.__time_limit_min_samples = min_samples
+        logger.info("configured adaptive time limits (enabled: %s, percentile: %.1f, multiplier: %.2f, floor: %.2f, min. samples: %d)",  # noqa: pycodestyle
+                    self.__adaptive_time_limits,
+                    self.__time_limit_percentile,
+                    self.__time_limit_multiplier,
+                    self.__time_limit_floor,
+                    self.__time_limit_min_samples)
+
+    def time_limit(self, bug: Bug, test: TestCase) -> int:
+        """
+        Determines the time limit, in seconds, that should be used to execute
+        a given test. If adaptive time limits are enabled and the test has
+        been executed enough times before, the time limit is given by a
+        percentile of the durations of its previous executions multiplied by
+        a constant, subject to a minimum value. The static time limit of the
+        test is used otherwise, and is never exceeded.
+
+        Executions that were terminated by a time limit are ignored, since
+        their durations reflect the limit rather than the test; otherwise,
+        each time that the adaptive limit fired, it would grow.
+        """
+        if not self.__adaptive_time_limits:
+            return test.time_limit
+        history = self.__installation.history
+        num_finished = history.num_executions(bug, test, finished=True)
+        if num_finished < self.__time_limit_min_samples:
+            return test.time_limit
+        duration = history.percentile(bug,
+                                      test,
+                                      self.__time_limit_percentile,
+                                      finished=True)
+        limit = duration * self.__time_limit_multiplier
+        limit = max(limit, self.__time_limit_floor)
+        return min(math.ceil(limit), test.time_limit)
+
+    @property
+    def outcome_cache(self) -> TestOutcomeCache:
+        """
+        The cache that is used to memoize test outcomes.
+        """
+        return self.__outcome_cache
+
+    @property
+    def pool(self) -> ContainerPool:
+        """
+        The pool of warm containers that is used to speed up provisioning.
+        """
+        return self.__pool
+
     def __iter__(self) -> Iterator[Container]:
         """
         Returns an iterator over the set of running containers.
@@ -94,6 +281,27 @@ class ContainerManager(object):
                 self.__env_files[uid].close()
                 del self.__env_files[uid]
 
+            with self.__sessions_lock:
+                if uid in self.__sessions:
+                    self.__sessions.pop(uid).close()
+
+            with self.__baselines_lock:
+                self.__baselines.discard(uid)
+                self.__baseline_locks.pop(uid, None)
+                self.__touched.pop(uid, None)
+
+            with self.__fingerprints_lock:
+                self.__fingerprints.pop(uid, None)
+                self.__modified.discard(uid)
+
+            with self.__clones_lock:
+                id_image = self.__clone_image_of.pop(uid, None)
+                if id_image is not None:
+                    self.__clone_images[id_image] -= 1
+                    if self.__clone_images[id_image] == 0:
+                        del self.__clone_images[id_image]
+                        self.__remove_clone_image(id_image)
+
             del self.__dockerc[uid]
             del self.__dockerc_tools[uid]
             del self.__containers[uid]
@@ -119,7 +327,8 @@ class ContainerManager(object):
                   volumes: Optional[Dict[str, str]] = None,
                   network_mode: str = 'bridge',
                   ports: Optional[Dict[int, int]] = None,
-                  interactive: bool = False
+                  interactive: bool = False,
+                  reset: bool = False
                   ) -> Container:
         """
         Provisions and returns a container for a given bug.
@@ -128,6 +337,8 @@ class ContainerManager(object):
             bug: the bug that should be used to provision a container.
             uid: a unique identifier (UID) for the container. If no UID is
                 provided then one will be automatically generated.
+            reset: if `True`, the baseline for the container is recorded once
+                it has been provisioned, allowing it to be reset later on.
 
         Returns:
             a description of the provisioned container.
@@ -139,13 +350,137 @@ class ContainerManager(object):
         if ports is None:
             ports = {}
 
+        # attempt to use a warm container from the pool; only containers with
+        # the default configuration are kept in the pool.
+        launched = None
+        if not tools and not volumes and not ports \
+           and network_mode == 'bridge':
+            launched = self.__pool.acquire(bug)
+
         if uid is None:
-            uid = str(uuid.uuid4())
+            uid = launched[0] if launched else str(uuid.uuid4())
         logger.debug("provisioning container for bug %s: %s",
                      bug.name, uid)
 
-        tool_containers = [self.__installation.tools.provision(t) for t in tools]
+        if launched:
+            uid_warm, dockerc, env_file = launched
+            if uid_warm != uid:
+                logger.debug("renaming warm container %s to %s",
+                             uid_warm, uid)
+                dockerc.rename(uid)
+            tool_containers = []  # type: List[docker.Container]
+        else:
+            dockerc, env_file, tool_containers = \
+                self._launch(bug, uid, tools, volumes, network_mode, ports)
+
+        self.__dockerc[uid] = dockerc
         self.__dockerc_tools[uid] = tool_containers
+        self.__env_files[uid] = env_file
+        container = Container(bug=bug.name,
+                              uid=uid,
+                              tools=[t.name for t in tools])
+        self.__containers[uid] = container
+        if reset:
+            self.record_baseline(container)
+        logger.debug("provisioned container for bug %s: %s",
+                     bug.name, uid)
+
+        logger.debug("STATUS OF CONTAINER: %s", dockerc.status)
+        return container
+
+    def provision_many(self,
+                       bug: Bug,
+                       n: int,
+                       tools: Optional[List[Tool]] = None,
+                       volumes: Optional[Dict[str, str]] = None,
+                       network_mode: str = 'bridge',
+                       ports: Optional[Dict[int, int]] = None,
+                       workers: Optional[int] = None,
+                       reset: bool = False
+                       ) -> Iterator[Container]:
+        """
+        Concurrently provisions a number of containers for a given bug using
+        a bounded pool of threads. Containers are returned as soon as they
+        become ready, rather than in the order in which they were requested.
+
+        Parameters:
+            bug: the bug that should be used to provision the containers.
+            n: the number of containers that should be provisioned.
+            workers: the maximum number of containers that may be provisioned
+                at the same time. Defaults to `n`, up to a maximum of
+                `ContainerManager.MAX_PROVISION_WORKERS`.
+            reset: if `True`, the baseline for each container is recorded
+                once it has been provisioned.
+
+        Returns:
+            an iterator over the provisioned containers.
+
+        Raises:
+            Exception: if one or more containers could not be provisioned.
+                The exception is raised after all other containers have been
+                provisioned and returned.
+        """
+        assert n >= 0
+        if workers is None:
+            workers = min(n, ContainerManager.MAX_PROVISION_WORKERS)
+        workers = max(workers, 1)
+        logger.debug("provisioning %d containers for bug %s using %d workers",
+                     n, bug.name, workers)
+
+        error = None  # type: Optional[Exception]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.provision,
+                                       bug,
+                                       tools=tools,
+                                       volumes=volumes,
+                                       network_mode=network_mode,
+                                       ports=ports,
+                                       reset=reset)
+                       for _ in range(n)]
+            for future in as_completed(futures):
+                try:
+                    container = future.result()
+                except Exception as err:
+                    logger.exception("failed to provision container for bug: %s",  # noqa: pycodestyle
+                                     bug.name)
+                    error = error or err
+                    continue
+                yield container
+
+        if error:
+            raise error
+        logger.debug("provisioned %d containers for bug: %s", n, bug.name)
+
+    def _launch(self,
+                bug: Bug,
+                uid: str,
+                tools: List[Tool],
+                volumes: Dict[str, str],
+                network_mode: str,
+                ports: Dict[int, int],
+                image: Optional[str] = None
+                ) -> Tuple[docker.models.containers.Container,
+                           IO[str],
+                           List[docker.models.containers.Container]]:
+        """
+        Creates and starts a Docker container for a given bug and blocks until
+        its environment is ready. The container is not registered with this
+        manager.
+
+        Parameters:
+            image: the Docker image that should be used to create the
+                container. Defaults to the image for the bug.
+
+        Returns:
+            a tuple containing the Docker container, the temporary environment
+            file that is mounted inside it, and the Docker containers for its
+            tools.
+        """
+        if len(tools) > 1:
+            with ThreadPoolExecutor(max_workers=len(tools)) as executor:
+                tool_containers = list(executor.map(self.__installation.tools.provision, tools))  # noqa: pycodestyle
+        else:
+            tool_containers = [self.__installation.tools.provision(t) for t in tools]  # noqa: pycodestyle
         tool_container_ids = [c.id for c in tool_containers]
 
         # prepare the environment for the container
@@ -157,7 +492,6 @@ class ContainerManager(object):
         env_file = tempfile.NamedTemporaryFile(mode='w', suffix='.bugzoo.env')
         env_file.write(env)
         env_file.flush()
-        self.__env_files[uid] = env_file
         logger.debug("created temporary environment file for container %s: %s",
                      uid, env_file.name)
 
@@ -184,7 +518,7 @@ class ContainerManager(object):
         logger.debug("creating Docker container for BugZoo container: %s", uid)  # noqa: pycodestyle
         dockerc = \
             self.__client_docker.containers.create(
-                bug.image,
+                image or bug.image,
                 cmd,
                 name=uid,
                 volumes=volumes,
@@ -195,7 +529,6 @@ class ContainerManager(object):
                 tty=False,
                 # tty=interactive,
                 detach=True)  # type: docker.Container # noqa: pycodestyle
-        self.__dockerc[uid] = dockerc
         logger.debug("created Docker container for BugZoo container: %s", uid)
         logger.debug("starting Docker container for BugZoo container: %s", uid)  # noqa: pycodestyle
         dockerc.start()
@@ -212,6 +545,7 @@ class ContainerManager(object):
                 ready = True
                 break
         if not ready:
+            self._discard(dockerc, env_file, tool_containers)
             response = indent(''.join(output_startup), 4)
             response = "[RESPONSE]\n{}\n[/RESPONSE]".format(response)
             response = indent(response, 2)
@@ -221,15 +555,147 @@ class ContainerManager(object):
             raise Exception(msg)  # TODO add exception; DockerException, maybe?
         logger.debug("environment file has been constructed for container: %s", uid)  # noqa: pycodestyle
 
-        container = Container(bug=bug.name,
-                              uid=uid,
-                              tools=[t.name for t in tools])
-        self.__containers[uid] = container
-        logger.debug("provisioned container for bug %s: %s",
-                     bug.name, uid)
+        return (dockerc, env_file, tool_containers)
 
-        logger.debug("STATUS OF CONTAINER: %s", dockerc.status)
-        return container
+    def clone(self,
+              container: Container,
+              n: int,
+              workers: Optional[int] = None
+              ) -> Iterator[Container]:
+        """
+        Creates a number of copies of a given container, including any build
+        artifacts and changes to its file system. The state of the container
+        is committed to a temporary Docker image once, and each copy is
+        started from that image. The image is destroyed once all of the
+        copies have been deleted.
+
+        Copies are mounted with the same tools as the original container, but
+        use the default network settings, and do not inherit any of its
+        volumes or port mappings.
+
+        Parameters:
+            container: the container that should be copied.
+            n: the number of copies that should be made.
+            workers: the maximum number of copies that may be started at the
+                same time. Defaults to `n`, up to a maximum of
+                `ContainerManager.MAX_PROVISION_WORKERS`.
+
+        Returns:
+            an iterator over the copies, in the order in which they became
+            ready.
+
+        Raises:
+            KeyError: if the given container no longer exists.
+            Exception: if one or more copies could not be started. The
+                exception is raised after all other copies have been started
+                and returned.
+        """
+        assert n >= 0
+        if workers is None:
+            workers = min(n, ContainerManager.MAX_PROVISION_WORKERS)
+        workers = max(workers, 1)
+        bug = self.__installation.bugs[container.bug]
+        tools = [self.__installation.tools[t] for t in container.tools]
+        dockerc = self.__dockerc[container.uid]
+        if n == 0:
+            return
+
+        logger.debug("committing container %s to a temporary image",
+                     container.uid)
+        id_image = dockerc.commit().id
+        logger.debug("committed container %s to temporary image: %s",
+                     container.uid, id_image)
+        with self.__clones_lock:
+            # the image is protected from removal until all copies have been
+            # launched, even if some of those copies are deleted in the
+            # meantime.
+            self.__clone_images[id_image] = \
+                self.__clone_images.get(id_image, 0) + 1
+
+        with self.__baselines_lock:
+            has_baseline = container.uid in self.__baselines
+            touched = set(self.__touched.get(container.uid, set()))
+        fingerprint = self.fingerprint(container)
+        with self.__fingerprints_lock:
+            modified = container.uid in self.__modified
+
+        def launch() -> Container:
+            uid = str(uuid.uuid4())
+            dockerc, env_file, tool_containers = \
+                self._launch(bug, uid, tools, {}, 'bridge', {},
+                             image=id_image)
+            with self.__clones_lock:
+                self.__clone_images[id_image] += 1
+                self.__clone_image_of[uid] = id_image
+            with self.__baselines_lock:
+                if has_baseline:
+                    self.__baselines.add(uid)
+                    self.__touched[uid] = set(touched)
+            with self.__fingerprints_lock:
+                self.__fingerprints[uid] = fingerprint
+                if modified:
+                    self.__modified.add(uid)
+            self.__dockerc[uid] = dockerc
+            self.__dockerc_tools[uid] = tool_containers
+            self.__env_files[uid] = env_file
+            clone = Container(bug=bug.name, uid=uid, tools=container.tools)
+            self.__containers[uid] = clone
+            return clone
+
+        logger.debug("cloning container %s %d times using %d workers",
+                     container.uid, n, workers)
+        error = None  # type: Optional[Exception]
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(launch) for _ in range(n)]
+                for future in as_completed(futures):
+                    try:
+                        clone = future.result()
+                    except Exception as err:
+                        logger.exception("failed to clone container: %s",
+                                         container.uid)
+                        error = error or err
+                        continue
+                    logger.debug("cloned container %s: %s",
+                                 container.uid, clone.uid)
+                    yield clone
+        finally:
+            with self.__clones_lock:
+                if id_image in self.__clone_images:
+                    self.__clone_images[id_image] -= 1
+                    if self.__clone_images[id_image] == 0:
+                        del self.__clone_images[id_image]
+                        self.__remove_clone_image(id_image)
+
+        if error:
+            raise error
+        logger.debug("cloned container %s %d times", container.uid, n)
+
+    def __remove_clone_image(self, id_image: str) -> None:
+        """
+        Attempts to destroy a temporary image that was used to clone a
+        container.
+        """
+        logger.debug("removing temporary clone image: %s", id_image)
+        try:
+            self.__client_docker.images.remove(id_image)
+        except docker.errors.APIError:
+            logger.warning("failed to remove temporary clone image: %s",
+                           id_image)
+
+    def _discard(self,
+                 dockerc: docker.models.containers.Container,
+                 env_file: IO[str],
+                 tool_containers: List[docker.models.containers.Container]
+                 ) -> None:
+        """
+        Destroys a Docker container that is not registered with this manager,
+        together with its environment file and tool containers.
+        """
+        dockerc.remove(force=True)
+        for container_tool in tool_containers:
+            container_tool.remove(force=True)
+        env_file.close()
 
     def mktemp(self,
                container: Container
@@ -242,7 +708,7 @@ class ContainerManager(object):
         """
         logger.debug("creating a temporary file inside container %s",
                      container.uid)
-        response = self.command(container, "mktemp")
+        response = self.command(container, "mktemp", modifies_source=False)
 
         if response.code != 0:
             msg = "failed to create temporary file for container {}: [{}] {}"
@@ -310,33 +776,228 @@ class ContainerManager(object):
                             container.uid,
                             str(p))
 
-        try:
-            file_host = NamedTemporaryFile(mode='w', suffix='bugzoo')
-            file_host.write(str(p))
-            file_host.flush()
+        self.__touch(container,
+                     [os.path.join(bug.source_dir, fn) for fn in p.new_files])
 
+        try:
             # copy contents to a temporary file on the container
             (retcode, file_container) = dockerc.exec_run('mktemp')
             assert retcode == 0
             file_container = file_container.decode(sys.stdout.encoding).strip()
 
-            self.copy_to(container, file_host.name, file_container)
+            self.write_bytes(container, file_container, str(p).encode('utf-8'))
 
             # run patch command inside the source directory
             # cmd = 'patch --no-backup-if-mismatch -p0 -u -i "{}"'.format(container_file, stderr=True)
             cmd = 'sudo chown $(whoami) {} && git apply -p0 "{}"'
             cmd = cmd.format(file_container, file_container)
-            outcome = self.command(container, cmd, context=bug.source_dir)
+            outcome = self.command(container, cmd,
+                                   context=bug.source_dir,
+                                   modifies_source=False)
             logger.debug("Patch application outcome [%s]: (retcode=%d)\n%s",
                                 container.uid,
                                 outcome.code,
                                 outcome.output)
+            if outcome.code == 0:
+                self.__update_fingerprint(container,
+                                          b'patch',
+                                          str(p).encode('utf-8'))
             return outcome.code == 0
 
         finally:
             if file_container:
                 dockerc.exec_run('rm "{}"'.format(file_container))
 
+    def __touch(self, container: Container, filepaths: List[str]) -> bool:
+        """
+        Records that a given set of files inside a container are about to be
+        modified, allowing any files that are created within the source
+        directory to be removed when the container is reset. Files are only
+        recorded for containers that have a baseline.
+
+        Returns:
+            `True` if any of the files belong to the source directory.
+        """
+        bug = self.__installation.bugs[container.bug]
+        dir_source = os.path.normpath(bug.source_dir)
+        paths = [os.path.normpath(fn) for fn in filepaths]
+        paths = [os.path.relpath(fn, dir_source) for fn in paths
+                 if fn.startswith(dir_source + '/')]
+        if not paths:
+            return False
+        with self.__baselines_lock:
+            if container.uid in self.__baselines:
+                self.__touched.setdefault(container.uid, set()).update(paths)
+        return True
+
+    def fingerprint(self, container: Container) -> str:
+        """
+        Computes a fingerprint of the source code inside a given container.
+        The fingerprint is derived from the Docker image for the bug and the
+        sequence of patches and file writes that have been applied to the
+        source directory via BugZoo since the container was provisioned or
+        last reset.
+
+        Since the effects of arbitrary shell commands are unknown, executing
+        such a command (see `command`) replaces the fingerprint with a unique
+        value that is not shared with any other container (besides its
+        clones). Until the container is reset, its fingerprint only reflects
+        the patches and file writes that were applied after the command.
+        """
+        with self.__fingerprints_lock:
+            fingerprint = self.__fingerprints.get(container.uid)
+        if fingerprint is not None:
+            return fingerprint
+
+        bug = self.__installation.bugs[container.bug]
+        id_image = self.__client_docker.images.get(bug.image).id
+        h = hashlib.sha256()
+        h.update(bug.name.encode('utf-8') + b'\0')
+        h.update(id_image.encode('utf-8'))
+        fingerprint = h.hexdigest()
+        with self.__fingerprints_lock:
+            return self.__fingerprints.setdefault(container.uid, fingerprint)
+
+    def __update_fingerprint(self, container: Container, *parts: bytes) -> None:  # noqa: pycodestyle
+        """
+        Updates the fingerprint of the source code inside a given container
+        to reflect a modification that is described by a sequence of bytes.
+        """
+        fingerprint = self.fingerprint(container)
+        h = hashlib.sha256(fingerprint.encode('utf-8'))
+        for part in parts:
+            h.update(str(len(part)).encode('utf-8') + b':' + part)
+        with self.__fingerprints_lock:
+            self.__fingerprints[container.uid] = h.hexdigest()
+
+    def __invalidate_fingerprint(self, container: Container) -> None:
+        """
+        Replaces the fingerprint of the source code inside a given container
+        with a unique value, following a modification whose effects are
+        unknown.
+        """
+        fingerprint = hashlib.sha256(uuid.uuid4().bytes).hexdigest()
+        with self.__fingerprints_lock:
+            self.__fingerprints[container.uid] = fingerprint
+            self.__modified.add(container.uid)
+
+    def __git_baseline(self,
+                       container: Container,
+                       cmd: str
+                       ) -> ExecResponse:
+        """
+        Executes a given shell command inside the source directory of a
+        container using the baseline repository for that container.
+        """
+        bug = self.__installation.bugs[container.bug]
+        env = "export GIT_DIR={} GIT_WORK_TREE={} && "
+        env = env.format(ContainerManager.BASELINE_DIR, bug.source_dir)
+        return self.command(container,
+                            env + cmd,
+                            context=bug.source_dir,
+                            stderr=True,
+                            modifies_source=False)
+
+    def record_baseline(self, container: Container) -> None:
+        """
+        Records the current state of the source directory inside a given
+        container as its baseline, unless a baseline has already been
+        recorded. The baseline is stored in a separate git repository inside
+        the container, and so it does not interfere with any version control
+        used by the program under test.
+
+        Recording a baseline requires a snapshot of the entire source
+        directory, and so it is only performed on request, either when the
+        container is provisioned with `reset` enabled, or by calling this
+        method. Any changes that were made before the baseline was recorded
+        are treated as part of the baseline.
+
+        Raises:
+            FailedToResetContainer: if the baseline could not be recorded.
+        """
+        uid = container.uid
+        with self.__baselines_lock:
+            if uid in self.__baselines:
+                return
+            lock = self.__baseline_locks.setdefault(uid, threading.Lock())
+
+        with lock:
+            if uid in self.__baselines:
+                return
+            logger.debug("recording baseline for container: %s", uid)
+            cmd = ("sudo mkdir -p {0} && "
+                   "sudo chown -R $(whoami) {0} && "
+                   "git init -q && "
+                   "git add -A -f . && "
+                   "git -c user.name=bugzoo -c user.email=bugzoo@localhost "
+                   "commit -q --allow-empty --no-verify -m baseline")
+            cmd = cmd.format(ContainerManager.BASELINE_DIR)
+            response = self.__git_baseline(container, cmd)
+            if response.code != 0:
+                logger.error("failed to record baseline for container %s: %s",
+                             uid, response.output)
+                raise FailedToResetContainer(uid, response.output)
+            with self.__baselines_lock:
+                self.__baselines.add(uid)
+            logger.debug("recorded baseline for container: %s", uid)
+
+    def reset(self,
+              container: Container,
+              build_outputs: bool = False
+              ) -> None:
+        """
+        Restores the source directory inside a given container to its
+        baseline state (i.e., its state when `record_baseline` was called),
+        without destroying the container. Files that were modified
+        or deleted since the baseline are restored, and files that were
+        created by patches or file writes are removed.
+
+        Parameters:
+            container: the container that should be reset.
+            build_outputs: if `True`, all files that did not exist in the
+                baseline, including build outputs and files that are ignored
+                by the program's version control, are also removed. If
+                `False`, build outputs are kept, allowing subsequent builds to
+                be performed incrementally.
+
+        Raises:
+            FailedToResetContainer: if the container could not be reset, or
+                if no baseline has been recorded for the container.
+        """
+        uid = container.uid
+        with self.__baselines_lock:
+            recorded = uid in self.__baselines
+        if not recorded:
+            raise FailedToResetContainer(uid, "no baseline was recorded")
+
+        logger.debug("resetting container: %s", uid)
+        with self.__baselines_lock:
+            touched = self.__touched.pop(uid, set())
+
+        cmd = "git checkout -q -f HEAD -- ."
+        if build_outputs:
+            cmd += " && git clean -q -f -d -x"
+        elif touched:
+            paths = ' '.join('"{}"'.format(fn) for fn in sorted(touched))
+            cmd += " && git clean -q -f -d -x -- {}".format(paths)
+        response = self.__git_baseline(container, cmd)
+        if response.code != 0:
+            logger.error("failed to reset container %s: %s",
+                         uid, response.output)
+            raise FailedToResetContainer(uid, response.output)
+
+        # files that were created by arbitrary shell commands are only
+        # removed if build outputs are also removed
+        with self.__fingerprints_lock:
+            modified = uid in self.__modified
+        if modified and not build_outputs:
+            self.__invalidate_fingerprint(container)
+        else:
+            with self.__fingerprints_lock:
+                self.__fingerprints.pop(uid, None)
+                self.__modified.discard(uid)
+        logger.debug("reset container: %s", uid)
+
     def interact(self, container: Container) -> None:
         """
         Connects to the PTY (pseudo-TTY) for a given container.
@@ -366,27 +1027,387 @@ class ContainerManager(object):
     def execute(self,
                 container: Container,
                 test: TestCase,
-                verbose: bool = False
+                verbose: bool = False,
+                *,
+                use_cache: bool = True
                 ) -> TestOutcome:
         """
-        Runs a specified test inside a given container.
+        Runs a specified test inside a given container. If the test outcome
+        cache is enabled, the outcome of a previous execution of the test
+        against the same source code is returned instead, if one exists.
+
+        Parameters:
+            use_cache: if False, the test is always executed, even if its
+                outcome is cached. Callers that depend upon the side effects
+                of executing the test (e.g., the coverage counters that it
+                writes) must disable the cache. The outcome of the execution
+                is still recorded in the cache.
 
         Returns:
             the outcome of the test execution.
         """
         bug = self.__installation.bugs[container.bug]  # type: Bug
+        if use_cache:
+            outcome = self.__cached_outcome(container, bug, test)
+            if outcome is not None:
+                return outcome
+
+        time_limit = self.time_limit(bug, test)
         response = self.command(container,
                                 cmd=test.command,
                                 context=test.context,
                                 stderr=True,
-                                time_limit=test.time_limit,
+                                time_limit=time_limit,
                                 kill_after=test.kill_after,
-                                verbose=verbose)
-        passed = test.oracle.check(response)
-        return TestOutcome(response, passed)
+                                verbose=verbose,
+                                modifies_source=False)
+        return self.__record_outcome(container, bug, test, time_limit, response)  # noqa: pycodestyle
 
     test = execute
 
+    def execute_many(self,
+                     container: Container,
+                     tests: List[TestCase],
+                     *,
+                     use_cache: bool = True
+                     ) -> List[TestOutcome]:
+        """
+        Runs a sequence of tests, one after another, inside a given container
+        using a single invocation of a driver script, rather than a separate
+        command for each test. For suites of many short tests, this avoids
+        paying the overhead of creating a Docker exec instance for every
+        test. Each test is still subject to its own time limit and is
+        executed within its own context directory.
+
+        Unless `use_cache` is False, tests whose outcomes are found in the
+        test outcome cache are not executed. Any tests that were not executed
+        by the driver (e.g., because the driver was terminated) are executed
+        individually.
+
+        Returns:
+            the outcomes of the tests, in the order in which they were given.
+        """
+        bug = self.__installation.bugs[container.bug]  # type: Bug
+        if use_cache:
+            outcomes = \
+                [self.__cached_outcome(container, bug, t) for t in tests]  # type: List[Optional[TestOutcome]]  # noqa: pycodestyle
+        else:
+            outcomes = [None] * len(tests)
+        pending = [(i, t, self.time_limit(bug, t))
+                   for (i, t) in enumerate(tests) if outcomes[i] is None]
+        if not pending:
+            return outcomes  # type: ignore
+
+        logger.debug("running batch of %d tests in container: %s",
+                     len(pending), container.uid)
+        # the driver is piped to the shell, rather than being written to a
+        # file, so that a single exec instance is needed for the batch
+        driver = build_driver([(t, l) for (_, t, l) in pending])
+        response = self.__command_with_input(container,
+                                             ['/bin/bash', '-s'],
+                                             driver)
+        responses = parse_driver_output(response.output)
+
+        for (j, (i, test, time_limit)) in enumerate(pending):
+            if j in responses:
+                outcomes[i] = self.__record_outcome(container,
+                                                    bug,
+                                                    test,
+                                                    time_limit,
+                                                    responses[j])
+            else:
+                logger.warning("test driver failed to execute test %s in container %s: executing test individually.",  # noqa: pycodestyle
+                               test.name, container.uid)
+                outcomes[i] = self.execute(container,
+                                           test,
+                                           use_cache=use_cache)
+        logger.debug("ran batch of %d tests in container: %s",
+                     len(pending), container.uid)
+        return outcomes  # type: ignore
+
+    def __command_with_input(self,
+                             container: Container,
+                             cmd: List[str],
+                             data: bytes
+                             ) -> ExecResponse:
+        """
+        Executes a given command inside a container using a single exec
+        instance, and writes the given data to its standard input. The
+        output of the command includes both its standard output and its
+        standard error.
+        """
+        logger_c = logger.getChild(container.uid)
+        logger_c.debug("executing command with input: %s", cmd)
+        response = self.__api_docker.exec_create(container.id,
+                                                 cmd,
+                                                 stdin=True,
+                                                 stdout=True,
+                                                 stderr=True,
+                                                 tty=False)
+        exec_id = response['Id']
+        time_start = timer()
+        attached = self.__api_docker.exec_start(exec_id, socket=True)
+        sock = getattr(attached, '_sock', attached)  # type: socket.socket
+        sock.settimeout(None)
+
+        # the input is written by a separate thread, since the command may
+        # block on writing its output before it has read all of its input
+        def send() -> None:
+            try:
+                sock.sendall(data)
+                sock.shutdown(socket.SHUT_WR)
+            except OSError:
+                logger_c.exception("failed to write input to command: %s",
+                                   cmd)
+        sender = threading.Thread(target=send, daemon=True)
+        sender.start()
+
+        # the output is multiplexed into frames, each of which consists of an
+        # eight-byte header, describing the stream and size of the frame,
+        # followed by its contents
+        raw = bytearray()
+        try:
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                raw += chunk
+        finally:
+            sender.join()
+            sock.close()
+        output = bytearray()
+        offset = 0
+        while offset + 8 <= len(raw):
+            (_, size) = struct.unpack_from('>BxxxL', raw, offset)
+            output += raw[offset + 8:offset + 8 + size]
+            offset += 8 + size
+
+        time_running = timer() - time_start
+        code = self.__api_docker.exec_inspect(exec_id)['ExitCode']
+        logger_c.debug("finished executing command with input: %s. (exited with code %d and took %.2f seconds.)",  # noqa: pycodestyle
+                       cmd, code, time_running)
+        return ExecResponse(code,
+                            time_running,
+                            output.decode('utf-8', errors='replace'))
+
+    def __cached_outcome(self,
+                         container: Container,
+                         bug: Bug,
+                         test: TestCase
+                         ) -> Optional[TestOutcome]:
+        """
+        Retrieves the outcome of a previous execution of a given test against
+        the current source code inside a container from the test outcome
+        cache, if the cache is enabled and such an outcome exists.
+        """
+        cache = self.__outcome_cache
+        if not cache.enabled:
+            return None
+        key = cache.key(bug, self.fingerprint(container), test)
+        outcome = cache.get(key)
+        if outcome is not None:
+            logger.debug("using cached outcome for test %s in container: %s",  # noqa: pycodestyle
+                         test.name, container.uid)
+            with self.__stats_lock:
+                self.__num_tests_cached += 1
+        return outcome
+
+    def __record_outcome(self,
+                         container: Container,
+                         bug: Bug,
+                         test: TestCase,
+                         time_limit: int,
+                         response: ExecResponse
+                         ) -> TestOutcome:
+        """
+        Determines the outcome of a test execution from its response, and
+        records that outcome in the test history and outcome cache.
+        """
+        # determine whether the adaptive time limit caused the test to be
+        # terminated (i.e., timeout exited with SIGTERM or SIGKILL)
+        if time_limit < test.time_limit \
+           and response.code in (124, 137) \
+           and response.duration >= time_limit:
+            logger.debug("adaptive time limit (%d seconds) fired for test %s in container: %s",  # noqa: pycodestyle
+                         time_limit, test.name, container.uid)
+            with self.__stats_lock:
+                self.__num_time_limits_fired += 1
+        passed = test.oracle.check(response)
+        outcome = TestOutcome(response, passed)
+        fingerprint = self.fingerprint(container)
+        self.__installation.history.record(bug,
+                                           test,
+                                           outcome,
+                                           container=container,
+                                           fingerprint=fingerprint)
+        with self.__stats_lock:
+            self.__num_tests_executed += 1
+        cache = self.__outcome_cache
+        if cache.enabled:
+            cache.put(cache.key(bug, fingerprint, test), outcome)
+        return outcome
+
+    def run_tests(self,
+                  container: Container,
+                  tests: Optional[List[TestCase]] = None,
+                  workers: Optional[int] = None,
+                  stop_on_failure: bool = False,
+                  stop_on_unexpected: bool = False,
+                  fitness_threshold: Optional[int] = None,
+                  batch_size: Optional[int] = None
+                  ) -> Iterator[Tuple[TestCase, TestOutcome]]:
+        """
+        Runs a number of tests inside a given container. If the test harness
+        for the bug permits it (i.e., `parallel` is enabled for its test
+        suite), the tests are executed concurrently; otherwise, they are
+        executed one after another.
+
+        The execution of the tests may be terminated early according to a
+        number of policies. When this happens, the outcomes of any tests that
+        were already being executed are discarded, and the number of tests
+        that were never started is added to the number of saved test
+        executions (see `test_stats`).
+
+        Parameters:
+            container: the container in which the tests should be executed.
+            tests: the tests that should be executed. Defaults to all of the
+                tests for the bug.
+            workers: the maximum number of tests that may be executed at the
+                same time. Defaults to the number of CPUs on the host. Ignored
+                if the test harness does not permit parallel execution.
+            stop_on_failure: if `True`, no further tests will be executed
+                once the outcome of a failing test has been returned.
+            stop_on_unexpected: if `True`, no further tests will be executed
+                once the outcome of a test that differs from its expected
+                outcome has been returned.
+            fitness_threshold: if given, no further tests will be executed
+                once it is no longer possible for this many tests to pass.
+            batch_size: if given, tests are executed in batches of up to this
+                many tests, using a single command per batch (see
+                `execute_many`). Early termination policies are applied
+                once each batch has finished.
+
+        Returns:
+            an iterator over the tests and their outcomes, in the order in
+            which the tests finished. The tests are started in the order in
+            which they are given. Tests that have not yet been started are
+            cancelled if the iterator is closed before it is exhausted.
+
+        Raises:
+            Exception: if one or more tests could not be executed. The
+                exception is raised after all other tests have finished and
+                their outcomes have been returned.
+        """
+        bug = self.__installation.bugs[container.bug]
+        if tests is None:
+            tests = list(bug.harness)
+        if not bug.harness.parallel:
+            workers = 1
+        elif workers is None:
+            workers = os.cpu_count() or 1
+        if batch_size is None:
+            batch_size = 1
+        assert batch_size > 0
+        batches = [tests[i:i + batch_size]
+                   for i in range(0, len(tests), batch_size)]
+        workers = max(min(workers, len(batches)), 1)
+        logger.debug("running %d tests in container %s using %d workers",
+                     len(tests), container.uid, workers)
+
+        def run(batch: List[TestCase]) -> List[TestOutcome]:
+            if len(batch) == 1:
+                return [self.execute(container, batch[0])]
+            return self.execute_many(container, batch)
+
+        num_finished = 0
+        num_passed = 0
+
+        def should_stop(test: TestCase, outcome: TestOutcome) -> bool:
+            """
+            Determines whether any further tests should be executed after a
+            given test has finished.
+            """
+            if stop_on_failure and not outcome.passed:
+                reason = "test failed"
+            elif stop_on_unexpected \
+              and test.expected_outcome is not None \
+              and test.expected_outcome != outcome.passed:
+                reason = "unexpected test outcome"
+            elif fitness_threshold is not None \
+              and num_passed + len(tests) - num_finished < fitness_threshold:
+                reason = "fitness threshold can no longer be reached"
+            else:
+                return False
+            logger.debug("stopping test execution in container %s: %s (%s)",
+                         container.uid, reason, test.name)
+            return True
+
+        if workers == 1:
+            num_started = 0
+            try:
+                for batch in batches:
+                    num_started += len(batch)
+                    for (test, outcome) in zip(batch, run(batch)):
+                        num_finished += 1
+                        num_passed += 1 if outcome.passed else 0
+                        yield (test, outcome)
+                        if should_stop(test, outcome):
+                            return
+            finally:
+                self.__record_saved_tests(len(tests) - num_started)
+            return
+
+        error = None  # type: Optional[Exception]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(run, batch): batch
+                       for batch in batches}
+            try:
+                for future in as_completed(futures):
+                    batch = futures[future]
+                    try:
+                        outcomes = future.result()
+                    except Exception as err:
+                        logger.exception("failed to execute tests in container %s: %s",  # noqa: pycodestyle
+                                         container.uid,
+                                         ', '.join(t.name for t in batch))
+                        num_finished += len(batch)
+                        error = error or err
+                        continue
+                    for (test, outcome) in zip(batch, outcomes):
+                        num_finished += 1
+                        num_passed += 1 if outcome.passed else 0
+                        yield (test, outcome)
+                        if should_stop(test, outcome):
+                            return
+            finally:
+                # prevent any tests that haven't been started from running
+                num_cancelled = sum(len(futures[f]) for f in futures
+                                    if f.cancel())
+                self.__record_saved_tests(num_cancelled)
+
+        if error:
+            raise error
+        logger.debug("ran %d tests in container: %s",
+                     len(tests), container.uid)
+
+    def __record_saved_tests(self, num_saved: int) -> None:
+        with self.__stats_lock:
+            self.__num_tests_saved += num_saved
+
+    def test_stats(self) -> Dict[str, Any]:
+        """
+        Produces a JSON-ready summary of the number of tests that have been
+        executed by this manager, the number of test outcomes that were
+        obtained from the test outcome cache, the number of test executions
+        that were saved by terminating a test run early, and the number of
+        tests that were terminated by an adaptive time limit.
+        """
+        with self.__stats_lock:
+            return {'executed': self.__num_tests_executed,
+                    'cached': self.__num_tests_cached,
+                    'saved': self.__num_tests_saved,
+                    'adaptive-time-limits-fired': self.__num_time_limits_fired}  # noqa: pycodestyle
+
     # TODO decouple
     def compile(self,
                 container: Container,
@@ -431,12 +1452,18 @@ class ContainerManager(object):
                 ) -> None:
         """
         Copies a file from the host machine to a specified location inside a
-        container.
+        container. The file is streamed to the container as an in-memory tar
+        archive using the Docker archive API.
+
+        Parameters:
+            fn_host: the path to the file (or directory) on the host.
+            fn_container: the absolute path to which the file should be
+                copied inside the container.
 
         Raises:
-            FileNotFound: if the host file wasn't found.
-            subprocess.CalledProcessError: if the file could not be copied to
-                the container.
+            FileNotFound: if the host file wasn't found, or if the parent
+                directory of the destination does not exist inside the
+                container.
         """
         logger.debug("Copying file to container, %s: %s -> %s",
                      container.uid, fn_host, fn_container)
@@ -446,16 +1473,82 @@ class ContainerManager(object):
                          fn_host, fn_container, container.uid)
             raise FileNotFound(fn_host)
 
-        cmd = "docker cp '{}' '{}:{}'".format(fn_host, container.id, fn_container)
+        modifies_source = self.__touch(container, [fn_container])
+
+        def as_root(info: tarfile.TarInfo) -> tarfile.TarInfo:
+            info.uid = info.gid = 0
+            info.uname = info.gname = 'root'
+            return info
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar:
+            tar.add(fn_host,
+                    arcname=os.path.basename(fn_container),
+                    filter=as_root)
+        if modifies_source:
+            self.__update_fingerprint(container,
+                                      b'copy',
+                                      fn_container.encode('utf-8'),
+                                      archive.getvalue())
+        self.__put_archive(container, fn_container, archive.getvalue())
+        logger.debug("Copied file to container, %s: %s -> %s",
+                     container.uid, fn_host, fn_container)
+
+    def write_bytes(self,
+                    container: Container,
+                    fn_container: str,
+                    contents: bytes,
+                    mode: int = 0o644
+                    ) -> None:
+        """
+        Writes a given sequence of bytes to a specified file inside a
+        container, replacing the file if it already exists.
+
+        Parameters:
+            fn_container: the absolute path to the file inside the container.
+            contents: the contents of the file.
+            mode: the permissions that should be given to the file.
+
+        Raises:
+            FileNotFound: if the parent directory of the file does not exist
+                inside the container.
+        """
+        logger.debug("Writing %d bytes to file in container, %s: %s",
+                     len(contents), container.uid, fn_container)
+        if self.__touch(container, [fn_container]):
+            self.__update_fingerprint(container,
+                                      b'write',
+                                      fn_container.encode('utf-8'),
+                                      contents)
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar:
+            info = tarfile.TarInfo(name=os.path.basename(fn_container))
+            info.size = len(contents)
+            info.mode = mode
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(contents))
+        self.__put_archive(container, fn_container, archive.getvalue())
+        logger.debug("Wrote %d bytes to file in container, %s: %s",
+                     len(contents), container.uid, fn_container)
+
+    def __put_archive(self,
+                      container: Container,
+                      fn_container: str,
+                      archive: bytes
+                      ) -> None:
+        """
+        Extracts a given tar archive inside the parent directory of a given
+        path inside a container.
+        """
+        assert os.path.isabs(fn_container), "expected absolute file path"
+        dir_container = os.path.dirname(fn_container)
+        dockerc = self.__dockerc[container.uid]
         try:
-            subprocess.check_output(cmd, shell=True)
-            logger.debug("Copied file to container, %s: %s -> %s",
-                         container.uid, fn_host, fn_container)
-        # TODO implement error handling
-        except subprocess.CalledProcessError:
-            logger.exception("Failed to copy file to container, %s: %s -> %s",
-                             container.uid, fn_host, fn_container)
-            raise
+            dockerc.put_archive(dir_container, archive)
+        except docker.errors.NotFound:
+            logger.exception("Failed to copy file to container, %s: %s [directory not found]",  # noqa: pycodestyle
+                             container.uid, fn_container)
+            raise FileNotFound(dir_container)
 
     def copy_from(self,
                   container: Container,
@@ -463,21 +1556,193 @@ class ContainerManager(object):
                   fn_host: str
                   ) -> None:
         """
-        Copies a given file from the container to a specified location on the
-        host machine.
+        Copies a given file (or directory) from the container to a specified
+        location on the host machine. The file is streamed from the container
+        as an in-memory tar archive using the Docker archive API.
+
+        Raises:
+            FileNotFound: if the file wasn't found inside the container.
         """
         logger.debug("Copying file from container, %s: %s -> %s",
                      container.uid, fn_container, fn_host)
-        cmd = "docker cp '{}:{}' '{}'".format(container.id, fn_container, fn_host)
+        with self.__get_archive(container, fn_container) as tar:
+            members = tar.getmembers()
+            root = members[0]
+            if root.isfile():
+                with open(fn_host, 'wb') as fh:
+                    fh.write(tar.extractfile(root).read())  # type: ignore
+            else:
+                name_root = root.name
+                for member in members:
+                    member.name = os.path.relpath(member.name, name_root)
+                tar.extractall(path=fn_host, members=members)
+        logger.debug("Copied file from container, %s: %s -> %s",
+                     container.uid, fn_container, fn_host)
+
+    def read_bytes(self,
+                   container: Container,
+                   fn_container: str
+                   ) -> bytes:
+        """
+        Reads the contents of a given file inside a container.
+
+        Raises:
+            FileNotFound: if the file wasn't found inside the container.
+            IsADirectoryError: if the path refers to a directory.
+        """
+        logger.debug("Reading file from container, %s: %s",
+                     container.uid, fn_container)
+        with self.__get_archive(container, fn_container) as tar:
+            member = tar.next()
+            if member is None or not member.isfile():
+                raise IsADirectoryError(fn_container)
+            contents = tar.extractfile(member).read()  # type: ignore
+        logger.debug("Read %d bytes from file in container, %s: %s",
+                     len(contents), container.uid, fn_container)
+        return contents
+
+    @contextmanager
+    def open_file(self,
+                  container: Container,
+                  fn_container: str
+                  ) -> Iterator[IO[bytes]]:
+        """
+        Opens a given file inside a container for reading. The contents of
+        the file are streamed from the container as they are read, rather
+        than being loaded into memory at once, and may only be read
+        sequentially.
+
+        Raises:
+            FileNotFound: if the file wasn't found inside the container.
+            IsADirectoryError: if the path refers to a directory.
+        """
+        logger.debug("Opening file in container, %s: %s",
+                     container.uid, fn_container)
+        dockerc = self.__dockerc[container.uid]
         try:
-            subprocess.check_output(cmd, shell=True)
-            logger.debug("Copied file from container, %s: %s -> %s",
-                         container.uid, fn_container, fn_host)
-        # TODO implement error handling
-        except subprocess.CalledProcessError:
-            logger.exception("Failed to copy file from container, %s: %s -> %s",  # noqa: pycodestyle
-                             container.uid, fn_container, fn_host)
-            raise
+            (chunks, _) = dockerc.get_archive(fn_container)
+        except docker.errors.NotFound:
+            logger.error("Failed to open file in container, %s: %s [not found]",  # noqa: pycodestyle
+                         container.uid, fn_container)
+            raise FileNotFound(fn_container)
+        stream = io.BufferedReader(_ChunkStream(iter(chunks)))
+        with tarfile.open(fileobj=stream, mode='r|') as tar:
+            member = tar.next()
+            if member is None or not member.isfile():
+                raise IsADirectoryError(fn_container)
+            yield tar.extractfile(member)  # type: ignore
+
+    def read_bytes_many(self,
+                        container: Container,
+                        filepaths: List[str]
+                        ) -> Dict[str, bytes]:
+        """
+        Reads the contents of a number of files inside a container using a
+        single tar stream.
+
+        Parameters:
+            filepaths: the absolute paths to the files inside the container.
+
+        Returns:
+            a dictionary that maps each of the given paths to the contents of
+            its file.
+
+        Raises:
+            FileNotFound: if one or more of the files weren't found inside
+                the container.
+            IsADirectoryError: if one or more of the paths refers to a
+                directory.
+        """
+        for fn in filepaths:
+            assert os.path.isabs(fn), "expected absolute file paths"
+        if not filepaths:
+            return {}
+
+        logger.debug("Reading %d files from container, %s: %s",
+                     len(filepaths), container.uid, filepaths)
+        dockerc = self.__dockerc[container.uid]
+        members = [os.path.normpath(fn).lstrip('/') for fn in filepaths]
+        cmd = ['tar', '-cf', '-', '-C', '/', '--'] + members
+        (_, output) = dockerc.exec_run(cmd, stdout=True, stderr=False)
+
+        # tar still produces an archive for the files that it could find
+        contents = {}  # type: Dict[str, bytes]
+        if output:
+            with tarfile.open(fileobj=io.BytesIO(output), mode='r') as tar:
+                for info in tar:
+                    if info.isfile():
+                        contents['/' + info.name] = \
+                            tar.extractfile(info).read()  # type: ignore
+
+        files = {}  # type: Dict[str, bytes]
+        for (fn, member) in zip(filepaths, members):
+            if '/' + member in contents:
+                files[fn] = contents['/' + member]
+                continue
+            if any(m.startswith('/' + member + '/') for m in contents):
+                raise IsADirectoryError(fn)
+            logger.error("Failed to read file from container, %s: %s [not found]",  # noqa: pycodestyle
+                         container.uid, fn)
+            raise FileNotFound(fn)
+        logger.debug("Read %d files from container, %s",
+                     len(files), container.uid)
+        return files
+
+    def write_bytes_many(self,
+                         container: Container,
+                         files: Dict[str, bytes],
+                         mode: int = 0o644
+                         ) -> None:
+        """
+        Writes the contents of a number of files inside a container using a
+        single tar stream, replacing any existing files.
+
+        Parameters:
+            files: a dictionary that maps the absolute path of each file
+                inside the container to its contents.
+            mode: the permissions that should be given to the files.
+        """
+        for fn in files:
+            assert os.path.isabs(fn), "expected absolute file paths"
+        if not files:
+            return
+
+        logger.debug("Writing %d files to container, %s: %s",
+                     len(files), container.uid, list(files))
+        if self.__touch(container, list(files)):
+            parts = [b'write']
+            for fn in sorted(files):
+                parts += [fn.encode('utf-8'), files[fn]]
+            self.__update_fingerprint(container, *parts)
+        mtime = int(time.time())
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w') as tar:
+            for (fn, contents) in files.items():
+                info = tarfile.TarInfo(name=os.path.normpath(fn).lstrip('/'))
+                info.size = len(contents)
+                info.mode = mode
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(contents))
+        self.__dockerc[container.uid].put_archive('/', archive.getvalue())
+        logger.debug("Wrote %d files to container, %s",
+                     len(files), container.uid)
+
+    def __get_archive(self,
+                      container: Container,
+                      fn_container: str
+                      ) -> tarfile.TarFile:
+        """
+        Fetches a tar archive of a given path inside a container.
+        """
+        dockerc = self.__dockerc[container.uid]
+        try:
+            (stream, _) = dockerc.get_archive(fn_container)
+            archive = io.BytesIO(b''.join(stream))
+        except docker.errors.NotFound:
+            logger.error("Failed to copy file from container, %s: %s [not found]",  # noqa: pycodestyle
+                         container.uid, fn_container)
+            raise FileNotFound(fn_container)
+        return tarfile.open(fileobj=archive, mode='r')
 
     def command(self,
                 container: Container,
@@ -488,7 +1753,9 @@ class ContainerManager(object):
                 block: bool = True,
                 verbose: bool = False,
                 time_limit: Optional[int] = None,
-                kill_after: Optional[int] = 1
+                kill_after: Optional[int] = 1,
+                *,
+                modifies_source: bool = True
                 ) -> Union[ExecResponse, PendingExecResponse]:
         """
         Executes a provided shell command inside a given container.
@@ -498,6 +1765,11 @@ class ContainerManager(object):
                 number of seconds that the command should be allowed to run
                 without completing before it is aborted. Only supported by
                 blocking calls.
+            modifies_source: indicates whether the command may modify the
+                source code inside the container, in which case the
+                fingerprint of the container is invalidated (see
+                `fingerprint`). Should only be disabled for commands whose
+                effects on the source code are known.
 
         Returns:
             a description of the response.
@@ -516,6 +1788,25 @@ class ContainerManager(object):
             context = os.path.join(bug.source_dir, '..')
         logger_c.debug('using execution context: %s', context)
 
+        if modifies_source:
+            self.__invalidate_fingerprint(container)
+
+        if block and self.__use_sessions:
+            response = self.__command_in_session(container,
+                                                 cmd,
+                                                 context,
+                                                 stdout=stdout,
+                                                 stderr=stderr,
+                                                 time_limit=time_limit,
+                                                 kill_after=kill_after)
+            if response is not None:
+                if verbose:
+                    print(response.output, flush=True)
+                logger_c.debug('finished executing command in shell session: %s. (exited with code %d and took %.2f seconds.)\n%s',  # noqa: pycodestyle
+                               cmd_original, response.code,
+                               response.duration, response.output)
+                return response
+
         cmd = 'source /.environment && cd {} && {}'.format(context, cmd)
         cmd_wrapped = "/bin/bash -c '{}'".format(cmd)
         if time_limit is not None and time_limit > 0:
@@ -529,9 +1820,8 @@ class ContainerManager(object):
         # based on: https://github.com/roidelapluie/docker-py/commit/ead9ffa34193281967de8cc0d6e1c0dcbf50eda5
         logger_c.debug("executing raw command: %s", cmd)
         logger_c.debug('creating exec object for command: %s', cmd)
-        docker_client = self.__installation.docker
         try:
-            response = docker_client.api.exec_create(container.id,
+            response = self.__api_docker.exec_create(container.id,
                                                      cmd,
                                                      tty=True,
                                                      stdout=stdout,
@@ -564,6 +1854,65 @@ class ContainerManager(object):
 
     exec = command
 
+    def __command_in_session(self,
+                             container: Container,
+                             cmd: str,
+                             context: str,
+                             stdout: bool,
+                             stderr: bool,
+                             time_limit: Optional[int],
+                             kill_after: Optional[int]
+                             ) -> Optional[ExecResponse]:
+        """
+        Attempts to execute a given command using the shell session for a
+        given container, launching the session if necessary.
+
+        Returns:
+            the response to the command, or None if the command could not be
+            executed using the session (e.g., because the session is busy
+            executing another command), in which case the caller should
+            execute the command using a separate exec instance.
+        """
+        logger_c = logger.getChild(container.uid)
+        with self.__sessions_lock:
+            session = self.__sessions.get(container.uid)
+            if session is None or session.closed:
+                try:
+                    session = ShellSession(self.__api_docker, container.id)
+                except docker.errors.APIError:
+                    logger_c.exception("failed to launch shell session")
+                    return None
+                self.__sessions[container.uid] = session
+
+        # if the session is busy, we use a separate exec instance to allow
+        # commands to be executed concurrently.
+        if not session.lock.acquire(blocking=False):
+            logger_c.debug("shell session is busy: using exec instead")
+            return None
+        time_start = timer()
+        try:
+            return session.execute(cmd,
+                                   context,
+                                   stdout=stdout,
+                                   stderr=stderr,
+                                   time_limit=time_limit,
+                                   kill_after=kill_after)
+        except ShellSessionClosed:
+            logger_c.warning("shell session was closed unexpectedly: using exec instead")  # noqa: pycodestyle
+            return None
+        # the session is closed when a command exceeds its time limit; we
+        # discard it, so that the next command launches a fresh session, and
+        # report the command as killed, as `timeout` would have done.
+        except TimeoutError:
+            logger_c.warning("command exceeded its time limit in shell session: discarding session")  # noqa: pycodestyle
+            session.close()
+            with self.__sessions_lock:
+                if self.__sessions.get(container.uid) is session:
+                    del self.__sessions[container.uid]
+            return ExecResponse(137, timer() - time_start, '')
+        finally:
+            session.lock.release()
+
     def persist(self, container: Container, image: str) -> None:
         """
         Persists the state of a given container to a BugZoo image on this
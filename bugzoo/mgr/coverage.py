@@ -1,7 +1,12 @@
 from timeit import default_timer as timer
-from typing import List, Dict, Optional, Set
-import tempfile
+from typing import List, Dict, Optional, Set, Callable, Tuple, Iterator, \
+                   Iterable, IO
+import gzip
+import io
+import itertools
+import json
 import os
+import threading
 import warnings
 import logging
 import xml.etree.ElementTree as ET
@@ -18,6 +23,214 @@ logger = logging.getLogger(__name__)
 __all__ = ['CoverageManager']
 
 
+def parse_gcovr_report(source: IO[bytes]) -> Iterator[Tuple[str, Set[int]]]:
+    """
+    Incrementally parses an XML gcovr report. Only the elements for the file
+    that is currently being parsed are kept in memory: each file is
+    discarded as soon as its covered line numbers have been collected.
+
+    Parameters:
+        source: a binary file-like object that provides the report.
+
+    Returns:
+        an iterator over the name of each file in the report that has at
+        least one covered line, together with its covered line numbers.
+    """
+    classes = None  # type: Optional[ET.Element]
+    filename = None  # type: Optional[str]
+    lines = set()  # type: Set[int]
+    depth_methods = 0
+    for (event, elem) in ET.iterparse(source, events=('start', 'end')):
+        tag = elem.tag
+        if event == 'start':
+            if tag == 'class':
+                filename = elem.attrib['filename']
+                lines = set()
+            elif tag == 'methods':
+                depth_methods += 1
+            elif tag == 'classes':
+                classes = elem
+
+        # only the lines that belong directly to a class are considered,
+        # rather than those that belong to its methods
+        elif tag == 'line':
+            if not depth_methods and int(elem.attrib['hits']) > 0:
+                lines.add(int(elem.attrib['number']))
+        elif tag == 'methods':
+            depth_methods -= 1
+        elif tag == 'class':
+            if lines:
+                yield (filename, lines)  # type: ignore
+            # detach the class from the tree, allowing it to be freed
+            elem.clear()
+            if classes is not None:
+                classes.remove(elem)
+
+
+def parse_gcov_json_report(source: IO[bytes]
+                           ) -> Iterator[Tuple[str, Set[int]]]:
+    """
+    Incrementally parses a gzip-compressed stream of JSON documents produced
+    by `gcov --json-format`, separated by newlines. Each document is
+    discarded as soon as its covered line numbers have been collected.
+
+    Parameters:
+        source: a binary file-like object that provides the report.
+
+    Returns:
+        an iterator over the name of each file in the report that has at
+        least one covered line, together with its covered line numbers.
+        Relative file names are resolved against the working directory
+        that was used to compile the file.
+    """
+    with gzip.GzipFile(fileobj=source, mode='rb') as f:
+        yield from _parse_gcov_json_lines(io.TextIOWrapper(f, encoding='utf-8'))  # noqa: pycodestyle
+
+
+def _parse_gcov_json_lines(lines: Iterable[str]
+                           ) -> Iterator[Tuple[str, Set[int]]]:
+    """
+    Parses the decompressed lines of a stream of gcov JSON documents.
+
+    See: `parse_gcov_json_report`
+    """
+    decoder = json.JSONDecoder()
+    buff = ''
+    for line in lines:
+        buff += line
+        if not buff.strip():
+            buff = ''
+            continue
+        # documents that span several lines are accumulated until they
+        # can be decoded in their entirety
+        try:
+            (doc, _) = decoder.raw_decode(buff.strip())
+        except ValueError:
+            continue
+        buff = ''
+
+        dir_cwd = doc.get('current_working_directory', '')
+        for entry in doc.get('files', []):
+            covered = set(l['line_number'] for l in entry.get('lines', [])
+                          if l['count'] > 0)
+            if covered:
+                fn = os.path.join(dir_cwd, entry['file'])
+                yield (os.path.normpath(fn), covered)
+
+
+def parse_gcov_intermediate_report(source: IO[bytes]
+                                   ) -> Iterator[Tuple[str, Set[int]]]:
+    """
+    Incrementally parses a report written in the intermediate text format
+    produced by `gcov --intermediate-format`, which may describe the same
+    file several times.
+
+    From GCC 9 onwards, `--intermediate-format` is an alias for
+    `--json-format`. Reports that consist of (decompressed) JSON documents,
+    rather than intermediate text, are parsed as such.
+
+    Parameters:
+        source: a binary file-like object that provides the report.
+
+    Returns:
+        an iterator over the name of each file in the report that has at
+        least one covered line, together with its covered line numbers.
+    """
+    text = io.TextIOWrapper(source, encoding='utf-8')
+    first = ''
+    for first in text:
+        if first.strip():
+            break
+    if first.lstrip().startswith('{'):
+        yield from _parse_gcov_json_lines(itertools.chain([first], text))
+        return
+
+    filename = None  # type: Optional[str]
+    lines = set()  # type: Set[int]
+    for line in itertools.chain([first], text):
+        (kind, _, value) = line.rstrip('\n').partition(':')
+        if kind == 'file':
+            if filename is not None and lines:
+                yield (filename, lines)
+            filename = value
+            lines = set()
+        elif kind == 'lcount':
+            (num, count) = value.split(',')[:2]
+            if int(count) > 0:
+                lines.add(int(num))
+    if filename is not None and lines:
+        yield (filename, lines)
+
+
+class SourceFileIndex(object):
+    """
+    An index of the C/C++ source files inside the source directory of a
+    container, used to resolve the file names reported by gcovr.
+    """
+    ENDINGS = ['.cpp', '.cc', '.c', '.h', '.hh', '.hpp', '.cxx']
+
+    @staticmethod
+    def build(mgr_ctr: 'ContainerManager',
+              container: Container,
+              dir_source: str
+              ) -> 'SourceFileIndex':
+        """
+        Constructs an index of the source files inside a given container.
+        """
+        cmd = ' -o '.join(["-name \\*{}".format(e)
+                           for e in SourceFileIndex.ENDINGS])
+        cmd = "find {} -type f \\( {} \\)".format(dir_source, cmd)
+        resp = mgr_ctr.command(container, cmd, modifies_source=False)
+        files = set(fn.strip() for fn in resp.output.split('\n'))
+        return SourceFileIndex(dir_source, files)
+
+    def __init__(self, dir_source: str, files: Set[str]) -> None:
+        """
+        Parameters:
+            dir_source: the absolute path to the source directory.
+            files: the absolute paths to the source files.
+        """
+        self.__dir_source = dir_source
+        self.__files = frozenset(files)
+        self.__resolved = {}  # type: Dict[str, Optional[str]]
+
+    def __len__(self) -> int:
+        return len(self.__files)
+
+    def __contains__(self, fn_rel: str) -> bool:
+        if os.path.isabs(fn_rel):
+            return False
+        return os.path.join(self.__dir_source, fn_rel) in self.__files
+
+    def resolve(self, fn: str) -> Optional[str]:
+        """
+        Resolves a file name reported by a coverage backend to the path of a
+        source file, relative to the source directory. Absolute file names
+        within the source directory are made relative to it. Otherwise,
+        leading directories are discarded from the file name until it
+        matches a source file. Resolutions are memoized.
+
+        Returns:
+            the path to the source file, or None if the file name could not
+            be resolved.
+        """
+        try:
+            return self.__resolved[fn]
+        except KeyError:
+            pass
+        suffix = fn  # type: Optional[str]
+        dir_source = os.path.normpath(self.__dir_source)
+        if os.path.isabs(fn):
+            fn_norm = os.path.normpath(fn)
+            if fn_norm.startswith(dir_source + os.sep):
+                suffix = os.path.relpath(fn_norm, dir_source)
+        while suffix and suffix not in self:
+            suffix = suffix.partition('/')[2]
+        resolved = suffix or None
+        self.__resolved[fn] = resolved
+        return resolved
+
+
 class CoverageManager(object):
     INSTRUMENTATION = (
         "// BUGZOO :: INSTRUMENTATION :: START\n"
@@ -45,6 +258,22 @@ class CoverageManager(object):
         "// BUGZOO :: INSTRUMENTATION :: END\n"
     )
 
+    # resets the coverage counters for the program by destroying its .gcda
+    # files, which are recreated, zeroed, when the program is next executed
+    RESET_COMMAND = 'find . -name "*.gcda" -delete'
+
+    # runs gcov directly on the .gcda files within the source directory,
+    # writes its reports to a scratch directory, and concatenates them to
+    # stdout.
+    # N.B. commands are executed within single quotes, and so must not
+    # contain any.
+    GCOV_COMMAND = (
+        'src="$PWD"; d=$(mktemp -d) && cd "$d" && '
+        'find "$src" -name "*.gcda" -exec gcov {flags} --preserve-paths {{}} + > /dev/null 2>&1; '  # noqa: pycodestyle
+        'for f in "$d"/{output}; do [ -f "$f" ] && {cat} "$f" && echo; done; '
+        'cd "$src" && rm -rf "$d"'
+    )
+
     def _from_gcovr_xml_string(self,
                                s: str,
                                instrumented_files: Set[str],
@@ -62,63 +291,69 @@ class CoverageManager(object):
             the set of file-lines that are stated as covered by the given
             report.
         """
-        logger_c = logger.getChild(container.id)
-        mgr_ctr = self.__installation.containers
-        mgr_bug = self.__installation.bugs
-        bug = mgr_bug[container.bug]
+        return self._from_gcovr_xml_stream(io.BytesIO(s.encode('utf-8')),
+                                           instrumented_files,
+                                           container)
 
-        # compute a list of all source files
-        dir_source = bug.source_dir
-        endings = ['.cpp', '.cc', '.c', '.h', '.hh', '.hpp', '.cxx']
-        cmd = ' -o '.join(["-name \*{}".format(e) for e in endings])
-        cmd = "find {} -type f \( {} \)".format(dir_source, cmd)
-        resp = mgr_ctr.command(container, cmd)
-        # logger.info("FIND COMMAND: %s", cmd)
-        all_files = set(fn.strip() for fn in resp.output.split('\n'))
-        # logger.info("KNOWN SOURCE FILES: %s", all_files)
-
-        def has_file(fn_rel: str) -> bool:
-            fn_abs = os.path.join(dir_source, fn_rel)
-            return (fn_abs in all_files)
-
-        def read_line_coverage(cls) -> List[int]:
-            lines = cls.find('lines').findall('line')
-            return set(int(l.attrib['number']) for l in lines
-                    if int(l.attrib['hits']) > 0)
-
-        # FIXME is this a general solution?
-        def resolve_path(fn_rel: str) -> str:
-            assert fn_rel != '', "failed to resolve path"
-            if has_file(fn_rel):
-                return fn_rel
-
-            fn_rel_child = '/'.join(fn_rel.split('/')[1:])
-            return resolve_path(fn_rel_child)
+    def _from_gcovr_xml_stream(self,
+                               source: IO[bytes],
+                               instrumented_files: Set[str],
+                               container: Container
+                               ) -> FileLineSet:
+        """
+        Determines the set of files that are covered in a gcovr report that
+        is read incrementally from a given binary file-like object.
+
+        See: `_from_gcovr_xml_string`
+        """
+        return self._from_report(parse_gcovr_report(source),
+                                 instrumented_files,
+                                 container)
+
+    def _from_report(self,
+                     report: Iterator[Tuple[str, Set[int]]],
+                     instrumented_files: Set[str],
+                     container: Container
+                     ) -> FileLineSet:
+        """
+        Determines the set of file-lines that are covered according to a
+        parsed coverage report, produced by any of the supported coverage
+        backends.
+
+        Parameters:
+            report: an iterator over the names of the files in the report,
+                together with their covered line numbers.
+            instrumented_files: the paths (relative to the source code
+                directory) to all files that were instrumented.
+            container: the container that produced the report.
+
+        Returns:
+            the set of file-lines that are stated as covered by the given
+            report.
+        """
+        logger_c = logger.getChild(container.id)
+        index = self.source_index(container)
 
         assert isinstance(instrumented_files, set)
         for path in instrumented_files:
             assert not os.path.isabs(path), "expected relative file paths"
 
-        # read the output of gcovr
-        root = ET.fromstring(s)
-        packages = root.find('packages').findall('package')
-        classes = [c for p in packages for c in p.find('classes').findall('class')]
-        report = [(cls.attrib['filename'], read_line_coverage(cls))
-                  for cls in classes]
-        report = [(fn, lines) for (fn, lines) in report if lines]
-        # logger.info("GCOVR: %s", report)
-
         t_start = timer()
-        logger_c.debug("Starting to traverse all files reported by gcovr.")
-        files_to_lines = {}
+        logger_c.debug("Starting to traverse all files in coverage report.")
+        files_to_lines = {}  # type: Dict[str, Set[int]]
         for (filename, lines) in report:
-            try:
-                filename = resolve_path(filename)
-            except AssertionError:
+            resolved = index.resolve(filename)
+            if resolved is None:
                 logger_c.warning("failed to resolve file: %s", filename)
                 continue
-            if lines:
-                files_to_lines[filename] = lines
+            if not lines:
+                continue
+            # gcov may describe the same source file (e.g., a header) once
+            # for each object file that includes it
+            if resolved in files_to_lines:
+                files_to_lines[resolved] |= lines
+            else:
+                files_to_lines[resolved] = lines
 
         logger_c.debug("Traversing all files finished. Seconds passed: %.2f", timer() - t_start)
         # modify coverage information for all of the instrumented files
@@ -142,17 +377,56 @@ class CoverageManager(object):
 
     def __init__(self, installation: 'BugZoo') -> None:
         self.__installation = installation # type: BugZoo
+        self.__indices_lock = threading.Lock()
+        self.__indices = {}  # type: Dict[str, Tuple[str, SourceFileIndex]]
+
+    def source_index(self, container: Container) -> SourceFileIndex:
+        """
+        Returns an index of the source files inside a given container. The
+        index is built once and reused until the source code inside the
+        container is modified via BugZoo (i.e., until its fingerprint
+        changes), avoiding a search of the source directory every time that
+        coverage is extracted.
+        """
+        mgr_ctr = self.__installation.containers
+        fingerprint = mgr_ctr.fingerprint(container)
+        with self.__indices_lock:
+            entry = self.__indices.get(container.uid)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+
+        bug = self.__installation.bugs[container.bug]
+        logger.debug("building source file index for container: %s",
+                     container.uid)
+        index = SourceFileIndex.build(mgr_ctr, container, bug.source_dir)
+        logger.debug("built source file index for container %s: %d files",
+                     container.uid, len(index))
+        with self.__indices_lock:
+            # forget the indices of containers that no longer exist
+            uids = set(c.uid for c in mgr_ctr)
+            for uid in list(self.__indices):
+                if uid not in uids:
+                    del self.__indices[uid]
+            self.__indices[container.uid] = (fingerprint, index)
+        return index
 
     def coverage(self,
                  container: Container,
                  tests: Optional[List[TestCase]] = None,
                  files_to_instrument: List[str] = None,
                  *,
-                 instrument: bool = True
+                 instrument: bool = True,
+                 progress: Optional[Callable[[int, int], None]] = None
                  ) -> TestSuiteCoverage:
         """
         Uses a provided container to compute line coverage information for a
         given list of tests.
+
+        Parameters:
+            progress: an optional callback that is called with the number of
+                tests whose coverage has been computed and the total number
+                of tests, before the first test and after each test. Any
+                exception raised by the callback aborts the computation.
         """
         logger.debug("computing coverage for container: %s", container.uid)
         if tests is None:
@@ -172,17 +446,30 @@ class CoverageManager(object):
         except Exception:
             raise FailedToComputeCoverage("failed to instrument container.")
 
+        # the counters are reset once before the first test; thereafter, each
+        # extraction resets them as part of the same command, so that every
+        # test is executed against fresh counters without an extra exec
         cov = {}
+        if progress:
+            progress(0, len(_tests))
+        self.reset_counters(container)
         for test in _tests:
             logger.debug("Generating coverage for test %s in container %s",
                          test.name, container.uid)
-            outcome = self.__installation.containers.execute(container, test)
+            # the test must be executed to write its coverage counters, even
+            # if its outcome is cached
+            outcome = self.__installation.containers.execute(container,
+                                                             test,
+                                                             use_cache=False)
             filelines = self.extract(container,
-                                     instrumented_files=files_to_instrument)
+                                     instrumented_files=files_to_instrument,
+                                     reset=True)
             test_coverage = TestCoverage(test.name, outcome, filelines)
             logger.debug("Generated coverage for test %s in container %s",
                          test.name, container.uid)
             cov[test.name] = test_coverage
+            if progress:
+                progress(len(cov), len(_tests))
 
         # FIXME deinstrument
         # self.deinstrument(container,
@@ -226,22 +513,13 @@ class CoverageManager(object):
         #                 'sudo apt-get update && sudo apt-get install -y gcovr')
 
         # add instrumentation to each file
-        dir_source = bug.source_dir
-        for fn_src in files_to_instrument:
-            fn_src = os.path.join(dir_source, fn_src)
-            logger.debug("instrumenting file [%s] in container [%s]",
-                                fn_src, container.uid)
-            (_, fn_temp) = tempfile.mkstemp(suffix='.bugzoo')
-            try:
-                mgr_ctr.copy_from(container, fn_src, fn_temp)
-                with open(fn_temp, 'r') as fh:
-                    contents = CoverageManager.INSTRUMENTATION + fh.read()
-
-                with open(fn_temp, 'w') as fh:
-                    fh.write(contents)
-                mgr_ctr.copy_to(container, fn_temp, fn_src)
-            finally:
-                os.remove(fn_temp)
+        logger.debug("instrumenting files %s in container [%s]",
+                     files_to_instrument, container.uid)
+        mgr_file = self.__installation.files
+        contents = mgr_file.read_many(container, files_to_instrument)
+        contents = {fn: CoverageManager.INSTRUMENTATION + c
+                    for (fn, c) in contents.items()}
+        mgr_file.write_many(container, contents)
 
         # recompile with instrumentation options
         outcome = mgr_ctr.compile_with_instrumentation(container)
@@ -280,14 +558,45 @@ class CoverageManager(object):
         # TODO recompile with standard flags
         pass
 
+    def reset_counters(self, container: Container) -> None:
+        """
+        Resets the coverage counters for the program inside a given container
+        by destroying its '.gcda' files, without producing a coverage report.
+
+        Raises:
+            FailedToComputeCoverage: if the counters could not be reset.
+        """
+        logger.debug("resetting coverage counters for container: %s",
+                     container.uid)
+        mgr_ctr = self.__installation.containers
+        bug = self.__installation.bugs[container.bug]
+        response = mgr_ctr.command(container,
+                                   CoverageManager.RESET_COMMAND,
+                                   context=bug.source_dir,
+                                   modifies_source=False)
+        if response.code != 0:
+            msg = "failed to reset coverage counters: {}"
+            raise FailedToComputeCoverage(msg.format(response.output))
+        logger.debug("reset coverage counters for container: %s",
+                     container.uid)
+
     def extract(self,
                 container: Container,
-                instrumented_files: Optional[List[str]] = None
+                instrumented_files: Optional[List[str]] = None,
+                *,
+                reset: bool = True
                 ) -> FileLineSet:
         """
-        Uses gcovr to extract coverage information for all of the C/C++ source
-        code files within the project. Destroys '.gcda' files upon computing
-        coverage.
+        Uses the coverage backend of the bug (e.g., gcovr) to extract coverage
+        information for all of the C/C++ source code files within the
+        project.
+
+        Parameters:
+            container: the container from which coverage should be extracted.
+            instrumented_files: the paths (relative to the source code
+                directory) to all files that were instrumented.
+            reset: if True, the coverage counters are reset (i.e., '.gcda'
+                files are destroyed) once coverage has been extracted.
         """
         logger_c = logger.getChild(container.id)  # type: logging.Logger
         mgr_ctr = self.__installation.containers
@@ -302,31 +611,46 @@ class CoverageManager(object):
             instrumented_files = set(instrumented_files)
 
         dir_source = bug.source_dir
+        backend = bug.coverage_backend
+        if backend == 'gcov-json':
+            cmd = CoverageManager.GCOV_COMMAND.format(
+                flags='--json-format', output='*.gcov.json.gz', cat='zcat')
+            cmd = '{{ {}; }} | gzip -c'.format(cmd)
+            parse = parse_gcov_json_report
+        elif backend == 'gcov':
+            # GCC 9 onwards writes JSON reports instead, which are
+            # decompressed and detected by the parser
+            cmd = CoverageManager.GCOV_COMMAND.format(
+                flags='--intermediate-format',
+                output='*.gcov "$d"/*.gcov.json.gz',
+                cat='gzip -dcf')
+            cmd = '{{ {}; }}'.format(cmd)
+            parse = parse_gcov_intermediate_report
+        else:
+            cmd = 'gcovr -x -r .'
+            parse = parse_gcovr_report
+
         t_start = timer()
-        logger_c.debug("Running gcovr.")
+        logger_c.debug("Running %s.", backend)
         fn_temp_ctr = mgr_ctr.mktemp(container)
-        cmd = 'gcovr -o "{}" -x -d -r .'.format(fn_temp_ctr)
+        cmd = '{} > "{}"'.format(cmd, fn_temp_ctr)
+        if reset:
+            cmd = '{} && {}'.format(cmd, CoverageManager.RESET_COMMAND)
         response = mgr_ctr.command(container,
                                    cmd,
                                    context=dir_source,
-                                   verbose=True)
-        logger_c.debug("Finished running gcovr (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
-        assert response.code == 0, "failed to run gcovr"
-
-        # copy the contents of the temporary file to the host machine
-        (_, fn_temp_host) = tempfile.mkstemp(suffix='.bugzoo')
-        try:
-            mgr_ctr.copy_from(container, fn_temp_ctr, fn_temp_host)
-            with open(fn_temp_host, 'r') as fh:
-                report = fh.read()
-        finally:
-            os.remove(fn_temp_host)
+                                   verbose=True,
+                                   modifies_source=False)
+        logger_c.debug("Finished running %s (took %.2f seconds).", backend, timer() - t_start)  # noqa: pycodestyle
+        assert response.code == 0, "failed to run {}".format(backend)
 
+        # stream the contents of the temporary file to the host machine
         t_start = timer()
-        logger_c.debug("Parsing gcovr XML report.")
-        res = self._from_gcovr_xml_string(report,
-                                          instrumented_files,
-                                          container)
-        logger_c.debug("Finished parsing gcovr XML report (took %.2f seconds).", timer() - t_start)  # noqa: pycodestyle
+        logger_c.debug("Parsing %s report.", backend)
+        with mgr_ctr.open_file(container, fn_temp_ctr) as report:
+            res = self._from_report(parse(report),
+                                    instrumented_files,
+                                    container)
+        logger_c.debug("Finished parsing %s report (took %.2f seconds).", backend, timer() - t_start)  # noqa: pycodestyle
         logger_c.debug("Finished extracting coverage information")
         return res
@@ -0,0 +1,300 @@
+from typing import Dict, Any, List, Optional, TYPE_CHECKING
+import hashlib
+import json
+import os
+import threading
+import logging
+
+import docker
+
+from ..core.bug import Bug
+from ..core.coverage import TestSuiteCoverage
+
+if TYPE_CHECKING:
+    from ..manager import BugZoo
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['CoverageCache']
+
+
+class CoverageCache(object):
+    """
+    Stores the test suite coverage for bugs on disk, in the binary coverage
+    format (see `bugzoo.core.coverage_file`).
+
+    Each entry is keyed by the name of its bug, the ID of the Docker image
+    for the bug, and hashes of its test harness, the files that are
+    instrumented to compute coverage, and its coverage backend. Entries
+    whose keys no longer match their bug (e.g., because its image was
+    rebuilt, or its tests were changed) are never served, and may be
+    removed via `prune`. Entries are stored as files named
+    `<bug>.<key>.coverage.bin` within the coverage directory of the
+    installation, whose modification times record when they were last used.
+
+    Coverage cached by earlier versions of BugZoo, under
+    `<bug>.coverage.yml` or `<bug>.coverage.bin`, is not keyed. When its
+    bug is next used, it is migrated to a keyed entry if it covers exactly
+    the tests in the harness of the bug, so that upgrading BugZoo does not
+    force coverage to be recomputed; otherwise, it is discarded. Until
+    then, it is considered stale, and may be removed via `prune`.
+    """
+    SUFFIX = '.coverage.bin'
+    LEGACY_SUFFIXES = ('.coverage.yml', '.coverage.bin')
+
+    def __init__(self,
+                 installation: 'BugZoo',
+                 max_size: Optional[int] = None
+                 ) -> None:
+        """
+        Parameters:
+            installation: the BugZoo installation.
+            max_size: the maximum number of bytes that may be occupied by
+                the cache. If exceeded, the least recently used entries are
+                evicted. If unspecified, the size of the cache is unbounded.
+        """
+        assert max_size is None or max_size >= 0
+        self.__installation = installation
+        self.__max_size = max_size
+        self.__lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        """
+        The absolute path to the directory that holds the cache.
+        """
+        return self.__installation.coverage_path
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """
+        The maximum number of bytes that may be occupied by this cache, if
+        bounded.
+        """
+        return self.__max_size
+
+    def configure(self, max_size: Optional[int] = None) -> None:
+        """
+        Sets the maximum number of bytes that may be occupied by this cache,
+        and evicts entries to satisfy it.
+        """
+        assert max_size is None or max_size >= 0
+        self.__max_size = max_size
+        if max_size is not None:
+            self.evict(max_size)
+
+    def key(self, bug: Bug) -> str:
+        """
+        Computes the key for the coverage of a given bug.
+
+        Raises:
+            docker.errors.ImageNotFound: if the image for the bug is not
+                installed.
+        """
+        image_id = self.__installation.docker.images.get(bug.image).id
+        h = hashlib.sha256()
+        h.update(bug.name.encode('utf-8') + b'\0')
+        h.update(image_id.encode('utf-8') + b'\0')
+        harness = json.dumps(bug.harness.to_dict(), sort_keys=True)
+        h.update(harness.encode('utf-8') + b'\0')
+        instrumented = json.dumps(sorted(bug.files_to_instrument))
+        h.update(instrumented.encode('utf-8') + b'\0')
+        h.update(bug.coverage_backend.encode('utf-8'))
+        return h.hexdigest()
+
+    def __filename(self, bug: Bug, key: str) -> str:
+        return os.path.join(self.path,
+                            "{}.{}{}".format(bug.name, key, self.SUFFIX))
+
+    def __contains__(self, bug: Bug) -> bool:
+        """
+        Determines whether this cache holds up-to-date coverage for a given
+        bug.
+        """
+        try:
+            fn = self.__filename(bug, self.key(bug))
+        except docker.errors.ImageNotFound:
+            return False
+        return os.path.exists(fn)
+
+    def get(self, bug: Bug) -> Optional[TestSuiteCoverage]:
+        """
+        Retrieves up-to-date coverage for a given bug from this cache.
+
+        Returns:
+            the cached coverage, or None if this cache does not hold
+            up-to-date coverage for the bug.
+        """
+        try:
+            key = self.key(bug)
+        except docker.errors.ImageNotFound:
+            return None
+        fn = self.__filename(bug, key)
+        if os.path.exists(fn):
+            try:
+                coverage = TestSuiteCoverage.from_file(fn)
+            except ValueError:
+                logger.warning("discarding unreadable coverage cache: %s", fn)
+                self.__remove(fn)
+                return None
+            os.utime(fn)
+            return coverage
+        return self.__migrate_legacy(bug)
+
+    def __migrate_legacy(self, bug: Bug) -> Optional[TestSuiteCoverage]:
+        """
+        Migrates any coverage for a given bug that was cached by an earlier
+        version of BugZoo to a keyed entry, provided that it covers exactly
+        the tests for the bug. Legacy coverage that cannot be read, or that
+        covers a different set of tests, is discarded.
+
+        Returns:
+            the migrated coverage, or None if there was no legacy coverage
+            for the bug that could be migrated.
+        """
+        tests = set(test.name for test in bug.tests)
+        migrated = None  # type: Optional[TestSuiteCoverage]
+        for suffix in self.LEGACY_SUFFIXES:
+            fn = os.path.join(self.path, "{}{}".format(bug.name, suffix))
+            if not os.path.exists(fn):
+                continue
+            if migrated is None:
+                try:
+                    coverage = TestSuiteCoverage.from_file(fn)
+                except Exception:
+                    logger.warning("discarding unreadable coverage cache: %s",
+                                   fn)
+                else:
+                    if set(coverage) == tests:
+                        logger.info("migrating unkeyed coverage cache: %s",
+                                    fn)
+                        self.put(bug, coverage)
+                        migrated = coverage
+            logger.info("removing unkeyed coverage cache: %s", fn)
+            self.__remove(fn)
+        return migrated
+
+    def put(self, bug: Bug, coverage: TestSuiteCoverage) -> None:
+        """
+        Stores the coverage for a given bug in this cache, replacing any
+        coverage that was previously stored for the bug.
+        """
+        key = self.key(bug)
+        fn = self.__filename(bug, key)
+        fn_tmp = "{}.{}.tmp".format(fn, os.getpid())
+        try:
+            coverage.to_file(fn_tmp)
+            os.replace(fn_tmp, fn)
+        finally:
+            if os.path.exists(fn_tmp):
+                os.remove(fn_tmp)
+
+        # remove any other entries for this bug, since they are stale
+        for entry in self.entries():
+            if entry['bug'] == bug.name and entry['key'] != key:
+                self.__remove(entry['path'])
+
+        if self.__max_size is not None:
+            self.evict(self.__max_size)
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        Produces a JSON-ready description of each entry in this cache,
+        ordered from least to most recently used. Entries that were cached
+        by earlier versions of BugZoo have no key, and are always stale.
+        """
+        entries = []  # type: List[Dict[str, Any]]
+        for fn in os.listdir(self.path):
+            path = os.path.join(self.path, fn)
+            key = None  # type: Optional[str]
+            if fn.endswith(self.SUFFIX):
+                (name, _, key) = fn[:-len(self.SUFFIX)].rpartition('.')
+                if not name or len(key) != 64:
+                    (name, key) = (fn[:-len(self.SUFFIX)], None)
+            elif fn.endswith(self.LEGACY_SUFFIXES[0]):
+                name = fn[:-len(self.LEGACY_SUFFIXES[0])]
+            else:
+                continue
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append({'bug': name,
+                            'key': key,
+                            'path': path,
+                            'size': stat.st_size,
+                            'accessed': stat.st_mtime})
+        entries.sort(key=lambda e: e['accessed'])
+        return entries
+
+    def is_stale(self, entry: Dict[str, Any]) -> bool:
+        """
+        Determines whether a given entry no longer describes the current
+        version of its bug, either because its bug is no longer registered,
+        the image for its bug is not installed, any of the components of
+        its key have changed, or it has no key.
+        """
+        if entry['key'] is None:
+            return True
+        try:
+            bug = self.__installation.bugs[entry['bug']]
+            return entry['key'] != self.key(bug)
+        except (KeyError, docker.errors.ImageNotFound):
+            return True
+
+    def prune(self) -> List[Dict[str, Any]]:
+        """
+        Removes all stale entries from this cache, including those that
+        were cached by earlier versions of BugZoo.
+
+        Returns:
+            a description of each removed entry.
+        """
+        with self.__lock:
+            removed = []  # type: List[Dict[str, Any]]
+            for entry in self.entries():
+                if self.is_stale(entry):
+                    logger.info("pruning stale coverage cache: %s",
+                                entry['path'])
+                    self.__remove(entry['path'])
+                    removed.append(entry)
+            return removed
+
+    def evict(self, max_size: int) -> List[Dict[str, Any]]:
+        """
+        Removes the least recently used entries from this cache until it
+        occupies no more than a given number of bytes.
+
+        Returns:
+            a description of each removed entry.
+        """
+        with self.__lock:
+            entries = self.entries()
+            size = sum(e['size'] for e in entries)
+            removed = []  # type: List[Dict[str, Any]]
+            for entry in entries:
+                if size <= max_size:
+                    break
+                logger.info("evicting coverage cache: %s", entry['path'])
+                self.__remove(entry['path'])
+                size -= entry['size']
+                removed.append(entry)
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Produces a JSON-ready summary of the contents of this cache.
+        """
+        entries = self.entries()
+        for entry in entries:
+            entry['stale'] = self.is_stale(entry)
+        return {'path': self.path,
+                'size': sum(e['size'] for e in entries),
+                'max-size': self.__max_size,
+                'entries': entries}
+
+    def __remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
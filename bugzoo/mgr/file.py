@@ -1,6 +1,6 @@
+from typing import Dict, List
 import os
 import logging
-import tempfile
 
 from .bug import BugManager
 from .container import ContainerManager
@@ -15,29 +15,54 @@ class FileManager(object):
         self.__mgr_bug = mgr_bug
         self.__mgr_ctr = mgr_ctr
 
+    def __resolve(self, container: Container, filepath: str) -> str:
+        """
+        Computes the absolute path of a given file inside a container.
+        Relative paths are interpreted as being relative to the source
+        directory for the program under test.
+        """
+        if os.path.isabs(filepath):
+            return filepath
+        bug = self.__mgr_bug[container.bug]
+        return os.path.join(bug.source_dir, filepath)
+
     def read(self,
              container: Container,
              filepath: str
              ) -> str:
-        bug = self.__mgr_bug[container.bug]
+        filepath = self.__resolve(container, filepath)
 
-        if not os.path.isabs(filepath):
-            filepath = os.path.join(bug.source_dir, filepath)
-
-        # TODO what if the file doesn't exist?
         # TODO what if we encounter a permissions problem?
         # TODO what if we can't decode the file?
+        contents = self.__mgr_ctr.read_bytes(container, filepath)
+        return contents.decode('utf-8')
+
+    def read_many(self,
+                  container: Container,
+                  filepaths: List[str]
+                  ) -> Dict[str, str]:
+        """
+        Reads the contents of a number of files inside a given container
+        using a single transfer.
 
-        # copy the contents the file to a temporary file on the host machine
-        # TODO ensure correct permissions
-        (_, fn_host) = tempfile.mkstemp(suffix='.bugzoo')
-        try:
-            # TODO we can probably move 'copy_from' to this manager
-            self.__mgr_ctr.copy_from(container, filepath, fn_host)
-            with open(fn_host, 'r') as fh:
-                return fh.read()
-        finally:
-            os.remove(fn_host)
+        Parameters:
+            container: the container from which the files should be read.
+            filepaths: the paths to the files. Relative paths are interpreted
+                as being relative to the source directory for the program
+                under test.
+
+        Returns:
+            a dictionary that maps each of the given paths to the contents of
+            its file.
+
+        Raises:
+            FileNotFound: if one or more of the files do not exist.
+        """
+        resolved = {fn: self.__resolve(container, fn) for fn in filepaths}
+        contents = \
+            self.__mgr_ctr.read_bytes_many(container, list(resolved.values()))
+        return {fn: contents[fn_abs].decode('utf-8')
+                for (fn, fn_abs) in resolved.items()}
 
     def delete(self,
                container: Container,
@@ -50,5 +75,30 @@ class FileManager(object):
               container: Container,
               filepath: str,
               contents: str
-              ) -> str:
-        raise NotImplementedError
+              ) -> None:
+        """
+        Writes the contents of a given file inside a container, replacing the
+        file if it already exists.
+        """
+        filepath = self.__resolve(container, filepath)
+        self.__mgr_ctr.write_bytes(container,
+                                   filepath,
+                                   contents.encode('utf-8'))
+
+    def write_many(self,
+                   container: Container,
+                   files: Dict[str, str]
+                   ) -> None:
+        """
+        Writes the contents of a number of files inside a given container
+        using a single transfer, replacing any existing files.
+
+        Parameters:
+            container: the container to which the files should be written.
+            files: a dictionary that maps the path of each file to its
+                contents. Relative paths are interpreted as being relative to
+                the source directory for the program under test.
+        """
+        contents = {self.__resolve(container, fn): c.encode('utf-8')
+                    for (fn, c) in files.items()}
+        self.__mgr_ctr.write_bytes_many(container, contents)
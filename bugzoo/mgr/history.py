@@ -0,0 +1,366 @@
+from typing import Dict, List, Optional, Tuple, Any
+import math
+import os
+import sqlite3
+import threading
+import time
+import logging
+
+from ..core.bug import Bug
+from ..core.container import Container
+from ..core.test import TestCase, TestOutcome
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['HistoryManager']
+
+
+class HistoryManager(object):
+    """
+    Records the durations and outcomes of test executions for each bug,
+    allowing the duration and outcome of future executions to be estimated.
+
+    Every execution is appended to an SQLite database, which may optionally
+    be persisted to disk, allowing it to be used across server restarts.
+    Each record describes the bug, test, container, duration, exit code,
+    outcome, and the fingerprint of the source code inside the container
+    (see `ContainerManager.fingerprint`). Estimates are based on a window of
+    recent executions that is kept in memory, whereas aggregate statistics
+    are computed over all recorded executions.
+
+    To avoid waiting for the database to be written after every execution,
+    executions are committed in batches, after `COMMIT_INTERVAL` executions
+    have been recorded or `COMMIT_PERIOD` seconds have passed, whichever
+    comes first. Any remaining executions are committed by `flush` and
+    `close`.
+    """
+    # the maximum number of recent executions that are used to make estimates
+    MAX_EXECUTIONS = 50
+
+    # the exit codes produced by `timeout` when it terminates a command
+    TIMEOUT_CODES = (124, 137)
+
+    # the maximum number of executions that may be recorded before they are
+    # committed to the database
+    COMMIT_INTERVAL = 100
+
+    # the maximum number of seconds that may pass between the recording of
+    # an execution and its commit to the database
+    COMMIT_PERIOD = 5.0
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Parameters:
+            path: the path to an optional SQLite database that should be used
+                to persist test executions. If no path is given, executions
+                are stored in memory.
+        """
+        self.__lock = threading.Lock()
+        self.__executions = {}  # type: Dict[Tuple[str, str], List[Tuple[float, bool, bool]]]  # noqa: pycodestyle
+        self.__path = path
+        self.__db = self.__open(path or ':memory:')
+        self.__num_uncommitted = 0
+        self.__commit_timer = None  # type: Optional[threading.Timer]
+
+    @property
+    def path(self) -> Optional[str]:
+        """
+        The path to the SQLite database used to persist executions, if any.
+        """
+        return self.__path
+
+    def __open(self, path: str) -> sqlite3.Connection:
+        dir_db = os.path.dirname(path)
+        if dir_db and not os.path.exists(dir_db):
+            os.makedirs(dir_db)
+        logger.debug("opening test history database: %s", path)
+        db = sqlite3.connect(path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS executions ("
+            "bug TEXT NOT NULL, "
+            "test TEXT NOT NULL, "
+            "duration REAL NOT NULL, "
+            "passed INTEGER NOT NULL, "
+            "timestamp REAL NOT NULL)")
+
+        # add any columns that are missing from older databases
+        columns = {row[1] for row in db.execute("PRAGMA table_info(executions)")}  # noqa: pycodestyle
+        for (column, kind) in [('container', 'TEXT'),
+                               ('exit_code', 'INTEGER'),
+                               ('fingerprint', 'TEXT')]:
+            if column not in columns:
+                db.execute("ALTER TABLE executions ADD COLUMN {} {}".format(column, kind))  # noqa: pycodestyle
+
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS executions_bug_test "
+            "ON executions (bug, test, timestamp)")
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS executions_bug_test_duration "
+            "ON executions (bug, test, duration)")
+        db.execute(
+            "CREATE INDEX IF NOT EXISTS executions_fingerprint "
+            "ON executions (fingerprint)")
+        db.commit()
+        return db
+
+    def __recent(self,
+                 bug: Bug,
+                 test: TestCase
+                 ) -> List[Tuple[float, bool, bool]]:
+        """
+        Returns the duration and outcome of each recent execution of a given
+        test for a given bug, together with whether it finished (i.e., was
+        not terminated by its time limit), loading them from the database if
+        necessary. The caller must hold the lock.
+        """
+        key = (bug.name, test.name)
+        executions = self.__executions.get(key)
+        if executions is not None:
+            return executions
+        rows = self.__db.execute(
+            "SELECT duration, passed, exit_code FROM executions "
+            "WHERE bug = ? AND test = ? "
+            "ORDER BY timestamp DESC, rowid DESC LIMIT ?",
+            (bug.name, test.name, HistoryManager.MAX_EXECUTIONS))
+        executions = [(d, bool(p), c not in HistoryManager.TIMEOUT_CODES)
+                      for (d, p, c) in rows][::-1]
+        self.__executions[key] = executions
+        return executions
+
+    def record(self,
+               bug: Bug,
+               test: TestCase,
+               outcome: TestOutcome,
+               container: Optional[Container] = None,
+               fingerprint: Optional[str] = None
+               ) -> None:
+        """
+        Records the outcome of executing a given test for a given bug.
+
+        Parameters:
+            container: the container in which the test was executed.
+            fingerprint: the fingerprint of the source code against which
+                the test was executed.
+        """
+        with self.__lock:
+            executions = self.__recent(bug, test)
+            finished = \
+                outcome.response.code not in HistoryManager.TIMEOUT_CODES
+            executions.append((outcome.duration, outcome.passed, finished))
+            del executions[:-HistoryManager.MAX_EXECUTIONS]
+            self.__db.execute(
+                "INSERT INTO executions "
+                "(bug, test, duration, passed, timestamp, container, exit_code, fingerprint) "  # noqa: pycodestyle
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (bug.name, test.name, outcome.duration, int(outcome.passed),
+                 time.time(), container.uid if container else None,
+                 outcome.response.code, fingerprint))
+            self.__num_uncommitted += 1
+            if self.__num_uncommitted >= HistoryManager.COMMIT_INTERVAL:
+                self.__commit()
+            elif self.__commit_timer is None:
+                self.__commit_timer = \
+                    threading.Timer(HistoryManager.COMMIT_PERIOD, self.flush)
+                self.__commit_timer.daemon = True
+                self.__commit_timer.start()
+
+    def __commit(self) -> None:
+        """
+        Commits any uncommitted executions to the database. The caller must
+        hold the lock.
+        """
+        if self.__commit_timer is not None:
+            self.__commit_timer.cancel()
+            self.__commit_timer = None
+        if self.__num_uncommitted == 0:
+            return
+        logger.debug("committing %d test executions to history database",
+                     self.__num_uncommitted)
+        self.__db.commit()
+        self.__num_uncommitted = 0
+
+    def flush(self) -> None:
+        """
+        Commits any executions that have been recorded but not yet committed
+        to the database.
+        """
+        with self.__lock:
+            self.__commit()
+
+    def close(self) -> None:
+        """
+        Commits any remaining executions and closes the database.
+        """
+        with self.__lock:
+            self.__commit()
+            self.__db.close()
+
+    def duration(self, bug: Bug, test: TestCase) -> Optional[float]:
+        """
+        Estimates the number of seconds that it will take to execute a given
+        test for a given bug, based on its recent executions.
+
+        Returns:
+            the mean duration of the recent executions of the test, or None if
+            the test has not been executed before.
+        """
+        with self.__lock:
+            executions = self.__recent(bug, test)
+            if not executions:
+                return None
+            return sum(d for (d, _, _) in executions) / len(executions)
+
+    def percentile(self,
+                   bug: Bug,
+                   test: TestCase,
+                   q: float,
+                   *,
+                   finished: bool = False
+                   ) -> Optional[float]:
+        """
+        Computes a given percentile of the durations of the recent executions
+        of a given test for a given bug, using the nearest-rank method.
+
+        Parameters:
+            q: the percentile, between 0 and 100.
+            finished: if True, executions that were terminated by their time
+                limit are ignored, since their durations describe the limit
+                rather than the test.
+
+        Returns:
+            the percentile, or None if the test has not been executed before.
+        """
+        assert 0 <= q <= 100
+        with self.__lock:
+            durations = sorted(d for (d, _, f) in self.__recent(bug, test)
+                               if f or not finished)
+        if not durations:
+            return None
+        rank = max(math.ceil(q / 100 * len(durations)), 1)
+        return durations[rank - 1]
+
+    def num_executions(self,
+                       bug: Bug,
+                       test: TestCase,
+                       *,
+                       finished: bool = False
+                       ) -> int:
+        """
+        Returns the number of recent executions of a given test for a given
+        bug that have been recorded.
+
+        Parameters:
+            finished: if True, only executions that were not terminated by
+                their time limit are counted.
+        """
+        with self.__lock:
+            executions = self.__recent(bug, test)
+            if finished:
+                return sum(1 for (_, _, f) in executions if f)
+            return len(executions)
+
+    def failure_rate(self, bug: Bug, test: TestCase) -> Optional[float]:
+        """
+        Computes the fraction of the recent executions of a given test for a
+        given bug that failed.
+
+        Returns:
+            the failure rate of the test, or None if the test has not been
+            executed before.
+        """
+        with self.__lock:
+            executions = self.__recent(bug, test)
+            if not executions:
+                return None
+            num_failed = sum(1 for (_, passed, _) in executions if not passed)
+            return num_failed / len(executions)
+
+    def clear(self) -> None:
+        """
+        Discards the recent executions that are kept in memory; they are
+        reloaded from the database when they are next needed. Recorded
+        executions are never removed from the database.
+        """
+        with self.__lock:
+            self.__executions = {}
+
+    def __percentile_all(self, bug: str, test: str, count: int, q: float) -> Optional[float]:  # noqa: pycodestyle
+        """
+        Computes a given percentile of the durations of all recorded
+        executions of a given test using the nearest-rank method. The caller
+        must hold the lock.
+        """
+        if count == 0:
+            return None
+        rank = max(math.ceil(q / 100 * count), 1)
+        row = self.__db.execute(
+            "SELECT duration FROM executions WHERE bug = ? AND test = ? "
+            "ORDER BY duration LIMIT 1 OFFSET ?",
+            (bug, test, rank - 1)).fetchone()
+        return row[0] if row else None
+
+    def test_stats(self, bug: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Computes statistics over all recorded executions of each test for a
+        given bug.
+
+        Parameters:
+            bug: the name of the bug.
+
+        Returns:
+            a JSON-ready dictionary that maps the name of each test that has
+            been executed to its number of executions and failures, failure
+            rate, number of distinct source code fingerprints, and the mean,
+            median, 95th percentile, and maximum of its durations.
+        """
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT test, COUNT(*), SUM(1 - passed), AVG(duration), "
+                "MAX(duration), COUNT(DISTINCT fingerprint) "
+                "FROM executions WHERE bug = ? GROUP BY test",
+                (bug,)).fetchall()
+            stats = {}  # type: Dict[str, Dict[str, Any]]
+            for (test, count, failures, mean, maximum, fingerprints) in rows:
+                stats[test] = {
+                    'executions': count,
+                    'failures': failures,
+                    'failure-rate': failures / count,
+                    'fingerprints': fingerprints,
+                    'mean-duration': mean,
+                    'median-duration': self.__percentile_all(bug, test, count, 50),  # noqa: pycodestyle
+                    'p95-duration': self.__percentile_all(bug, test, count, 95),  # noqa: pycodestyle
+                    'max-duration': maximum}
+            return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Computes aggregate statistics over all recorded test executions.
+
+        Returns:
+            a JSON-ready dictionary that describes the total number of
+            recorded executions, failures, and time spent executing tests, both
+            overall and for each bug.
+        """
+        with self.__lock:
+            rows = self.__db.execute(
+                "SELECT bug, COUNT(*), SUM(1 - passed), SUM(duration), "
+                "COUNT(DISTINCT test), COUNT(DISTINCT fingerprint) "
+                "FROM executions GROUP BY bug").fetchall()
+        bugs = {}  # type: Dict[str, Dict[str, Any]]
+        for (bug, count, failures, duration, tests, fingerprints) in rows:
+            bugs[bug] = {'executions': count,
+                         'failures': failures,
+                         'failure-rate': failures / count,
+                         'duration': duration,
+                         'tests': tests,
+                         'fingerprints': fingerprints}
+        count = sum(b['executions'] for b in bugs.values())
+        failures = sum(b['failures'] for b in bugs.values())
+        return {'path': self.__path,
+                'executions': count,
+                'failures': failures,
+                'failure-rate': failures / count if count else 0.0,
+                'duration': sum(b['duration'] for b in bugs.values()),
+                'bugs': bugs}
@@ -0,0 +1,327 @@
+from typing import Dict, Any, Callable, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
+import collections
+import threading
+import time
+import uuid
+import logging
+
+from ..core.job import JobStatus
+from ..exceptions import BugZooException, \
+                         UnexpectedServerError, \
+                         JobNotFound, \
+                         JobCancelled, \
+                         JobNotCancellable
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['Job', 'JobManager']
+
+
+class Job(object):
+    """
+    A long-running operation that is performed in the background by a job
+    manager. Jobs report their progress via `report`, which also allows them
+    to be cancelled: once cancellation has been requested, the next call to
+    `report` raises `JobCancelled`. Jobs that do not report their progress
+    while they are running should be marked as not cancellable.
+    """
+    def __init__(self, kind: str, cancellable: bool = True) -> None:
+        self.__id = uuid.uuid4().hex
+        self.__kind = kind
+        self.__cancellable = cancellable
+        self.__lock = threading.Lock()
+        self.__finished = threading.Event()
+        self.__state = JobStatus.PENDING
+        self.__progress = 0.0
+        self.__message = None  # type: Optional[str]
+        self.__result = None  # type: Any
+        self.__error = None  # type: Optional[Dict[str, Any]]
+        self.__created = time.time()
+        self.__started = None  # type: Optional[float]
+        self.__time_finished = None  # type: Optional[float]
+        self.__cancel_requested = False
+
+    @property
+    def id(self) -> str:
+        return self.__id
+
+    @property
+    def kind(self) -> str:
+        return self.__kind
+
+    @property
+    def cancellable(self) -> bool:
+        """
+        Indicates whether or not this job can be cancelled once it has
+        started.
+        """
+        return self.__cancellable
+
+    @property
+    def done(self) -> bool:
+        """
+        Indicates whether or not this job has finished.
+        """
+        return self.__finished.is_set()
+
+    @property
+    def cancel_requested(self) -> bool:
+        """
+        Indicates whether or not cancellation of this job has been requested.
+        """
+        return self.__cancel_requested
+
+    @property
+    def result(self) -> Any:
+        """
+        The JSON-ready result of this job, if it has succeeded.
+        """
+        with self.__lock:
+            return self.__result
+
+    @property
+    def error(self) -> Optional[Dict[str, Any]]:
+        """
+        A description of the exception that caused this job to fail or be
+        cancelled, if any.
+        """
+        with self.__lock:
+            return self.__error
+
+    def status(self) -> JobStatus:
+        """
+        Returns a snapshot of the current status of this job.
+        """
+        with self.__lock:
+            return JobStatus(id=self.__id,
+                             kind=self.__kind,
+                             state=self.__state,
+                             progress=self.__progress,
+                             message=self.__message,
+                             error=self.__error,
+                             created=self.__created,
+                             started=self.__started,
+                             finished=self.__time_finished,
+                             cancellable=self.__cancellable)
+
+    def report(self,
+               progress: Optional[float] = None,
+               message: Optional[str] = None
+               ) -> None:
+        """
+        Reports the progress of this job.
+
+        Parameters:
+            progress: the fraction of the job that has been completed.
+            message: a description of the current activity of the job.
+
+        Raises:
+            JobCancelled: if cancellation of this job has been requested.
+        """
+        if self.__cancel_requested:
+            raise JobCancelled(self.__id)
+        with self.__lock:
+            if progress is not None:
+                self.__progress = min(max(progress, 0.0), 1.0)
+            if message is not None:
+                self.__message = message
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until this job has finished or a given timeout has elapsed.
+
+        Returns:
+            `True` if the job has finished.
+        """
+        return self.__finished.wait(timeout)
+
+    def _cancel(self) -> None:
+        self.__cancel_requested = True
+
+    def _start(self) -> None:
+        with self.__lock:
+            self.__state = JobStatus.RUNNING
+            self.__started = time.time()
+
+    def _finish(self,
+                state: str,
+                result: Any = None,
+                error: Optional[BugZooException] = None
+                ) -> None:
+        with self.__lock:
+            self.__state = state
+            self.__result = result
+            self.__error = error.to_dict() if error else None
+            if state == JobStatus.SUCCEEDED:
+                self.__progress = 1.0
+            self.__time_finished = time.time()
+        self.__finished.set()
+
+
+class JobManager(object):
+    """
+    Performs long-running operations (e.g., building images and computing
+    coverage) in the background using a bounded pool of worker threads,
+    allowing their progress to be monitored and their results to be
+    collected later, rather than holding a connection open for the duration
+    of the operation.
+    """
+    def __init__(self,
+                 max_workers: int = 4,
+                 max_finished: int = 1000
+                 ) -> None:
+        """
+        Parameters:
+            max_workers: the maximum number of jobs that may be performed at
+                the same time.
+            max_finished: the maximum number of finished jobs whose results
+                are retained. Once this limit is exceeded, the jobs that
+                finished least recently are forgotten.
+        """
+        assert max_workers > 0
+        assert max_finished > 0
+        self.__lock = threading.Lock()
+        self.__jobs = collections.OrderedDict()  # type: collections.OrderedDict  # noqa: pycodestyle
+        self.__finished = collections.deque()  # type: collections.deque
+        self.__futures = {}  # type: Dict[str, Any]
+        self.__max_finished = max_finished
+        self.__executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __getitem__(self, id: str) -> Job:
+        """
+        Retrieves the job with a given ID.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+        """
+        try:
+            with self.__lock:
+                return self.__jobs[id]
+        except KeyError:
+            raise JobNotFound(id)
+
+    def __iter__(self) -> Iterator[Job]:
+        """
+        Returns an iterator over all jobs, in the order they were submitted.
+        """
+        with self.__lock:
+            jobs = list(self.__jobs.values())
+        yield from jobs
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__jobs)
+
+    def submit(self,
+               kind: str,
+               func: Callable[[Job], Any],
+               *,
+               cancellable: bool = True
+               ) -> Job:
+        """
+        Submits a job for execution.
+
+        Parameters:
+            kind: the kind of operation that is performed by the job.
+            func: a function that performs the job. The function is given
+                the job as its argument, allowing it to report its progress,
+                and should return a JSON-ready result.
+            cancellable: indicates whether the job can be cancelled once it
+                has started. Should be disabled for jobs that do not report
+                their progress while they are running.
+
+        Returns:
+            the submitted job.
+        """
+        job = Job(kind, cancellable=cancellable)
+        logger.debug("submitting job %s: %s", job.id, kind)
+        with self.__lock:
+            self.__jobs[job.id] = job
+            self.__futures[job.id] = \
+                self.__executor.submit(self.__run, job, func)
+        return job
+
+    def __run(self, job: Job, func: Callable[[Job], Any]) -> None:
+        if job.cancel_requested:
+            self.__finish(job, JobStatus.CANCELLED, error=JobCancelled(job.id))
+            return
+
+        logger.debug("starting job %s: %s", job.id, job.kind)
+        job._start()
+        try:
+            result = func(job)
+        except JobCancelled as err:
+            logger.info("cancelled job %s: %s", job.id, job.kind)
+            self.__finish(job, JobStatus.CANCELLED, error=err)
+        except BugZooException as err:
+            logger.exception("job %s failed: %s", job.id, job.kind)
+            self.__finish(job, JobStatus.FAILED, error=err)
+        except Exception as err:
+            logger.exception("job %s failed unexpectedly: %s",
+                             job.id, job.kind)
+            self.__finish(job,
+                          JobStatus.FAILED,
+                          error=UnexpectedServerError.from_exception(err))
+        else:
+            logger.debug("finished job %s: %s", job.id, job.kind)
+            self.__finish(job, JobStatus.SUCCEEDED, result=result)
+
+    def __finish(self,
+                 job: Job,
+                 state: str,
+                 result: Any = None,
+                 error: Optional[BugZooException] = None
+                 ) -> None:
+        """
+        Marks a given job as finished, and forgets the jobs that finished
+        least recently if there are too many finished jobs.
+        """
+        with self.__lock:
+            self.__futures.pop(job.id, None)
+            self.__finished.append(job.id)
+            while len(self.__finished) > self.__max_finished:
+                self.__jobs.pop(self.__finished.popleft(), None)
+        job._finish(state, result=result, error=error)
+
+    def cancel(self, id: str) -> bool:
+        """
+        Requests the cancellation of a given job. Pending jobs are cancelled
+        immediately; running jobs are cancelled the next time that they
+        report their progress.
+
+        Returns:
+            `True` if cancellation was requested, or `False` if the job had
+            already finished.
+
+        Raises:
+            JobNotFound: if no job exists with the given ID.
+            JobNotCancellable: if the job has started and cannot be
+                cancelled.
+        """
+        job = self[id]
+        if job.done:
+            return False
+        logger.debug("requesting cancellation of job: %s", id)
+        if job.cancellable:
+            job._cancel()
+        with self.__lock:
+            future = self.__futures.get(id)
+        if future is not None and future.cancel():
+            self.__finish(job, JobStatus.CANCELLED, error=JobCancelled(id))
+        elif not job.cancellable:
+            if job.done:
+                return False
+            logger.debug("job cannot be cancelled: %s", id)
+            raise JobNotCancellable(id)
+        return True
+
+    def shutdown(self) -> None:
+        """
+        Requests the cancellation of all unfinished jobs. Does not wait for
+        running jobs to stop.
+        """
+        for job in self:
+            if not job.done:
+                self.cancel(job.id)
+        self.__executor.shutdown(wait=False)
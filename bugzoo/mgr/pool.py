@@ -0,0 +1,336 @@
+from typing import Dict, List, Optional, Any, Tuple, TYPE_CHECKING
+from timeit import default_timer as timer
+import threading
+import logging
+import uuid
+
+from ..core.bug import Bug
+
+if TYPE_CHECKING:
+    from .container import ContainerManager
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['ContainerPool']
+
+# the UID, Docker container, and environment file of each warm container
+_WarmContainers = List[Tuple[str, Any, Any]]
+
+
+class ContainerPool(object):
+    """
+    Maintains a pool of pre-started, environment-ready containers for each
+    bug, allowing requests to provision a container to be answered
+    immediately rather than waiting for a fresh Docker container to be
+    created, started, and prepared.
+
+    Warm containers are owned by the pool until they are handed out; they are
+    not registered with the container manager, and so they do not appear in
+    its list of running containers. Once a warm container has been handed
+    out, the pool is refilled in the background.
+
+    The pool is disabled by default (i.e., its size is zero).
+    """
+    def __init__(self,
+                 mgr_ctr: 'ContainerManager',
+                 size: int = 0,
+                 max_size: Optional[int] = None,
+                 max_idle: Optional[float] = None
+                 ) -> None:
+        """
+        Constructs a new container pool.
+
+        Parameters:
+            mgr_ctr: the container manager that should be used to launch and
+                destroy warm containers.
+            size: the number of warm containers that should be kept for each
+                bug.
+            max_size: an optional limit on the total number of warm
+                containers (including those that are in the process of being
+                launched) that may be kept by the pool across all bugs.
+            max_idle: an optional number of seconds after which the warm
+                containers for a bug that has not been requested will be
+                destroyed.
+        """
+        assert size >= 0
+        assert max_size is None or max_size >= 0
+        assert max_idle is None or max_idle > 0
+        self.__mgr_ctr = mgr_ctr
+        self.__size = size
+        self.__max_size = max_size
+        self.__max_idle = max_idle
+        self.__lock = threading.RLock()
+        self.__ready = {}  # type: Dict[str, _WarmContainers]
+        self.__pending = {}  # type: Dict[str, int]
+        self.__launchers = {}  # type: Dict[str, threading.Thread]
+        self.__last_requested = {}  # type: Dict[str, float]
+        self.__num_hits = 0
+        self.__num_misses = 0
+        self.__num_evictions = 0
+        self.__num_failures = 0
+        self.__reaper = None  # type: Optional[threading.Thread]
+        self.__reaper_stop = threading.Event()
+        self.__start_reaper()
+
+    @property
+    def size(self) -> int:
+        """
+        The number of warm containers that are kept for each bug.
+        """
+        return self.__size
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """
+        The maximum number of warm containers that may be kept by this pool
+        across all bugs, if any.
+        """
+        return self.__max_size
+
+    @property
+    def max_idle(self) -> Optional[float]:
+        """
+        The number of seconds that a bug may go unrequested before its warm
+        containers are evicted, if any.
+        """
+        return self.__max_idle
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Indicates whether or not this pool is enabled.
+        """
+        return self.__size > 0 and self.__max_size != 0
+
+    def configure(self,
+                  size: Optional[int] = None,
+                  max_size: Optional[int] = None,
+                  max_idle: Optional[float] = None
+                  ) -> None:
+        """
+        Updates the configuration of this pool. Any unspecified options will
+        retain their current values. Setting the size of the pool to zero
+        disables the pool and destroys all of its warm containers.
+        """
+        with self.__lock:
+            if size is not None:
+                assert size >= 0
+                self.__size = size
+            if max_size is not None:
+                assert max_size >= 0
+                self.__max_size = max_size
+            if max_idle is not None:
+                assert max_idle > 0
+                self.__max_idle = max_idle
+            logger.info("configured container pool (size: %d, max. size: %s, max. idle: %s)",  # noqa: pycodestyle
+                        self.__size, self.__max_size, self.__max_idle)
+            enabled = self.enabled
+        # N.B. the lock must not be held whilst clearing, since clearing waits
+        # for in-flight launches, which require the lock to finish
+        if not enabled:
+            self.clear()
+            return
+        self.__start_reaper()
+
+    def __len__(self) -> int:
+        """
+        Returns the number of warm containers that are ready to be handed out.
+        """
+        with self.__lock:
+            return sum(len(entries) for entries in self.__ready.values())
+
+    def __num_owned(self) -> int:
+        return len(self) + sum(self.__pending.values())
+
+    def acquire(self, bug: Bug) -> Optional[Tuple[str, Any, Any]]:
+        """
+        Attempts to take a warm container for a given bug from the pool, and
+        schedules the pool to be refilled in the background.
+
+        Returns:
+            a tuple containing the UID, Docker container, and environment file
+            for a warm container, or None if no warm container was available.
+        """
+        if not self.enabled:
+            return None
+
+        with self.__lock:
+            self.__last_requested[bug.name] = timer()
+            entries = self.__ready.get(bug.name, [])
+            if entries:
+                entry = entries.pop()
+                self.__num_hits += 1
+                logger.debug("container pool hit for bug: %s", bug.name)
+            else:
+                entry = None
+                self.__num_misses += 1
+                logger.debug("container pool miss for bug: %s", bug.name)
+
+        self.refill(bug)
+        return entry
+
+    def warm(self, bug: Bug) -> None:
+        """
+        Ensures that the pool begins to keep warm containers for a given bug.
+        """
+        with self.__lock:
+            self.__last_requested[bug.name] = timer()
+        self.refill(bug)
+
+    def refill(self, bug: Bug) -> None:
+        """
+        Launches as many containers for a given bug in the background as are
+        needed to bring its warm containers back up to the size of the pool,
+        subject to the maximum size of the pool.
+        """
+        with self.__lock:
+            if not self.enabled:
+                return
+            num_ready = len(self.__ready.get(bug.name, []))
+            num_pending = self.__pending.get(bug.name, 0)
+            num_needed = self.__size - num_ready - num_pending
+            if self.__max_size is not None:
+                num_spare = self.__max_size - self.__num_owned()
+                num_needed = min(num_needed, num_spare)
+            if num_needed <= 0:
+                return
+            self.__pending[bug.name] = num_pending + num_needed
+
+        logger.debug("launching %d warm containers for bug: %s",
+                     num_needed, bug.name)
+        for _ in range(num_needed):
+            uid = str(uuid.uuid4())
+            t = threading.Thread(target=self.__launch, args=(bug, uid))
+            t.daemon = True
+            with self.__lock:
+                self.__launchers[uid] = t
+            t.start()
+
+    def __launch(self, bug: Bug, uid: str) -> None:
+        try:
+            self.__launch_container(bug, uid)
+        finally:
+            with self.__lock:
+                del self.__launchers[uid]
+
+    def __launch_container(self, bug: Bug, uid: str) -> None:
+        try:
+            dockerc, env_file, _ = \
+                self.__mgr_ctr._launch(bug, uid, [], {}, 'bridge', {})
+        except Exception:
+            logger.exception("failed to launch warm container for bug: %s",
+                             bug.name)
+            with self.__lock:
+                self.__pending[bug.name] -= 1
+                self.__num_failures += 1
+            return
+
+        with self.__lock:
+            self.__pending[bug.name] -= 1
+            keep = self.enabled and bug.name in self.__last_requested
+            if keep:
+                entries = self.__ready.setdefault(bug.name, [])
+                entries.append((uid, dockerc, env_file))
+                logger.debug("added warm container to pool for bug %s: %s",
+                             bug.name, uid)
+        if not keep:
+            self.__mgr_ctr._discard(dockerc, env_file, [])
+
+    def evict(self, bug_name: Optional[str] = None) -> int:
+        """
+        Destroys the warm containers that are held for a given bug, or for
+        all bugs if no bug is specified.
+
+        Returns:
+            the number of warm containers that were destroyed.
+        """
+        with self.__lock:
+            if bug_name is None:
+                evicted = [e for entries in self.__ready.values()
+                           for e in entries]
+                self.__ready = {}
+                self.__last_requested = {}
+            else:
+                evicted = self.__ready.pop(bug_name, [])
+                self.__last_requested.pop(bug_name, None)
+            self.__num_evictions += len(evicted)
+
+        for (uid, dockerc, env_file) in evicted:
+            logger.debug("evicting warm container from pool: %s", uid)
+            self.__mgr_ctr._discard(dockerc, env_file, [])
+        return len(evicted)
+
+    def evict_idle(self) -> int:
+        """
+        Destroys the warm containers for all bugs that have not been
+        requested within the maximum idle time of the pool.
+
+        Returns:
+            the number of warm containers that were destroyed.
+        """
+        if self.__max_idle is None:
+            return 0
+        now = timer()
+        with self.__lock:
+            idle = [name for (name, t) in self.__last_requested.items()
+                    if now - t > self.__max_idle]
+        return sum(self.evict(name) for name in idle)
+
+    def clear(self) -> None:
+        """
+        Destroys all warm containers in the pool and stops its background
+        eviction thread. Any containers that are still being launched are
+        waited for and destroyed, rather than outliving the pool.
+        """
+        self.__reaper_stop.set()
+        self.evict()
+        with self.__lock:
+            launchers = list(self.__launchers.values())
+        for t in launchers:
+            t.join()
+        # the launches that were in flight discard their containers, since
+        # the bugs for which they were launched are no longer requested
+        self.evict()
+
+    def __start_reaper(self) -> None:
+        if self.__max_idle is None or not self.enabled:
+            return
+        if self.__reaper is not None and self.__reaper.is_alive():
+            return
+        self.__reaper_stop = threading.Event()
+        self.__reaper = threading.Thread(target=self.__reap,
+                                         args=(self.__reaper_stop,))
+        self.__reaper.daemon = True
+        self.__reaper.start()
+
+    def __reap(self, stop: threading.Event) -> None:
+        while True:
+            # the maximum idle time may be changed by `configure`
+            max_idle = self.__max_idle
+            if max_idle is None or stop.wait(min(max_idle / 2, 30.0)):
+                return
+            try:
+                self.evict_idle()
+            except Exception:
+                logger.exception("failed to evict idle warm containers")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Produces a JSON-ready summary of the configuration and usage of this
+        pool.
+        """
+        with self.__lock:
+            num_requests = self.__num_hits + self.__num_misses
+            hit_rate = self.__num_hits / num_requests if num_requests else 0.0
+            bugs = {name: {'ready': len(self.__ready.get(name, [])),
+                           'pending': self.__pending.get(name, 0)}
+                    for name in set(self.__ready) | set(self.__pending)}
+            return {'size': self.__size,
+                    'max-size': self.__max_size,
+                    'max-idle': self.__max_idle,
+                    'hits': self.__num_hits,
+                    'misses': self.__num_misses,
+                    'hit-rate': hit_rate,
+                    'evictions': self.__num_evictions,
+                    'failures': self.__num_failures,
+                    'bugs': bugs}
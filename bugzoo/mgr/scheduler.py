@@ -0,0 +1,221 @@
+from typing import List, Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+import collections
+import threading
+import logging
+
+from ..core.bug import Bug
+from ..core.container import Container
+from ..core.test import TestCase, TestSuiteOutcome
+
+if TYPE_CHECKING:
+    from .. import BugZoo
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['TestScheduler']
+
+
+class TestScheduler(object):
+    """
+    Distributes the execution of a number of tests for a bug across several
+    containers for that bug, allowing test harnesses that cannot safely be
+    executed concurrently within a single container to be executed in
+    parallel.
+
+    Tests are handed out to containers in longest-processing-time-first
+    order, using the durations of their recent executions, to balance the
+    load across the containers. Tests that were being executed by a container
+    that crashed are re-queued and executed by another container.
+    """
+    # the maximum number of times that the execution of a test may be
+    # attempted before the scheduler gives up on it.
+    MAX_ATTEMPTS = 2
+
+    def __init__(self, installation: 'BugZoo') -> None:
+        self.__installation = installation
+
+    def order(self, bug: Bug, tests: List[TestCase]) -> List[TestCase]:
+        """
+        Sorts a given list of tests for a bug in descending order of their
+        expected duration. Tests that have not been executed before are
+        assumed to take the mean duration of those that have.
+        """
+        history = self.__installation.history
+        estimates = {t.name: history.duration(bug, t) for t in tests}
+        known = [d for d in estimates.values() if d is not None]
+        default = sum(known) / len(known) if known else 0.0
+
+        def estimate(test: TestCase) -> float:
+            duration = estimates[test.name]
+            return default if duration is None else duration
+
+        return sorted(tests, key=estimate, reverse=True)
+
+    def prioritize(self, bug: Bug, tests: List[TestCase]) -> List[TestCase]:
+        """
+        Sorts a given list of tests for a bug such that the tests that are
+        most likely to fail, relative to their expected duration, come first.
+        Running tests in this order allows a failing program to be detected
+        as early and as cheaply as possible.
+
+        The probability that a test will fail is estimated from its recent
+        executions (using Laplace smoothing, so that tests that have not
+        been executed before are given a probability of one half). Tests that
+        have not been executed before are assumed to take the mean duration
+        of those that have.
+        """
+        history = self.__installation.history
+        durations = {t.name: history.duration(bug, t) for t in tests}
+        known = [d for d in durations.values() if d is not None]
+        default = sum(known) / len(known) if known else 1.0
+
+        def priority(test: TestCase) -> float:
+            rate = history.failure_rate(bug, test)
+            num_runs = history.num_executions(bug, test)
+            if rate is None:
+                probability = 0.5
+            else:
+                probability = (rate * num_runs + 1) / (num_runs + 2)
+            duration = durations[test.name]
+            if duration is None:
+                duration = default
+            return probability / max(duration, 0.001)
+
+        return sorted(tests, key=priority, reverse=True)
+
+    def run(self,
+            bug: Bug,
+            tests: Optional[List[TestCase]] = None,
+            num_containers: int = 1,
+            containers: Optional[List[Container]] = None
+            ) -> TestSuiteOutcome:
+        """
+        Executes a number of tests for a given bug across several containers.
+
+        Parameters:
+            bug: the bug whose tests should be executed.
+            tests: the tests that should be executed. Defaults to all of the
+                tests for the bug.
+            num_containers: the number of containers that should be
+                provisioned to execute the tests. Ignored if `containers` is
+                given.
+            containers: an optional list of existing containers for the bug
+                that should be borrowed to execute the tests. Borrowed
+                containers are not destroyed once the tests have finished.
+
+        Returns:
+            the outcomes of the executed tests.
+
+        Raises:
+            Exception: if one or more tests could not be executed.
+        """
+        mgr_ctr = self.__installation.containers
+        if tests is None:
+            tests = list(bug.harness)
+        if not tests:
+            return TestSuiteOutcome({})
+        owned = containers is None
+        if containers is None:
+            assert num_containers > 0
+            num_workers = min(num_containers, len(tests))
+        else:
+            assert containers, "expected at least one container"
+            assert all(c.bug == bug.name for c in containers)
+            num_workers = len(containers)
+
+        queue = collections.deque((t, 0) for t in self.order(bug, tests))
+        cond = threading.Condition()
+        outcomes = {}
+        errors = []  # type: List[Exception]
+        failures = []  # type: List[Exception]
+        num_running = [0]
+        num_replacements = [0]
+        provisioned = []  # type: List[Container]
+
+        def provision() -> Container:
+            container = mgr_ctr.provision(bug)
+            with cond:
+                provisioned.append(container)
+            return container
+
+        def worker(container: Optional[Container]) -> None:
+            if container is None:
+                container = provision()
+            while True:
+                with cond:
+                    while not queue and num_running[0] > 0:
+                        cond.wait()
+                    if not queue:
+                        return
+                    (test, attempts) = queue.popleft()
+                    num_running[0] += 1
+
+                try:
+                    outcome = mgr_ctr.execute(container, test)
+                except Exception as err:
+                    logger.exception("failed to execute test %s in container: %s",  # noqa: pycodestyle
+                                     test.name, container.uid)
+                    crashed = not mgr_ctr.is_alive(container)
+                    with cond:
+                        num_running[0] -= 1
+                        if attempts + 1 < TestScheduler.MAX_ATTEMPTS:
+                            queue.appendleft((test, attempts + 1))
+                        else:
+                            errors.append(err)
+                        # avoid replacing containers indefinitely
+                        replace = owned and \
+                            num_replacements[0] < num_workers
+                        if crashed and replace:
+                            num_replacements[0] += 1
+                        cond.notify_all()
+                    if not crashed:
+                        continue
+                    logger.warning("container crashed whilst executing tests: %s",  # noqa: pycodestyle
+                                   container.uid)
+                    if not replace:
+                        return
+                    container = provision()
+                    continue
+
+                with cond:
+                    num_running[0] -= 1
+                    outcomes[test.name] = outcome
+                    cond.notify_all()
+
+        logger.debug("running %d tests for bug %s across %d containers",
+                     len(tests), bug.name, num_workers)
+        try:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                if containers is None:
+                    workers = [executor.submit(worker, None)
+                               for _ in range(num_workers)]
+                else:
+                    workers = [executor.submit(worker, c)
+                               for c in containers]
+                for future in workers:
+                    try:
+                        future.result()
+                    except Exception as err:
+                        logger.exception("test worker failed for bug: %s",
+                                         bug.name)
+                        failures.append(err)
+        finally:
+            for container in provisioned:
+                try:
+                    del mgr_ctr[container.uid]
+                except KeyError:
+                    pass
+
+        if errors:
+            raise errors[0]
+        if queue and failures:
+            raise failures[0]
+        if queue:
+            msg = "failed to execute tests for bug {}: no containers left"
+            msg = msg.format(bug.name)
+            logger.error(msg)
+            raise Exception(msg)  # FIXME add new exception
+        logger.debug("ran %d tests for bug %s across %d containers",
+                     len(tests), bug.name, num_workers)
+        return TestSuiteOutcome(outcomes)
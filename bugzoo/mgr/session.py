@@ -0,0 +1,235 @@
+from typing import Optional
+from timeit import default_timer as timer
+import socket
+import struct
+import threading
+import logging
+import uuid
+
+import docker
+
+from ..cmd import ExecResponse
+
+logger = logging.getLogger(__name__)  # type: logging.Logger
+
+__all__ = ['ShellSession', 'ShellSessionClosed']
+
+
+class ShellSessionClosed(Exception):
+    """
+    The long-lived shell inside a container was closed unexpectedly.
+    """
+
+
+class ShellSession(object):
+    """
+    Provides a long-lived shell inside a given container that is used to
+    execute commands without paying for the creation of a new Docker exec
+    instance and a new shell for every command. Commands are written to the
+    attached standard input of the shell, and each command is followed by a
+    unique marker that is used to detect its completion and to obtain its
+    exit code from the standard output.
+
+    Each session may only execute a single command at a time; callers should
+    use `lock` to ensure exclusive access.
+
+    Unlike commands that are executed using a separate exec instance (see
+    `ContainerManager.command`), the shell is not attached to a TTY, since
+    its standard output must be demultiplexed from its standard error. As a
+    result, commands that check whether they are attached to a terminal may
+    behave differently, and their output uses `\n` rather than `\r\n` line
+    endings.
+    """
+    # the number of seconds that the host will wait, beyond the time limit
+    # and kill-after period of a command, before giving up on the session.
+    GRACE_PERIOD = 5.0
+
+    def __init__(self,
+                 api_docker: docker.APIClient,
+                 id_container: str
+                 ) -> None:
+        """
+        Launches a new shell session inside a given container.
+
+        Parameters:
+            api_docker: the low-level Docker API client.
+            id_container: the ID of the Docker container.
+        """
+        self.__id_container = id_container
+        self.__lock = threading.Lock()
+        self.__token = uuid.uuid4().hex
+        self.__counter = 0
+        self.__buffer = bytearray()
+        self.__closed = False
+
+        logger.debug("launching shell session inside container: %s",
+                     id_container)
+        cmd = "/bin/bash --noprofile --norc"
+        response = api_docker.exec_create(id_container,
+                                          cmd,
+                                          stdin=True,
+                                          stdout=True,
+                                          stderr=True,
+                                          tty=False)
+        sock = api_docker.exec_start(response['Id'], socket=True)
+        self.__socket = getattr(sock, '_sock', sock)  # type: socket.socket
+        self.__send("source /.environment\n")
+        logger.debug("launched shell session inside container: %s",
+                     id_container)
+
+    @property
+    def lock(self) -> threading.Lock:
+        """
+        The lock that should be held whilst executing a command.
+        """
+        return self.__lock
+
+    @property
+    def closed(self) -> bool:
+        """
+        Indicates whether or not this session has been closed.
+        """
+        return self.__closed
+
+    def close(self) -> None:
+        """
+        Closes this session and terminates its shell.
+        """
+        if self.__closed:
+            return
+        self.__closed = True
+        try:
+            self.__socket.close()
+        except OSError:
+            pass
+
+    def __send(self, s: str) -> None:
+        try:
+            self.__socket.settimeout(None)
+            self.__socket.sendall(s.encode('utf-8'))
+        except OSError:
+            self.close()
+            raise ShellSessionClosed
+
+    def __recv(self, deadline: Optional[float]) -> None:
+        """
+        Reads the next chunk of data from the shell into the buffer.
+        """
+        if deadline is None:
+            self.__socket.settimeout(None)
+        else:
+            self.__socket.settimeout(max(deadline - timer(), 0.001))
+        try:
+            data = self.__socket.recv(4096)
+        except socket.timeout:
+            self.close()
+            raise TimeoutError
+        except OSError:
+            self.close()
+            raise ShellSessionClosed
+        if not data:
+            self.close()
+            raise ShellSessionClosed
+        self.__buffer += data
+
+    def __read_until(self,
+                     marker: bytes,
+                     deadline: Optional[float]
+                     ) -> bytes:
+        """
+        Reads from the standard output of the shell until a given marker is
+        encountered, and returns everything up to and including that marker.
+        Any output written to the standard error of the shell itself is
+        discarded.
+        """
+        stdout = bytearray()
+        at = -1
+        searched = 0
+        while True:
+            # decode as many complete frames as are available
+            buff = self.__buffer
+            while len(buff) >= 8:
+                (stream, size) = struct.unpack_from('>BxxxL', buff)
+                if len(buff) < 8 + size:
+                    break
+                payload = bytes(buff[8:8 + size])
+                del buff[:8 + size]
+                if stream == 1:
+                    stdout += payload
+                else:
+                    logger.debug("shell session [%s] wrote to stderr: %s",
+                                 self.__id_container, payload)
+
+            # only the output that has arrived since the last search (and
+            # enough of the preceding output to contain a partial marker) is
+            # searched, to avoid rescanning long outputs
+            if at < 0:
+                start = max(searched - len(marker) + 1, 0)
+                at = stdout.find(marker, start)
+                searched = len(stdout) if at < 0 else at + len(marker)
+            if at >= 0:
+                end = stdout.find(b'\n', searched)
+                if end >= 0:
+                    return bytes(stdout[:end])
+                searched = len(stdout)
+            self.__recv(deadline)
+
+    def execute(self,
+                cmd: str,
+                context: str,
+                stdout: bool = True,
+                stderr: bool = False,
+                time_limit: Optional[int] = None,
+                kill_after: Optional[int] = 1
+                ) -> ExecResponse:
+        """
+        Executes a given shell command using this session. The command is
+        executed in a subshell, ensuring that it cannot affect the state of
+        the session, and it is prevented from reading the standard input of
+        the session.
+
+        Raises:
+            ShellSessionClosed: if the session was closed before the command
+                finished executing.
+            TimeoutError: if the command failed to finish within its time
+                limit, kill-after period, and the grace period of the session.
+                The session is closed when this happens.
+        """
+        if self.__closed:
+            raise ShellSessionClosed
+
+        self.__counter += 1
+        marker = "__BUGZOO_{}_{}__".format(self.__token, self.__counter)
+
+        if stdout and stderr:
+            redirect = '2>&1'
+        elif stdout:
+            redirect = '2>/dev/null'
+        elif stderr:
+            redirect = '2>&1 >/dev/null'
+        else:
+            redirect = '>/dev/null 2>&1'
+
+        deadline = None  # type: Optional[float]
+        if time_limit is not None and time_limit > 0:
+            cmd = 'cd {} && {}'.format(context, cmd)
+            cmd = "/bin/bash -c '{}'".format(cmd)
+            cmd_template = "timeout --kill-after={} --signal=SIGTERM {} {}"
+            cmd = cmd_template.format(kill_after, time_limit, cmd)
+            deadline = time_limit + (kill_after or 0) + self.GRACE_PERIOD
+        else:
+            cmd = '(cd {} && {})'.format(context, cmd)
+
+        framed = "{{ {} ; }} < /dev/null {}\n".format(cmd, redirect)
+        framed += "printf '\\n%s:%d\\n' '{}' \"$?\"\n".format(marker)
+
+        time_start = timer()
+        if deadline is not None:
+            deadline += time_start
+        self.__send(framed)
+        raw = self.__read_until((marker + ':').encode('utf-8'), deadline)
+        time_running = timer() - time_start
+
+        (raw_output, _, code) = raw.rpartition(('\n' + marker + ':').encode('utf-8'))  # noqa: pycodestyle
+        output = raw_output.decode('utf-8', errors='replace').rstrip('\n')
+        return ExecResponse(int(code), time_running, output)
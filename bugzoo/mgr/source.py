@@ -174,6 +174,11 @@ class SourceManager(object):
                     name,
                     files_to_instrument)
 
+        coverage_backend = d.get('coverage', {}).get('backend', 'gcovr')
+        if coverage_backend not in Bug.COVERAGE_BACKENDS:
+            msg = "unknown coverage backend: {}".format(coverage_backend)
+            raise ValueError(msg)
+
         return Bug(name,
                    d['image'],
                    d.get('dataset', None),
@@ -183,7 +188,8 @@ class SourceManager(object):
                    [Language[lang] for lang in d['languages']],
                    TestSuite.from_dict(d['test-harness']),
                    Compiler.from_dict(d['compiler']),
-                   files_to_instrument=files_to_instrument)
+                   files_to_instrument=files_to_instrument,
+                   coverage_backend=coverage_backend)
 
     def __parse_tool(self, source: Source, fn: str, d: dict) -> Tool:
         return Tool(d['name'],
@@ -214,6 +220,8 @@ class SourceManager(object):
             except KeyError as e:
                 logger.exception("missing property in bug description: %s",
                                  str(e))
+            except ValueError as e:
+                logger.exception("invalid bug description: %s", str(e))
 
         for description in yml.get('blueprints', []):
             logger.debug("parsing blueprint: %s", json.dumps(description))
@@ -1,7 +1,8 @@
-from typing import Dict, Any, Iterator, Optional
+from typing import Dict, Any, Iterator, Optional, List
 from functools import wraps
 from contextlib import contextmanager
 import argparse
+import json
 import os
 import signal
 import subprocess
@@ -24,6 +25,7 @@ from ..exceptions import *
 from ..client import Client
 from ..mgr.container import ContainerManager
 from ..mgr.coverage import CoverageManager
+from ..mgr.job import Job
 from ..util import indent, report_resource_limits, report_system_resources
 
 logger = logging.getLogger(__name__)  # type: logging.Logger
@@ -36,6 +38,9 @@ app.logger.setLevel(logging.ERROR)
 app.logger.disabled = True
 logging.getLogger('werkzeug').disabled = True
 
+# the maximum number of seconds that a request may wait for a job to finish
+MAX_JOB_WAIT = 60.0
+
 
 def throws_errors(func):
     """
@@ -94,6 +99,23 @@ def ephemeral(*,
         os.killpg(proc.pid, signal.SIGTERM)
 
 
+def asynchronous() -> bool:
+    """
+    Determines whether the current request asked for its operation to be
+    performed in the background as a job.
+    """
+    return flask.request.args.get('async', 'no') == 'yes'
+
+
+def accepted(job: Job):
+    """
+    Produces a response for a request whose operation was submitted as a
+    given job.
+    """
+    jsn = flask.jsonify(job.status().to_dict())
+    return (jsn, 202, {'Location': '/jobs/{}'.format(job.id)})
+
+
 @app.route('/status', methods=['GET'])
 def get_status():
     """
@@ -150,7 +172,6 @@ def interact_with_bug(uid: str):
         return '', 204
 
 
-# TODO return a job ID
 @app.route('/bugs/<path:uid>/build', methods=['POST'])
 @throws_errors
 def build_bug(uid: str):
@@ -164,6 +185,13 @@ def build_bug(uid: str):
     if daemon.bugs.is_installed(bug):
         return BugAlreadyBuilt(uid), 409
 
+    if asynchronous():
+        def build(job: Job) -> None:
+            job.report(message="building image: {}".format(bug.image))
+            daemon.bugs.build(bug)
+        return accepted(daemon.jobs.submit('build-bug', build,
+                                           cancellable=False))
+
     try:
         daemon.bugs.build(bug)
     except ImageBuildFailed as err:
@@ -183,12 +211,60 @@ def provision_bug(uid: str):
     if not daemon.bugs.is_installed(bug):
         return ImageNotInstalled(bug.image), 400
 
-    container = daemon.containers.provision(bug)
+    reset = flask.request.args.get('reset', 'no') == 'yes'
+
+    if asynchronous():
+        def provision(job: Job) -> Dict[str, Any]:
+            job.report(message="provisioning container")
+            return daemon.containers.provision(bug, reset=reset).to_dict()
+        return accepted(daemon.jobs.submit('provision-bug', provision,
+                                           cancellable=False))
+
+    container = daemon.containers.provision(bug, reset=reset)
     jsn = flask.jsonify(container.to_dict())
 
     return (jsn, 200)
 
 
+@app.route('/bugs/<path:uid>/provision-many', methods=['POST'])
+@throws_errors
+def provision_many_bug(uid: str):
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+
+    if not daemon.bugs.is_installed(bug):
+        return ImageNotInstalled(bug.image), 400
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    if 'n' not in args:
+        return ArgumentNotSpecified("n"), 400
+    n = args['n']
+    workers = args.get('workers')
+    reset = args.get('reset', False)
+    assert isinstance(n, int)
+    assert workers is None or isinstance(workers, int)
+    assert isinstance(reset, bool)
+
+    # each container is written as a line of JSON as soon as it is ready.
+    # since the status code has already been sent, errors are reported
+    # in-band.
+    def stream() -> Iterator[str]:
+        try:
+            for container in daemon.containers.provision_many(bug, n, workers=workers, reset=reset):  # noqa: pycodestyle
+                yield json.dumps(container.to_dict()) + '\n'
+        except BugZooException as err:
+            yield json.dumps(err.to_dict()) + '\n'
+        except Exception as err:
+            logger.exception("failed to provision containers for bug: %s",
+                             bug.name)
+            err = UnexpectedServerError.from_exception(err)
+            yield json.dumps(err.to_dict()) + '\n'
+
+    return flask.Response(stream(), mimetype='application/x-ndjson'), 200
+
+
 @app.route('/bugs/<uid>/coverage', methods=['GET'])
 @throws_errors
 def coverage_bug(uid: str):
@@ -206,8 +282,18 @@ def coverage_bug(uid: str):
         logger.error("%s: snapshot not installed.", msg_prefix_fail)
         return ImageNotInstalled(bug.image), 400
 
+    if asynchronous():
+        def compute(job: Job) -> Dict[str, Any]:
+            progress = lambda i, n: job.report(i / n if n else 1.0, "computed coverage for {} of {} tests".format(i, n))  # noqa: pycodestyle
+            return daemon.bugs.coverage(bug, progress=progress).to_dict()
+        return accepted(daemon.jobs.submit('coverage-bug', compute))
+
     try:
-        coverage = daemon.bugs.coverage(bug)
+        # indicates whether the coverage is served from the coverage cache
+        coverage = daemon.bugs.coverage_cache.get(bug)
+        cached = coverage is not None
+        if coverage is None:
+            coverage = daemon.bugs.compute_coverage(bug)
     # TODO: work on this
     except Exception:
         logger.error("%s: failed to compute coverage.", msg_prefix_fail)
@@ -216,7 +302,8 @@ def coverage_bug(uid: str):
     logger.debug("Converting coverage information to JSON.")
     jsn = flask.jsonify(coverage.to_dict())
     logger.debug("Converted coverage information to JSON.")
-    return (jsn, 200)
+    headers = {'X-BugZoo-Coverage-Cached': 'yes' if cached else 'no'}
+    return (jsn, 200, headers)
 
 
 @app.route('/containers/<id_container>/test/<id_test>', methods=['POST'])
@@ -243,6 +330,91 @@ def test_container(id_container: str, id_test: str):
     return (jsn, 200)
 
 
+@app.route('/containers/<id_container>/tests', methods=['POST'])
+@throws_errors
+def run_tests_container(id_container: str):
+    try:
+        container = daemon.containers[id_container]
+    except KeyError:
+        return ContainerNotFound(id_container), 404
+
+    try:
+        bug = daemon.bugs[container.bug]
+    except KeyError:
+        return BugNotFound(container.bug), 500
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    workers = args.get('workers')
+    stop_on_failure = args.get('stop-on-failure', False)
+    stop_on_unexpected = args.get('stop-on-unexpected', False)
+    fitness_threshold = args.get('fitness-threshold')
+    order = args.get('order', 'given')
+    batch_size = args.get('batch-size')
+    streaming = args.get('stream', True)
+    assert workers is None or isinstance(workers, int)
+    assert isinstance(stop_on_failure, bool)
+    assert isinstance(stop_on_unexpected, bool)
+    assert fitness_threshold is None or isinstance(fitness_threshold, int)
+    assert batch_size is None or (isinstance(batch_size, int) and batch_size > 0)  # noqa: pycodestyle
+    assert order in ('given', 'longest-first', 'shortest-first', 'priority')
+    assert isinstance(streaming, bool)
+    if 'tests' in args:
+        try:
+            tests = [bug.harness[name] for name in args['tests']]
+        except KeyError as err:
+            return TestNotFound(err.args[0]), 404
+    else:
+        tests = list(bug.harness)
+
+    # tests are started in the given order; the order of the tests can also
+    # be based on their recent executions.
+    if order == 'priority':
+        tests = daemon.scheduler.prioritize(bug, tests)
+    elif order != 'given':
+        tests = daemon.scheduler.order(bug, tests)
+        if order == 'shortest-first':
+            tests.reverse()
+
+    def results() -> Iterator[Dict[str, Any]]:
+        outcomes = daemon.containers.run_tests(container,
+                                               tests,
+                                               workers=workers,
+                                               stop_on_failure=stop_on_failure,  # noqa: pycodestyle
+                                               stop_on_unexpected=stop_on_unexpected,  # noqa: pycodestyle
+                                               fitness_threshold=fitness_threshold,  # noqa: pycodestyle
+                                               batch_size=batch_size)
+        for (test, outcome) in outcomes:
+            yield {'test': test.to_dict(), 'outcome': outcome.to_dict()}
+
+    if not streaming:
+        try:
+            jsn = flask.jsonify(list(results()))
+        except BugZooException as err:
+            return err, 500
+        except Exception as err:
+            logger.exception("failed to run tests in container: %s",
+                             container.uid)
+            return UnexpectedServerError.from_exception(err), 500
+        return (jsn, 200)
+
+    # the outcome of each test is written as a line of JSON as soon as the
+    # test has finished. since the status code has already been sent, errors
+    # are reported in-band.
+    def stream() -> Iterator[str]:
+        try:
+            for jsn in results():
+                yield json.dumps(jsn) + '\n'
+        except BugZooException as err:
+            yield json.dumps(err.to_dict()) + '\n'
+        except Exception as err:
+            logger.exception("failed to run tests in container: %s",
+                             container.uid)
+            err = UnexpectedServerError.from_exception(err)
+            yield json.dumps(err.to_dict()) + '\n'
+
+    return flask.Response(stream(), mimetype='application/x-ndjson'), 200
+
+
 @app.route('/containers/<uid>/instrument', methods=['POST'])
 @throws_errors
 def instrument_container(uid: str):
@@ -271,8 +443,9 @@ def read_coverage(uid: str):
         logger.exception("failed to read coverage for container (%s): container not found.")  # noqa: pycodestyle
         return ContainerNotFound(uid), 404
 
+    reset = flask.request.args.get('reset', 'yes') == 'yes'
     try:
-        lines = mgr_cov.extract(container)
+        lines = mgr_cov.extract(container, reset=reset)
         logger.debug("read coverage for container (%s).",
                      container.uid)
     except Exception:
@@ -283,6 +456,20 @@ def read_coverage(uid: str):
     return (jsn, 200)
 
 
+@app.route('/containers/<uid>/reset-coverage', methods=['POST'])
+@throws_errors
+def reset_coverage(uid: str):
+    mgr_ctr = daemon.containers  # type: ContainerManager
+    mgr_cov = daemon.coverage  # type: CoverageManager
+    try:
+        container = mgr_ctr[uid]
+    except KeyError:
+        return ContainerNotFound(uid), 404
+
+    mgr_cov.reset_counters(container)
+    return ('', 204)
+
+
 @app.route('/containers/<id_container>/coverage', methods=['POST'])
 @throws_errors
 def coverage_container(id_container: str):
@@ -304,6 +491,15 @@ def coverage_container(id_container: str):
     else:
         logger.debug("skipping instrumentation step")
 
+    if asynchronous():
+        def compute(job: Job) -> Dict[str, Any]:
+            progress = lambda i, n: job.report(i / n if n else 1.0, "computed coverage for {} of {} tests".format(i, n))  # noqa: pycodestyle
+            coverage = daemon.coverage.coverage(container,
+                                                instrument=instrument,
+                                                progress=progress)
+            return coverage.to_dict()
+        return accepted(daemon.jobs.submit('coverage-container', compute))
+
     try:
         coverage = daemon.coverage.coverage(container,
                                             instrument=instrument)
@@ -316,6 +512,18 @@ def coverage_container(id_container: str):
     return (jsn, 200)
 
 
+@app.route('/bugs/<uid>/history', methods=['GET'])
+@throws_errors
+def history_bug(uid: str):
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+
+    jsn = flask.jsonify(daemon.history.test_stats(bug.name))
+    return (jsn, 200)
+
+
 @app.route('/bugs/<uid>/installed', methods=['GET'])
 @throws_errors
 def is_installed_bug(uid: str):
@@ -339,10 +547,38 @@ def interact_with_file(id_container: str, filepath: str):
     if flask.request.method == 'GET':
         try:
             return daemon.files.read(container, filepath)
-        except KeyError:
+        except (KeyError, FileNotFound):
             return FileNotFound(filepath), 404
 
 
+@app.route('/files/<id_container>', methods=['POST', 'PUT'])
+@throws_errors
+def interact_with_files(id_container: str):
+    try:
+        container = daemon.containers[id_container]
+    except KeyError:
+        return ContainerNotFound(id_container), 404
+
+    # reads the contents of a list of files
+    if flask.request.method == 'POST':
+        filepaths = flask.request.get_json()
+        assert isinstance(filepaths, list)
+        assert all(isinstance(fn, str) for fn in filepaths)
+        try:
+            contents = daemon.files.read_many(container, filepaths)
+        except FileNotFound as err:
+            return err, 404
+        return flask.jsonify(contents), 200
+
+    # writes the contents of a set of files
+    if flask.request.method == 'PUT':
+        files = flask.request.get_json()
+        assert isinstance(files, dict)
+        assert all(isinstance(c, str) for c in files.values())
+        daemon.files.write_many(container, files)
+        return '', 204
+
+
 @app.route('/containers', methods=['GET'])
 def list_containers():
     jsn = []
@@ -380,6 +616,59 @@ def interact_with_container(uid: str):
             return '', 400
 
 
+@app.route('/containers/<uid>/reset', methods=['POST'])
+@throws_errors
+def reset_container(uid: str):
+    build_outputs = \
+        flask.request.args.get('build-outputs', default='no', type=str) == 'yes'  # noqa: pycodestyle
+    mgr_ctr = daemon.containers  # type: ContainerManager
+    try:
+        container = mgr_ctr[uid]
+    except KeyError:
+        return ContainerNotFound(uid), 404
+
+    logger.debug("resetting container: %s", container.uid)
+    try:
+        mgr_ctr.reset(container, build_outputs=build_outputs)
+    except FailedToResetContainer as err:
+        return err, 500
+    logger.debug("reset container: %s", container.uid)
+    return ('', 204)
+
+
+@app.route('/containers/<uid>/clone', methods=['POST'])
+@throws_errors
+def clone_container(uid: str):
+    mgr_ctr = daemon.containers  # type: ContainerManager
+    try:
+        container = mgr_ctr[uid]
+    except KeyError:
+        return ContainerNotFound(uid), 404
+
+    args = flask.request.get_json() or {}  # type: Dict[str, Any]
+    if 'n' not in args:
+        return ArgumentNotSpecified("n"), 400
+    n = args['n']
+    workers = args.get('workers')
+    assert isinstance(n, int)
+    assert workers is None or isinstance(workers, int)
+
+    # each copy is written as a line of JSON as soon as it is ready. since
+    # the status code has already been sent, errors are reported in-band.
+    def stream() -> Iterator[str]:
+        try:
+            for clone in mgr_ctr.clone(container, n, workers=workers):
+                yield json.dumps(clone.to_dict()) + '\n'
+        except BugZooException as err:
+            yield json.dumps(err.to_dict()) + '\n'
+        except Exception as err:
+            logger.exception("failed to clone container: %s", uid)
+            err = UnexpectedServerError.from_exception(err)
+            yield json.dumps(err.to_dict()) + '\n'
+
+    return flask.Response(stream(), mimetype='application/x-ndjson'), 200
+
+
 @app.route('/containers/<uid>/persist/<path:name_image>', methods=['PUT'])
 @throws_errors
 def persist(uid: str, name_image: str):
@@ -435,6 +724,13 @@ def build_container(uid: str):
     except KeyError:
         return ContainerNotFound(uid), 404
 
+    if asynchronous():
+        def build(job: Job) -> Dict[str, Any]:
+            job.report(message="building project")
+            return mgr_ctr.compile(container, verbose=verbose).to_dict()
+        return accepted(daemon.jobs.submit('build-container', build,
+                                           cancellable=False))
+
     logger.debug("building project in container: %s", container.uid)
     outcome = mgr_ctr.compile(container, verbose=verbose)
     logger.debug("built project in container: %s", container.uid)
@@ -513,6 +809,161 @@ def provision_container():
     return (flask.jsonify(c.uid), 201)
 
 
+@app.route('/pool', methods=['GET'])
+def pool_stats():
+    """
+    Produces a summary of the configuration and hit/miss statistics of the
+    pool of warm containers.
+    """
+    jsn = flask.jsonify(daemon.containers.pool.stats())
+    return (jsn, 200)
+
+
+@app.route('/pool/<path:uid>', methods=['POST', 'DELETE'])
+@throws_errors
+def interact_with_pool(uid: str):
+    try:
+        bug = daemon.bugs[uid]
+    except KeyError:
+        return BugNotFound(uid), 404
+
+    if flask.request.method == 'POST':
+        if not daemon.bugs.is_installed(bug):
+            return ImageNotInstalled(bug.image), 400
+        daemon.containers.pool.warm(bug)
+        return '', 202
+
+    if flask.request.method == 'DELETE':
+        daemon.containers.pool.evict(bug.name)
+        return '', 204
+
+
+@app.route('/test-stats', methods=['GET'])
+def test_stats():
+    """
+    Produces a summary of the number of tests that have been executed, the
+    number of test outcomes that were obtained from the cache, and the
+    number of test executions that were saved by early termination.
+    """
+    jsn = flask.jsonify(daemon.containers.test_stats())
+    return (jsn, 200)
+
+
+@app.route('/history', methods=['GET'])
+def history_stats():
+    """
+    Produces aggregate statistics over all of the test executions that have
+    been recorded by the history manager.
+    """
+    jsn = flask.jsonify(daemon.history.stats())
+    return (jsn, 200)
+
+
+@app.route('/outcome-cache', methods=['GET', 'DELETE'])
+def interact_with_outcome_cache():
+    """
+    Produces a summary of the configuration and hit/miss statistics of the
+    test outcome cache, or clears the cache.
+    """
+    cache = daemon.containers.outcome_cache
+    if flask.request.method == 'DELETE':
+        cache.clear()
+        return '', 204
+    jsn = flask.jsonify(cache.stats())
+    return (jsn, 200)
+
+
+@app.route('/coverage-cache', methods=['GET'])
+def coverage_cache_stats():
+    """
+    Produces a summary of the contents of the coverage cache, describing
+    each of its entries and whether it is stale.
+    """
+    jsn = flask.jsonify(daemon.bugs.coverage_cache.stats())
+    return (jsn, 200)
+
+
+@app.route('/coverage-cache/prune', methods=['POST'])
+def prune_coverage_cache():
+    """
+    Removes all stale entries from the coverage cache, and produces a
+    description of each removed entry.
+    """
+    jsn = flask.jsonify(daemon.bugs.coverage_cache.prune())
+    return (jsn, 200)
+
+
+@app.route('/coverage-cache/evict', methods=['POST'])
+@throws_errors
+def evict_coverage_cache():
+    """
+    Removes the least recently used entries from the coverage cache until it
+    occupies no more than `max-size` bytes, and produces a description of
+    each removed entry.
+    """
+    max_size = flask.request.args.get('max-size', type=int)
+    if max_size is None or max_size < 0:
+        return ArgumentNotSpecified("max-size"), 400
+    jsn = flask.jsonify(daemon.bugs.coverage_cache.evict(max_size))
+    return (jsn, 200)
+
+
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    jsn = [job.id for job in daemon.jobs]  # type: List[str]
+    return (flask.jsonify(jsn), 200)
+
+
+@app.route('/jobs/<id_job>', methods=['GET', 'DELETE'])
+@throws_errors
+def interact_with_job(id_job: str):
+    """
+    Produces the status of a given job, or requests its cancellation. If a
+    `wait` parameter is given, the status is produced once the job has
+    finished or that many seconds have passed, whichever happens first.
+    Requests to cancel a running job that cannot be cancelled are rejected.
+    """
+    try:
+        job = daemon.jobs[id_job]
+    except JobNotFound as err:
+        return err, 404
+
+    if flask.request.method == 'DELETE':
+        try:
+            cancelled = daemon.jobs.cancel(job.id)
+        except JobNotCancellable as err:
+            return err, 409
+        if cancelled:
+            return '', 202
+        return '', 204
+
+    wait = flask.request.args.get('wait', default=0.0, type=float)
+    if wait > 0:
+        job.wait(min(wait, MAX_JOB_WAIT))
+    jsn = flask.jsonify(job.status().to_dict())
+    return (jsn, 200)
+
+
+@app.route('/jobs/<id_job>/result', methods=['GET'])
+@throws_errors
+def job_result(id_job: str):
+    try:
+        job = daemon.jobs[id_job]
+    except JobNotFound as err:
+        return err, 404
+
+    if not job.done:
+        return JobNotFinished(job.id), 409
+
+    error = job.error
+    if error is not None:
+        job_err = BugZooException.from_dict(error)
+        status = 409 if isinstance(job_err, JobCancelled) else 500
+        return job_err, status
+
+    return (flask.jsonify(job.result), 200)
+
+
 @app.route('/docker/images/<path:name>', methods=['DELETE'])
 @throws_errors
 def docker_images(name: str):
@@ -528,7 +979,19 @@ def run(*,
     host: str = '0.0.0.0',
     debug: bool = True,
     log_filename: Optional[str] = None,
-    log_level: str = 'info'
+    log_level: str = 'info',
+    pool_size: int = 0,
+    pool_max_size: Optional[int] = None,
+    pool_max_idle: Optional[float] = None,
+    shell_sessions: bool = False,
+    outcome_cache: bool = False,
+    outcome_cache_size: Optional[int] = None,
+    outcome_cache_path: Optional[str] = None,
+    adaptive_time_limits: bool = False,
+    time_limit_percentile: Optional[float] = None,
+    time_limit_multiplier: Optional[float] = None,
+    time_limit_floor: Optional[float] = None,
+    coverage_cache_max_size: Optional[int] = None
     ) -> None:
     global daemon, log_to_file
 
@@ -583,6 +1046,18 @@ def run(*,
     try:
         logger.info("launching BugZoo daemon")
         daemon = BugZoo()
+        daemon.containers.pool.configure(size=pool_size,
+                                         max_size=pool_max_size,
+                                         max_idle=pool_max_idle)
+        daemon.containers.use_sessions = shell_sessions
+        daemon.containers.outcome_cache.configure(enabled=outcome_cache,
+                                                  max_size=outcome_cache_size,
+                                                  path=outcome_cache_path)
+        daemon.containers.configure_time_limits(enabled=adaptive_time_limits,
+                                                percentile=time_limit_percentile,  # noqa: pycodestyle
+                                                multiplier=time_limit_multiplier,  # noqa: pycodestyle
+                                                floor=time_limit_floor)
+        daemon.bugs.coverage_cache.configure(max_size=coverage_cache_max_size)  # noqa: pycodestyle
         logger.info("launched BugZoo daemon")
         report_resource_limits(logger)
         report_system_resources(logger)
@@ -618,9 +1093,58 @@ def main() -> None:
     parser.add_argument('--debug',
                         action='store_true',
                         help='enables debugging mode.')
+    parser.add_argument('--pool-size',
+                        type=int,
+                        default=0,
+                        help='the number of warm containers that should be kept for each bug.')  # noqa: pycodestyle
+    parser.add_argument('--pool-max-size',
+                        type=int,
+                        help='the maximum number of warm containers that may be kept across all bugs.')  # noqa: pycodestyle
+    parser.add_argument('--pool-max-idle',
+                        type=float,
+                        help='the number of seconds after which the warm containers for an unused bug are destroyed.')  # noqa: pycodestyle
+    parser.add_argument('--shell-sessions',
+                        action='store_true',
+                        help='executes commands using a long-lived shell inside each container.')  # noqa: pycodestyle
+    parser.add_argument('--outcome-cache',
+                        action='store_true',
+                        help='reuses the outcomes of tests that have already been executed against the same source code.')  # noqa: pycodestyle
+    parser.add_argument('--outcome-cache-size',
+                        type=int,
+                        help='the maximum number of test outcomes that may be cached in memory.')  # noqa: pycodestyle
+    parser.add_argument('--outcome-cache-path',
+                        type=str,
+                        help='the path to an SQLite database that should be used to store cached test outcomes.')  # noqa: pycodestyle
+    parser.add_argument('--adaptive-time-limits',
+                        action='store_true',
+                        help='executes tests using time limits that are learned from their previous executions.')  # noqa: pycodestyle
+    parser.add_argument('--time-limit-percentile',
+                        type=float,
+                        help='the percentile of previous test durations that is used to compute adaptive time limits.')  # noqa: pycodestyle
+    parser.add_argument('--time-limit-multiplier',
+                        type=float,
+                        help='the multiplier that is applied to previous test durations to compute adaptive time limits.')  # noqa: pycodestyle
+    parser.add_argument('--time-limit-floor',
+                        type=float,
+                        help='the minimum adaptive time limit, in seconds.')  # noqa: pycodestyle
+    parser.add_argument('--coverage-cache-max-size',
+                        type=int,
+                        help='the maximum number of bytes that may be occupied by cached coverage. If exceeded, the least recently used coverage is evicted.')  # noqa: pycodestyle
     args = parser.parse_args()
     run(port=args.port,
         host=args.host,
         log_filename=args.log_file,
         log_level=args.log_level,
-        debug=args.debug)
+        debug=args.debug,
+        pool_size=args.pool_size,
+        pool_max_size=args.pool_max_size,
+        pool_max_idle=args.pool_max_idle,
+        shell_sessions=args.shell_sessions,
+        outcome_cache=args.outcome_cache,
+        outcome_cache_size=args.outcome_cache_size,
+        outcome_cache_path=args.outcome_cache_path,
+        adaptive_time_limits=args.adaptive_time_limits,
+        time_limit_percentile=args.time_limit_percentile,
+        time_limit_multiplier=args.time_limit_multiplier,
+        time_limit_floor=args.time_limit_floor,
+        coverage_cache_max_size=args.coverage_cache_max_size)
@@ -0,0 +1,124 @@
+import socket
+import struct
+import subprocess
+import threading
+import unittest
+from types import SimpleNamespace
+
+import attr
+
+from bugzoo.core.container import Container
+from bugzoo.core.test import TestSuite
+from bugzoo.mgr.batch import build_driver, parse_driver_output
+from bugzoo.mgr.container import ContainerManager
+from bugzoo.mgr.history import HistoryManager
+
+
+class LocalDockerAPI(object):
+    """
+    Executes commands that read their input from an attached socket using
+    a local shell, and writes their output back to the socket as a sequence
+    of multiplexed frames.
+    """
+    def __init__(self) -> None:
+        self.execs = []
+        self.codes = {}
+
+    def ping(self) -> bool:
+        return True
+
+    def exec_create(self, id_container, cmd, **kwargs):
+        self.execs.append((cmd, kwargs))
+        return {'Id': str(len(self.execs))}
+
+    def exec_start(self, exec_id, **kwargs):
+        assert kwargs.get('socket')
+        (ours, theirs) = socket.socketpair()
+        (cmd, _) = self.execs[int(exec_id) - 1]
+
+        def run() -> None:
+            script = b''
+            while True:
+                chunk = theirs.recv(4096)
+                if not chunk:
+                    break
+                script += chunk
+            # the environment file only exists inside BugZoo containers
+            script = script.replace(b'source /.environment', b'true')
+            result = subprocess.run(cmd, input=script, stdout=subprocess.PIPE)
+            self.codes[exec_id] = result.returncode
+            for i in range(0, len(result.stdout), 100):
+                frame = result.stdout[i:i + 100]
+                theirs.sendall(struct.pack('>BxxxL', 1, len(frame)) + frame)
+            theirs.close()
+
+        threading.Thread(target=run).start()
+        return ours
+
+    def exec_inspect(self, exec_id):
+        return {'ExitCode': self.codes[exec_id]}
+
+
+class BatchDriverTestCase(unittest.TestCase):
+    def test_parse(self):
+        output = '\r\n'.join([
+            'some unrelated output',
+            '@@bugzoo-test 0 1 1500000000 aGVsbG8K',
+            '@@bugzoo-test 2 0 250000000 ',
+            '@@bugzoo-test 3 garbage'])
+        responses = parse_driver_output(output)
+        self.assertEqual(set(responses), {0, 2})
+        self.assertEqual(responses[0].code, 1)
+        self.assertEqual(responses[0].duration, 1.5)
+        self.assertEqual(responses[0].output, 'hello')
+        self.assertEqual(responses[2].output, '')
+
+    def test_driver(self):
+        test = TestSuite.from_dict({'tests': ['p1']})['p1']
+        tests = [
+            (attr.evolve(test, command="echo \"it's\" $PWD; exit 3", context='/tmp'), 10),  # noqa: pycodestyle
+            (attr.evolve(test, command='sleep 5', context='/'), 1)]
+        # the environment file only exists inside BugZoo containers
+        driver = build_driver(tests).replace(b'source /.environment', b'true')
+        output = subprocess.run(['bash', '-s'],
+                                input=driver,
+                                stdout=subprocess.PIPE).stdout.decode('utf-8')
+        responses = parse_driver_output(output)
+        self.assertEqual(responses[0].code, 3)
+        self.assertEqual(responses[0].output, "it's /tmp")
+        self.assertEqual(responses[1].code, 124)
+
+
+class ExecuteManyTestCase(unittest.TestCase):
+    def test_single_exec(self):
+        suite = TestSuite.from_dict({
+            'context': '/tmp',
+            'tests': [{'name': 'p1', 'command': 'echo hello'},
+                      {'name': 'n1', 'command': 'pwd; exit 1'},
+                      {'name': 'p2', 'command': 'read x || exit 0'}]})
+        tests = [suite[name] for name in ('p1', 'n1', 'p2')]
+        bug = SimpleNamespace(name='bug',
+                              image='bug',
+                              source_dir='/experiment/source',
+                              harness=suite)
+        api = LocalDockerAPI()
+        images = SimpleNamespace(get=lambda name: SimpleNamespace(id=name))
+        installation = SimpleNamespace(
+            bugs={'bug': bug},
+            docker=SimpleNamespace(api=api, images=images),
+            history=HistoryManager())
+        mgr = ContainerManager(installation)
+        container = Container(bug='bug', uid='c1', tools=[])
+
+        outcomes = mgr.execute_many(container, tests, use_cache=False)
+        self.assertEqual([o.passed for o in outcomes], [True, False, True])
+        self.assertEqual(outcomes[0].response.output, 'hello')
+        self.assertEqual(outcomes[1].response.output, '/tmp')
+        self.assertEqual(len(api.execs), 1)
+        (cmd, kwargs) = api.execs[0]
+        self.assertEqual(cmd, ['/bin/bash', '-s'])
+        self.assertTrue(kwargs['stdin'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.container import Container
+from bugzoo.core.fileline import FileLineSet
+from bugzoo.core.test import TestOutcome, TestSuite
+from bugzoo.mgr.cache import TestOutcomeCache
+from bugzoo.mgr.container import ContainerManager
+from bugzoo.mgr.coverage import CoverageManager
+
+
+class TestOutcomeCacheTestCase(unittest.TestCase):
+    def outcome(self, code: int) -> TestOutcome:
+        return TestOutcome(ExecResponse(code, 1.0, 'output'), code == 0)
+
+    def test_lru_eviction(self):
+        cache = TestOutcomeCache(enabled=True, max_size=2)
+        cache.put('a', self.outcome(0))
+        cache.put('b', self.outcome(1))
+        self.assertEqual(cache.get('a').to_dict(), self.outcome(0).to_dict())
+        cache.put('c', self.outcome(0))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('c'))
+
+        stats = cache.stats()
+        self.assertEqual(stats['hits'], 3)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['evictions'], 1)
+
+    def test_disk(self):
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'outcomes.db')
+            cache = TestOutcomeCache(enabled=True, path=fn, max_disk_size=2)
+            cache.put('a', self.outcome(0))
+            cache.put('b', self.outcome(1))
+            cache.put('a', self.outcome(0))
+            cache.put('c', self.outcome(2))
+            self.assertEqual(cache.stats()['disk-size'], 2)
+
+            cache = TestOutcomeCache(enabled=True, path=fn)
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual(cache.get('a').to_dict(), self.outcome(0).to_dict())
+            self.assertEqual(cache.get('c').to_dict(), self.outcome(2).to_dict())
+
+
+class FakeDockerAPI(object):
+    """
+    Executes commands successfully, without producing any output.
+    """
+    def __init__(self) -> None:
+        self.commands = []
+
+    def ping(self) -> bool:
+        return True
+
+    def exec_create(self, id_container, cmd, **kwargs):
+        self.commands.append(cmd)
+        return {'Id': str(len(self.commands))}
+
+    def exec_start(self, exec_id, **kwargs):
+        return iter([])
+
+    def exec_inspect(self, exec_id):
+        return {'ExitCode': 0}
+
+
+class CoverageWithCachedOutcomesTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tests = list(TestSuite.from_dict({'tests': ['p1', 'p2']}))
+        bug = SimpleNamespace(name='bug',
+                              image='bug',
+                              source_dir='/experiment/source')
+        history = SimpleNamespace(record=lambda *args, **kwargs: None)
+        self.api = FakeDockerAPI()
+        images = SimpleNamespace(get=lambda name: SimpleNamespace(id=name))
+        docker = SimpleNamespace(api=self.api, images=images)
+        installation = SimpleNamespace(bugs={'bug': bug},
+                                       docker=docker,
+                                       history=history)
+        installation.containers = ContainerManager(installation)
+        installation.containers.outcome_cache.configure(enabled=True)
+        self.container = Container(bug='bug', uid='c1', tools=[])
+
+        # the coverage for each test is given by the commands that were
+        # executed since the counters were last reset
+        self.mgr_cov = CoverageManager(installation)
+        self.resets = 0
+
+        def reset_counters(container):
+            self.resets += 1
+            self.api.commands.clear()
+
+        def extract(container, *, reset=True, **kwargs):
+            lines = FileLineSet.from_dict({c: [1] for c in self.api.commands})
+            if reset:
+                self.api.commands.clear()
+            return lines
+
+        self.mgr_cov.reset_counters = reset_counters
+        self.mgr_cov.extract = extract
+
+    def test_tests_are_executed(self):
+        for test in self.tests:
+            self.mgr_cov.coverage(self.container, [test], instrument=False)
+
+        # the outcomes of both tests are now cached
+        coverage = self.mgr_cov.coverage(self.container,
+                                         self.tests,
+                                         instrument=False)
+        for test in self.tests:
+            (cmd,) = coverage[test.name].lines.files
+            self.assertIn(test.command, cmd)
+
+        # the counters are reset separately only once per computation
+        self.assertEqual(self.resets, 3)
+
+
+class FingerprintTestCase(unittest.TestCase):
+    def setUp(self):
+        (self.test,) = TestSuite.from_dict({'tests': ['p1']})
+        bug = SimpleNamespace(name='bug',
+                              image='bug',
+                              source_dir='/experiment/source')
+        history = SimpleNamespace(record=lambda *args, **kwargs: None)
+        self.api = FakeDockerAPI()
+        images = SimpleNamespace(get=lambda name: SimpleNamespace(id=name))
+        docker = SimpleNamespace(api=self.api, images=images)
+        installation = SimpleNamespace(bugs={'bug': bug},
+                                       docker=docker,
+                                       history=history)
+        self.mgr = ContainerManager(installation)
+        self.mgr.outcome_cache.configure(enabled=True)
+        self.container = Container(bug='bug', uid='c1', tools=[])
+
+    def test_invalidated_by_command(self):
+        fingerprint = self.mgr.fingerprint(self.container)
+        self.mgr.execute(self.container, self.test)
+        self.mgr.execute(self.container, self.test)
+        self.assertEqual(len(self.api.commands), 1)
+        self.assertEqual(self.mgr.fingerprint(self.container), fingerprint)
+
+        # commands whose effects are unknown invalidate the fingerprint
+        self.mgr.command(self.container, 'touch foo.c')
+        self.assertNotEqual(self.mgr.fingerprint(self.container), fingerprint)
+        self.mgr.execute(self.container, self.test)
+        self.assertEqual(len(self.api.commands), 3)
+
+        self.mgr.command(self.container, 'ls', modifies_source=False)
+        self.mgr.execute(self.container, self.test)
+        self.assertEqual(len(self.api.commands), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+from types import SimpleNamespace
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.container import Container
+from bugzoo.core.test import TestOutcome, TestSuite
+from bugzoo.mgr.container import ContainerManager
+from bugzoo.mgr.history import HistoryManager
+from bugzoo.mgr.scheduler import TestScheduler
+
+
+class FakeDockerAPI(object):
+    """
+    Executes the commands for tests, each of which exits with a given code.
+    """
+    def __init__(self, codes) -> None:
+        self.codes = codes
+        self.executed = []
+        self.__execs = {}
+
+    def ping(self) -> bool:
+        return True
+
+    def exec_create(self, id_container, cmd, **kwargs):
+        exec_id = str(len(self.__execs))
+        for (name, code) in self.codes.items():
+            if "./test.sh {}'".format(name) in cmd:
+                self.executed.append(name)
+                break
+        else:
+            code = 0
+        self.__execs[exec_id] = code
+        return {'Id': exec_id}
+
+    def exec_start(self, exec_id, **kwargs):
+        return iter([])
+
+    def exec_inspect(self, exec_id):
+        return {'ExitCode': self.__execs[exec_id]}
+
+
+class RunTestsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.suite = TestSuite.from_dict({
+            'tests': [{'name': 'a', 'expected-outcome': True},
+                      {'name': 'b', 'expected-outcome': False},
+                      {'name': 'c', 'expected-outcome': True},
+                      {'name': 'd', 'expected-outcome': True}]})
+        self.tests = [self.suite[name] for name in ('a', 'b', 'c', 'd')]
+        self.bug = SimpleNamespace(name='bug',
+                                   image='bug',
+                                   source_dir='/experiment/source',
+                                   harness=self.suite)
+        self.container = Container(bug='bug', uid='c1', tools=[])
+
+    def manager(self, codes):
+        self.api = FakeDockerAPI(codes)
+        self.history = HistoryManager()
+        images = SimpleNamespace(get=lambda name: SimpleNamespace(id=name))
+        installation = SimpleNamespace(
+            bugs={'bug': self.bug},
+            docker=SimpleNamespace(api=self.api, images=images),
+            history=self.history)
+        installation.containers = ContainerManager(installation)
+        self.scheduler = TestScheduler(installation)
+        return installation.containers
+
+    def run_tests(self, mgr, tests=None, **kwargs):
+        if tests is None:
+            tests = self.tests
+        results = mgr.run_tests(self.container, tests, **kwargs)
+        return [(test.name, outcome.passed) for (test, outcome) in results]
+
+    def assertSkipped(self, mgr, names):
+        self.assertEqual(mgr.test_stats()['saved'], len(names))
+        for name in names:
+            self.assertNotIn(name, self.api.executed)
+            test = self.suite[name]
+            self.assertEqual(self.history.num_executions(self.bug, test), 0)
+
+    def test_no_early_stop(self):
+        mgr = self.manager({'a': 0, 'b': 1, 'c': 1, 'd': 0})
+        self.assertEqual(self.run_tests(mgr),
+                         [('a', True), ('b', False), ('c', False), ('d', True)])  # noqa: pycodestyle
+        self.assertSkipped(mgr, [])
+        self.assertEqual(mgr.test_stats()['executed'], 4)
+
+    def test_stop_on_failure(self):
+        mgr = self.manager({'a': 0, 'b': 1, 'c': 0, 'd': 0})
+        self.assertEqual(self.run_tests(mgr, stop_on_failure=True),
+                         [('a', True), ('b', False)])
+        self.assertSkipped(mgr, ['c', 'd'])
+        self.assertEqual(mgr.test_stats()['executed'], 2)
+
+    def test_stop_on_unexpected(self):
+        # b is expected to fail
+        mgr = self.manager({'a': 0, 'b': 1, 'c': 1, 'd': 0})
+        self.assertEqual(self.run_tests(mgr, stop_on_unexpected=True),
+                         [('a', True), ('b', False), ('c', False)])
+        self.assertSkipped(mgr, ['d'])
+
+    def test_fitness_threshold(self):
+        mgr = self.manager({'a': 0, 'b': 1, 'c': 1, 'd': 0})
+        self.assertEqual(self.run_tests(mgr, fitness_threshold=2),
+                         [('a', True), ('b', False), ('c', False), ('d', True)])  # noqa: pycodestyle
+        self.assertSkipped(mgr, [])
+
+        # once c fails, at most two tests can pass
+        mgr = self.manager({'a': 0, 'b': 1, 'c': 1, 'd': 0})
+        self.assertEqual(self.run_tests(mgr, fitness_threshold=3),
+                         [('a', True), ('b', False), ('c', False)])
+        self.assertSkipped(mgr, ['d'])
+
+    def test_priority_order(self):
+        mgr = self.manager({'a': 0, 'b': 0, 'c': 1, 'd': 0})
+        for name in ('a', 'b', 'c', 'd'):
+            passed = name != 'c'
+            outcome = TestOutcome(ExecResponse(0, 1.0, ''), passed)
+            self.history.record(self.bug, self.suite[name], outcome)
+
+        # the test that is most likely to fail is executed first
+        tests = self.scheduler.prioritize(self.bug, self.tests)
+        self.assertEqual(tests[0].name, 'c')
+        self.assertEqual(self.run_tests(mgr, tests, stop_on_failure=True),
+                         [('c', False)])
+        self.assertEqual(mgr.test_stats()['saved'], 3)
+        self.assertEqual(self.api.executed, ['c'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.coverage import TestCoverage, TestSuiteCoverage
+from bugzoo.core.fileline import FileLine, FileLineSet
+from bugzoo.core.test import TestOutcome
+
+
+def coverage(test, passed, lines):
+    outcome = TestOutcome(ExecResponse(0 if passed else 1, 1.0, ''), passed)
+    return TestCoverage(test, outcome, FileLineSet.from_dict(lines))
+
+
+class TestSuiteCoverageTestCase(unittest.TestCase):
+    def setUp(self):
+        self.coverage = TestSuiteCoverage({
+            'p1': coverage('p1', True, {'a.c': [1, 2, 3], 'b.c': [1]}),
+            'p2': coverage('p2', True, {'a.c': [3, 4]}),
+            'n1': coverage('n1', False, {'a.c': [2, 4], 'c.c': [7]})
+        })
+
+    def test_tests(self):
+        self.assertEqual(list(self.coverage), ['p1', 'p2', 'n1'])
+        self.assertEqual(len(self.coverage), 3)
+        self.assertIn('n1', self.coverage)
+        self.assertNotIn('n2', self.coverage)
+        self.assertEqual(self.coverage['p2'].lines.to_dict(), {'a.c': [3, 4]})
+        self.assertFalse(self.coverage['n1'].outcome.passed)
+        with self.assertRaises(KeyError):
+            self.coverage['n2']
+
+    def test_covering_tests(self):
+        self.assertEqual(self.coverage.covering_tests(FileLine('a.c', 4)),
+                         {'p2', 'n1'})
+        self.assertEqual(self.coverage.covering_tests(FileLine('a.c', 9)),
+                         set())
+
+    def test_covering_tests_many(self):
+        lines = [FileLine('a.c', 1), FileLine('c.c', 7), FileLine('d.c', 1)]
+        self.assertEqual(self.coverage.covering_tests_many(lines),
+                         {FileLine('a.c', 1): {'p1'},
+                          FileLine('c.c', 7): {'n1'},
+                          FileLine('d.c', 1): set()})
+        self.assertEqual(self.coverage.covering_tests_many(lines, union=True),
+                         {'p1', 'n1'})
+        self.assertEqual(self.coverage.passing.covering_tests_many(lines),
+                         {FileLine('a.c', 1): {'p1'},
+                          FileLine('c.c', 7): set(),
+                          FileLine('d.c', 1): set()})
+
+    def test_passing_failing(self):
+        self.assertEqual(list(self.coverage.passing), ['p1', 'p2'])
+        self.assertEqual(list(self.coverage.failing), ['n1'])
+        self.assertEqual(self.coverage.failing.lines.to_dict(),
+                         {'a.c': [2, 4], 'c.c': [7]})
+        self.assertEqual(len(self.coverage.passing.failing), 0)
+
+    def test_lines(self):
+        lines = self.coverage.lines
+        self.assertEqual(len(lines), 6)
+        self.assertIn(FileLine('c.c', 7), lines)
+
+    def test_restricted_to_files(self):
+        restricted = self.coverage.restricted_to_files(['b.c', 'c.c'])
+        self.assertEqual(set(restricted.lines),
+                         {FileLine('b.c', 1), FileLine('c.c', 7)})
+        self.assertEqual(len(restricted['p2'].lines), 0)
+
+    def test_to_dict(self):
+        d = self.coverage.to_dict()
+        self.assertEqual(TestSuiteCoverage.from_dict(d).to_dict(), d)
+
+
+if __name__ == '__main__':
+    unittest.main()
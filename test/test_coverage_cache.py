@@ -0,0 +1,171 @@
+import os
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+
+import docker
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.bug import Bug
+from bugzoo.core.coverage import TestCoverage, TestSuiteCoverage
+from bugzoo.core.fileline import FileLineSet
+from bugzoo.core.test import TestOutcome
+from bugzoo.mgr.coverage_cache import CoverageCache
+
+
+class Images(object):
+    def __init__(self) -> None:
+        self.ids = {}
+
+    def get(self, name: str):
+        try:
+            return SimpleNamespace(id=self.ids[name])
+        except KeyError:
+            raise docker.errors.ImageNotFound(name)
+
+
+class CoverageCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        d = tempfile.TemporaryDirectory()
+        self.addCleanup(d.cleanup)
+        self.images = Images()
+        self.bugs = {}
+        self.installation = SimpleNamespace(
+            coverage_path=d.name,
+            docker=SimpleNamespace(images=self.images),
+            bugs=self.bugs)
+        self.cache = CoverageCache(self.installation)
+
+    def bug(self, name, tests=('p1', 'n1'), files=('a.c',)):
+        bug = Bug.from_dict({
+            'name': name,
+            'image': 'bugzoo/{}'.format(name),
+            'dataset': None,
+            'program': None,
+            'source': None,
+            'source-location': '/experiment/source',
+            'languages': ['C'],
+            'compiler': {'type': 'simple',
+                         'command': 'make',
+                         'time-limit': 60,
+                         'context': '/experiment/source'},
+            'test-harness': {'tests': list(tests)},
+            'coverage': {'files-to-instrument': list(files)}
+        })
+        self.bugs[name] = bug
+        self.images.ids.setdefault(bug.image, 'sha256:{}'.format(name))
+        return bug
+
+    def coverage(self, tests=('p1', 'n1')):
+        outcome = TestOutcome(ExecResponse(0, 1.0, ''), True)
+        lines = FileLineSet.from_dict({'a.c': [1, 2, 3]})
+        return TestSuiteCoverage({t: TestCoverage(t, outcome, lines)
+                                  for t in tests})
+
+    def test_invalidated_by_key(self):
+        bug = self.bug('foo')
+        self.assertIsNone(self.cache.get(bug))
+        self.cache.put(bug, self.coverage())
+        self.assertIn(bug, self.cache)
+        self.assertEqual(set(self.cache.get(bug)), {'p1', 'n1'})
+
+        # rebuilding the image invalidates the entry
+        self.images.ids[bug.image] = 'sha256:rebuilt'
+        self.assertNotIn(bug, self.cache)
+        self.assertIsNone(self.cache.get(bug))
+        self.assertTrue(self.cache.stats()['entries'][0]['stale'])
+
+        # as does changing the files that are instrumented
+        self.images.ids[bug.image] = 'sha256:foo'
+        self.assertIn(bug, self.cache)
+        self.assertNotIn(self.bug('foo', files=('b.c',)), self.cache)
+
+        # the image must be installed
+        del self.images.ids[bug.image]
+        self.assertNotIn(bug, self.cache)
+
+    def test_put_replaces_stale(self):
+        bug = self.bug('foo')
+        self.cache.put(bug, self.coverage())
+        self.images.ids[bug.image] = 'sha256:rebuilt'
+        self.cache.put(bug, self.coverage())
+        entries = self.cache.entries()
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(entries[0]['key'], self.cache.key(bug))
+
+    def test_prune(self):
+        foo = self.bug('foo')
+        bar = self.bug('bar')
+        self.cache.put(foo, self.coverage())
+        self.cache.put(bar, self.coverage())
+        self.images.ids[bar.image] = 'sha256:rebuilt'
+        removed = self.cache.prune()
+        self.assertEqual([e['bug'] for e in removed], ['bar'])
+        self.assertEqual([e['bug'] for e in self.cache.entries()], ['foo'])
+
+        # entries for unregistered bugs are stale
+        del self.bugs['foo']
+        self.assertEqual(len(self.cache.prune()), 1)
+        self.assertEqual(self.cache.entries(), [])
+
+    def test_evict(self):
+        bugs = [self.bug(name) for name in ('a', 'b', 'c')]
+        for (i, bug) in enumerate(bugs):
+            self.cache.put(bug, self.coverage())
+            fn = self.cache.entries()[-1]['path']
+            os.utime(fn, (time.time() - 10 + i, time.time() - 10 + i))
+        self.cache.get(bugs[0])
+
+        size = self.cache.stats()['size']
+        entry_size = size // 3
+        removed = self.cache.evict(size - 1)
+        self.assertEqual([e['bug'] for e in removed], ['b'])
+
+        self.cache.configure(max_size=entry_size)
+        self.assertEqual([e['bug'] for e in self.cache.entries()], ['a'])
+        os.utime(self.cache.entries()[0]['path'], (0, 0))
+        self.cache.put(bugs[1], self.coverage())
+        self.assertEqual([e['bug'] for e in self.cache.entries()], ['b'])
+
+    def test_migrates_legacy(self):
+        foo = self.bug('foo')
+        bar = self.bug('bar')
+        baz = self.bug('baz')
+        legacy = {'foo': '{}.coverage.yml',
+                  'bar': '{}.coverage.yml',
+                  'baz': '{}.coverage.bin'}
+        for (name, fn) in legacy.items():
+            fn = os.path.join(self.installation.coverage_path,
+                              fn.format(name))
+            tests = ('p1',) if name == 'bar' else ('p1', 'n1')
+            self.coverage(tests).to_file(fn)
+        entries = self.cache.stats()['entries']
+        self.assertEqual([e['key'] for e in entries], [None, None, None])
+        self.assertTrue(all(e['stale'] for e in entries))
+
+        # unkeyed coverage that covers the tests of its bug is migrated
+        self.assertNotIn(foo, self.cache)
+        self.assertEqual(set(self.cache.get(foo)), {'p1', 'n1'})
+        self.assertIn(foo, self.cache)
+        self.assertEqual(set(self.cache.get(baz)), {'p1', 'n1'})
+        self.assertIn(baz, self.cache)
+
+        # but is otherwise discarded
+        self.assertIsNone(self.cache.get(bar))
+        self.assertNotIn(bar, self.cache)
+        entries = self.cache.entries()
+        self.assertEqual(sorted(e['bug'] for e in entries), ['baz', 'foo'])
+        self.assertEqual(sorted(e['key'] for e in entries),
+                         sorted(self.cache.key(b) for b in (baz, foo)))
+
+    def test_prunes_legacy(self):
+        self.bug('foo')
+        fn = os.path.join(self.installation.coverage_path, 'foo.coverage.yml')
+        self.coverage().to_file(fn)
+        self.assertEqual([e['bug'] for e in self.cache.prune()], ['foo'])
+        self.assertEqual(self.cache.entries(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import io
+import os
+import struct
+import tempfile
+import unittest
+
+import yaml
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core import coverage_file
+from bugzoo.core.coverage import TestCoverage, TestSuiteCoverage
+from bugzoo.core.fileline import FileLineSet
+from bugzoo.core.test import TestOutcome
+
+
+class CoverageFileTestCase(unittest.TestCase):
+    def setUp(self):
+        def coverage(test, passed, code, output, lines):
+            response = ExecResponse(code, 0.5, output)
+            return TestCoverage(test,
+                                TestOutcome(response, passed),
+                                FileLineSet.from_dict(lines))
+        self.coverage = TestSuiteCoverage({
+            'p1': coverage('p1', True, 0, 'ok', {'a.c': [1, 2, 300],
+                                                 'b.c': [70000, 4]}),
+            'n1': coverage('n1', False, -9, 'killed', {})
+        })
+        d = tempfile.mkdtemp()
+        self.addCleanup(os.rmdir, d)
+        self.fn = os.path.join(d, 'coverage')
+        self.addCleanup(lambda: os.path.exists(self.fn) and os.remove(self.fn))
+
+    def normalised(self, coverage):
+        d = coverage.to_dict()
+        for test in d.values():
+            test['coverage'] = {fn: sorted(lines)
+                                for (fn, lines) in test['coverage'].items()}
+        return d
+
+    def test_round_trip(self):
+        self.coverage.to_file(self.fn)
+        self.assertTrue(coverage_file.is_coverage_file(self.fn))
+        loaded = TestSuiteCoverage.from_file(self.fn)
+        self.assertEqual(list(loaded), ['p1', 'n1'])
+        self.assertEqual(self.normalised(loaded),
+                         self.normalised(self.coverage))
+
+    def test_yaml(self):
+        with open(self.fn, 'w') as f:
+            yaml.dump(self.coverage.to_dict(), f, default_flow_style=False)
+        self.assertFalse(coverage_file.is_coverage_file(self.fn))
+        loaded = TestSuiteCoverage.from_file(self.fn)
+        self.assertEqual(self.normalised(loaded),
+                         self.normalised(self.coverage))
+
+    def test_rejects_other_versions(self):
+        buff = io.BytesIO()
+        coverage_file.dump(self.coverage.matrix, buff)
+        contents = bytearray(buff.getvalue())
+        struct.pack_into('<H', contents, len(coverage_file.MAGIC),
+                         coverage_file.VERSION + 1)
+        with open(self.fn, 'wb') as f:
+            f.write(contents)
+        with self.assertRaises(ValueError):
+            coverage_file.load(self.fn)
+
+        # truncated files are rejected rather than partially loaded
+        with open(self.fn, 'wb') as f:
+            f.write(buff.getvalue()[:-3])
+        with self.assertRaises(ValueError):
+            coverage_file.load(self.fn)
+
+    def test_rejects_truncated(self):
+        # the file is cut off within the header, the file table, and the
+        # description of each test
+        buff = io.BytesIO()
+        coverage_file.dump(self.coverage.matrix, buff)
+        contents = buff.getvalue()
+        for size in range(len(contents)):
+            with open(self.fn, 'wb') as f:
+                f.write(contents[:size])
+            with self.assertRaises(ValueError, msg="size: {}".format(size)):
+                coverage_file.load(self.fn)
+
+
+if __name__ == '__main__':
+    unittest.main()
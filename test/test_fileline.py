@@ -0,0 +1,46 @@
+import unittest
+
+from bugzoo.core.fileline import FileLine, FileLineSet, FileLineSetBuilder
+
+
+class FileLineSetTestCase(unittest.TestCase):
+    def setUp(self):
+        self.a = FileLineSet.from_dict({'a.c': [1, 2, 3], 'b.c': [4]})
+        self.b = FileLineSet.from_dict({'a.c': [3, 5], 'c.c': [1]})
+
+    def assertLines(self, lines, expected):
+        actual = {fn: set(nums) for (fn, nums) in lines.to_dict().items()}
+        self.assertEqual(actual, expected)
+
+    def test_union(self):
+        expected = {'a.c': {1, 2, 3, 5}, 'b.c': {4}, 'c.c': {1}}
+        self.assertLines(self.a.union(self.b), expected)
+        self.assertLines(FileLineSet.union_all([self.a, self.b]), expected)
+        self.assertLines(FileLineSet.union_all([]), {})
+
+    def test_intersection(self):
+        self.assertLines(self.a.intersection(self.b), {'a.c': {3}})
+        self.assertLines(FileLineSet.intersect_all([self.a, self.b, self.a]),
+                         {'a.c': {3}})
+        self.assertLines(FileLineSet.intersect_all([self.a]),
+                         {'a.c': {1, 2, 3}, 'b.c': {4}})
+        with self.assertRaises(ValueError):
+            FileLineSet.intersect_all([])
+
+    def test_filter(self):
+        filtered = self.a.filter(lambda line: line.num > 2)
+        self.assertLines(filtered, {'a.c': {3}, 'b.c': {4}})
+        self.assertEqual(list(self.a['missing.c']), [])
+
+    def test_builder(self):
+        builder = FileLineSetBuilder()
+        builder.add(FileLine('a.c', 7))
+        builder.add_lines('a.c', [1, 2])
+        builder.update(self.b)
+        self.assertEqual(len(builder), 6)
+        builder.intersection_update(self.a)
+        self.assertLines(builder.build(), {'a.c': {1, 2, 3}})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import gzip
+import io
+import json
+import unittest
+
+from bugzoo.mgr.coverage import parse_gcov_json_report, \
+                                parse_gcov_intermediate_report, \
+                                SourceFileIndex
+
+
+class GcovReportTestCase(unittest.TestCase):
+    def test_json(self):
+        docs = [
+            {'current_working_directory': '/experiment/src',
+             'files': [{'file': 'a.c',
+                        'lines': [{'line_number': 1, 'count': 2},
+                                  {'line_number': 2, 'count': 0},
+                                  {'line_number': 3, 'count': 1}]},
+                       {'file': '../include/b.h',
+                        'lines': [{'line_number': 4, 'count': 0}]}]},
+            {'current_working_directory': '/experiment/src',
+             'files': [{'file': '/usr/include/stdio.h',
+                        'lines': [{'line_number': 9, 'count': 5}]}]}
+        ]
+        s = '\n'.join(json.dumps(d) for d in docs) + '\n'
+        source = io.BytesIO(gzip.compress(s.encode('utf-8')))
+        report = list(parse_gcov_json_report(source))
+        self.assertEqual(report, [('/experiment/src/a.c', {1, 3}),
+                                  ('/usr/include/stdio.h', {9})])
+
+    def test_intermediate(self):
+        s = '\n'.join(['file:src/a.c',
+                       'function:1,1,main',
+                       'lcount:1,1',
+                       'lcount:2,0',
+                       'lcount:3,4,0',
+                       'file:src/b.h',
+                       'lcount:1,0',
+                       '',
+                       'file:src/a.c',
+                       'lcount:5,1'])
+        source = io.BytesIO(s.encode('utf-8'))
+        report = list(parse_gcov_intermediate_report(source))
+        self.assertEqual(report, [('src/a.c', {1, 3}), ('src/a.c', {5})])
+
+    def test_intermediate_json(self):
+        # GCC 9 onwards writes JSON when asked for the intermediate format
+        doc = {'current_working_directory': '/experiment/src',
+               'files': [{'file': 'a.c',
+                          'lines': [{'line_number': 1, 'count': 1},
+                                    {'line_number': 2, 'count': 0}]}]}
+        s = '\n' + json.dumps(doc) + '\n'
+        source = io.BytesIO(s.encode('utf-8'))
+        report = list(parse_gcov_intermediate_report(source))
+        self.assertEqual(report, [('/experiment/src/a.c', {1})])
+
+
+class SourceFileIndexTestCase(unittest.TestCase):
+    def test_resolve(self):
+        index = SourceFileIndex('/experiment/src/',
+                                {'/experiment/src/a.c',
+                                 '/experiment/src/lib/b.h'})
+        self.assertEqual(index.resolve('a.c'), 'a.c')
+        self.assertEqual(index.resolve('build/lib/b.h'), 'lib/b.h')
+        self.assertEqual(index.resolve('/experiment/src/a.c'), 'a.c')
+        self.assertEqual(index.resolve('/experiment/src/lib/b.h'), 'lib/b.h')
+        self.assertEqual(index.resolve('/experiment/src/../src/a.c'), 'a.c')
+        self.assertIsNone(index.resolve('/usr/include/stdio.h'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.test import TestOutcome, TestSuite
+from bugzoo.mgr.container import ContainerManager
+from bugzoo.mgr.history import HistoryManager
+
+
+class HistoryManagerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.bug = mock.Mock()
+        self.bug.name = 'bug'
+        self.test = TestSuite.from_dict({'tests': ['p1']})['p1']
+
+    def record(self, history, duration, passed=True, code=0):
+        outcome = TestOutcome(ExecResponse(code, duration, ''), passed)
+        history.record(self.bug, self.test, outcome)
+
+    def test_estimates(self):
+        history = HistoryManager()
+        self.assertIsNone(history.duration(self.bug, self.test))
+        self.assertIsNone(history.percentile(self.bug, self.test, 90))
+        for d in range(1, 11):
+            self.record(history, float(d), passed=d % 2 == 0)
+        self.assertEqual(history.duration(self.bug, self.test), 5.5)
+        self.assertEqual(history.percentile(self.bug, self.test, 90), 9.0)
+        self.assertEqual(history.percentile(self.bug, self.test, 100), 10.0)
+        self.assertEqual(history.failure_rate(self.bug, self.test), 0.5)
+
+    def test_adaptive_time_limit_ignores_timeouts(self):
+        history = HistoryManager()
+        api = SimpleNamespace(ping=lambda: True)
+        installation = SimpleNamespace(docker=SimpleNamespace(api=api),
+                                       history=history)
+        mgr = ContainerManager(installation)
+        mgr.configure_time_limits(enabled=True,
+                                  percentile=99.0,
+                                  multiplier=3.0,
+                                  floor=1.0,
+                                  min_samples=5)
+
+        # a timeout under the static limit does not count as a sample
+        self.record(history, float(self.test.time_limit), False, code=137)
+        for _ in range(4):
+            self.record(history, 2.0)
+        self.assertEqual(mgr.time_limit(self.bug, self.test),
+                         self.test.time_limit)
+        self.record(history, 2.0)
+        self.assertEqual(mgr.time_limit(self.bug, self.test), 6)
+
+        # repeatedly firing the adaptive limit does not raise it
+        for _ in range(10):
+            limit = mgr.time_limit(self.bug, self.test)
+            self.record(history, limit + 1.0, False, code=124)
+        self.assertEqual(mgr.time_limit(self.bug, self.test), 6)
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'history.db')
+            history = HistoryManager(fn)
+            self.record(history, 1.0)
+            self.record(history, 3.0, passed=False)
+            history.close()
+
+            history = HistoryManager(fn)
+            self.assertEqual(history.num_executions(self.bug, self.test), 2)
+            self.assertEqual(history.duration(self.bug, self.test), 2.0)
+            self.assertEqual(history.failure_rate(self.bug, self.test), 0.5)
+
+    def test_batched_commits(self):
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'history.db')
+            history = HistoryManager(fn)
+            self.addCleanup(history.close)
+            db = sqlite3.connect(fn)
+            self.addCleanup(db.close)
+            count = lambda: \
+                db.execute("SELECT COUNT(*) FROM executions").fetchone()[0]
+
+            with mock.patch.object(HistoryManager, 'COMMIT_INTERVAL', 3):
+                self.record(history, 1.0)
+                self.record(history, 1.0)
+                self.assertEqual(count(), 0)
+                self.record(history, 1.0)
+                self.assertEqual(count(), 3)
+
+            self.record(history, 1.0)
+            history.flush()
+            self.assertEqual(count(), 4)
+
+            # executions are also committed after a period of time
+            with mock.patch.object(HistoryManager, 'COMMIT_PERIOD', 0.01):
+                self.record(history, 1.0)
+            time_end = time.time() + 5
+            while count() < 5 and time.time() < time_end:
+                time.sleep(0.01)
+            self.assertEqual(count(), 5)
+
+    def test_clear_keeps_executions(self):
+        history = HistoryManager()
+        self.record(history, 1.0)
+        history.clear()
+        self.assertEqual(history.num_executions(self.bug, self.test), 1)
+        self.assertEqual(history.stats()['executions'], 1)
+
+    def test_stats(self):
+        history = HistoryManager()
+        for d in range(1, 101):
+            self.record(history, float(d), passed=d > 10)
+        stats = history.test_stats('bug')['p1']
+        self.assertEqual(stats['executions'], 100)
+        self.assertEqual(stats['failures'], 10)
+        self.assertEqual(stats['failure-rate'], 0.1)
+        self.assertEqual(stats['median-duration'], 50.0)
+        self.assertEqual(stats['p95-duration'], 95.0)
+        self.assertEqual(stats['max-duration'], 100.0)
+        summary = history.stats()
+        self.assertEqual(summary['executions'], 100)
+        self.assertEqual(summary['bugs']['bug']['tests'], 1)
+
+    def test_migration(self):
+        with tempfile.TemporaryDirectory() as d:
+            fn = os.path.join(d, 'history.db')
+            db = sqlite3.connect(fn)
+            db.execute("CREATE TABLE executions (bug TEXT NOT NULL, "
+                       "test TEXT NOT NULL, duration REAL NOT NULL, "
+                       "passed INTEGER NOT NULL, timestamp REAL NOT NULL)")
+            db.execute("INSERT INTO executions VALUES ('bug', 'p1', 2.0, 1, 0)")
+            db.commit()
+            db.close()
+
+            history = HistoryManager(fn)
+            self.record(history, 4.0)
+            self.assertEqual(history.duration(self.bug, self.test), 3.0)
+            self.assertEqual(history.test_stats('bug')['p1']['executions'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
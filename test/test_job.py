@@ -0,0 +1,91 @@
+import threading
+import unittest
+
+from bugzoo.core.job import JobStatus
+from bugzoo.exceptions import JobNotCancellable, JobNotFound, TestNotFound
+from bugzoo.mgr.job import JobManager
+
+
+class JobManagerTestCase(unittest.TestCase):
+    def test_result(self):
+        jobs = JobManager(max_workers=1)
+        job = jobs.submit('test', lambda j: j.report(0.5) or 42)
+        self.assertTrue(job.wait(5))
+        status = job.status()
+        self.assertEqual(status.state, JobStatus.SUCCEEDED)
+        self.assertEqual(status.progress, 1.0)
+        self.assertEqual(job.result, 42)
+        self.assertIs(jobs[job.id], job)
+        with self.assertRaises(JobNotFound):
+            jobs['missing']
+
+    def test_failure(self):
+        def fail(job):
+            raise TestNotFound('t1')
+        jobs = JobManager(max_workers=1)
+        job = jobs.submit('test', fail)
+        job.wait(5)
+        self.assertEqual(job.status().state, JobStatus.FAILED)
+        self.assertEqual(job.error['error']['kind'], 'TestNotFound')
+
+    def test_cancel(self):
+        started = threading.Event()
+
+        def loop(job):
+            started.set()
+            while True:
+                job.report(0.1)
+
+        jobs = JobManager(max_workers=1)
+        running = jobs.submit('test', loop)
+        pending = jobs.submit('test', lambda j: 0)
+        started.wait(5)
+
+        # pending jobs are cancelled immediately
+        self.assertTrue(jobs.cancel(pending.id))
+        self.assertEqual(pending.status().state, JobStatus.CANCELLED)
+
+        # running jobs are cancelled when they next report their progress
+        self.assertTrue(jobs.cancel(running.id))
+        self.assertTrue(running.wait(5))
+        self.assertEqual(running.status().state, JobStatus.CANCELLED)
+        self.assertFalse(jobs.cancel(running.id))
+
+    def test_not_cancellable(self):
+        started = threading.Event()
+        release = threading.Event()
+
+        def block(job):
+            started.set()
+            release.wait(5)
+            return 42
+
+        jobs = JobManager(max_workers=1)
+        running = jobs.submit('test', block, cancellable=False)
+        pending = jobs.submit('test', lambda j: 0, cancellable=False)
+        started.wait(5)
+        self.assertFalse(running.status().cancellable)
+        self.assertFalse(running.status().to_dict()['cancellable'])
+
+        # jobs that cannot be cancelled may still be cancelled before they
+        # start, but not while they are running
+        self.assertTrue(jobs.cancel(pending.id))
+        self.assertEqual(pending.status().state, JobStatus.CANCELLED)
+        with self.assertRaises(JobNotCancellable):
+            jobs.cancel(running.id)
+
+        release.set()
+        self.assertTrue(running.wait(5))
+        self.assertEqual(running.status().state, JobStatus.SUCCEEDED)
+        self.assertEqual(running.result, 42)
+
+    def test_retention(self):
+        jobs = JobManager(max_workers=1, max_finished=2)
+        submitted = [jobs.submit('test', lambda j: None) for _ in range(4)]
+        for job in submitted:
+            job.wait(5)
+        self.assertEqual([j.id for j in jobs], [j.id for j in submitted[2:]])
+
+
+if __name__ == '__main__':
+    unittest.main()
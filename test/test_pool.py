@@ -0,0 +1,118 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+from bugzoo.mgr.pool import ContainerPool
+
+
+class FakeContainerManager(object):
+    """
+    Launches fake containers, optionally blocking each launch until it is
+    released.
+    """
+    def __init__(self, block: bool = False) -> None:
+        self.lock = threading.Lock()
+        self.launched = []
+        self.discarded = []
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+
+    def _launch(self, bug, uid, tools, ports, network, volumes):
+        self.release.wait()
+        with self.lock:
+            self.launched.append(uid)
+        return ('dockerc-{}'.format(uid), 'env-{}'.format(uid), None)
+
+    def _discard(self, dockerc, env_file, tools):
+        with self.lock:
+            self.discarded.append(dockerc)
+
+
+def wait_until(predicate, timeout: float = 5.0) -> bool:
+    time_end = time.time() + timeout
+    while time.time() < time_end:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+class ContainerPoolTestCase(unittest.TestCase):
+    def setUp(self):
+        self.bug = SimpleNamespace(name='bug')
+
+    def test_acquire_and_refill(self):
+        mgr = FakeContainerManager()
+        pool = ContainerPool(mgr, size=2)
+        self.addCleanup(pool.clear)
+
+        # the first request misses, and fills the pool
+        self.assertIsNone(pool.acquire(self.bug))
+        self.assertTrue(wait_until(lambda: len(pool) == 2))
+
+        # later requests hit, and the pool is refilled
+        (uid, dockerc, _) = pool.acquire(self.bug)
+        self.assertIn(uid, mgr.launched)
+        self.assertTrue(wait_until(lambda: len(pool) == 2))
+        self.assertEqual(len(mgr.launched), 3)
+        stats = pool.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_max_size(self):
+        mgr = FakeContainerManager()
+        pool = ContainerPool(mgr, size=2, max_size=3)
+        self.addCleanup(pool.clear)
+        pool.warm(self.bug)
+        pool.warm(SimpleNamespace(name='other'))
+        self.assertTrue(wait_until(lambda: len(mgr.launched) == 3))
+        time.sleep(0.05)
+        self.assertEqual(len(pool), 3)
+
+    def test_evict_idle(self):
+        mgr = FakeContainerManager()
+        pool = ContainerPool(mgr, size=1, max_idle=60.0)
+        self.addCleanup(pool.clear)
+        pool.warm(self.bug)
+        self.assertTrue(wait_until(lambda: len(pool) == 1))
+        self.assertEqual(pool.evict_idle(), 0)
+
+        pool.configure(max_idle=0.01)
+        time.sleep(0.02)
+        self.assertEqual(pool.evict_idle(), 1)
+        self.assertEqual(len(pool), 0)
+        self.assertEqual(len(mgr.discarded), 1)
+
+    def test_reaper(self):
+        mgr = FakeContainerManager()
+        pool = ContainerPool(mgr, size=1, max_idle=0.05)
+        self.addCleanup(pool.clear)
+        pool.warm(self.bug)
+        self.assertTrue(wait_until(lambda: len(mgr.launched) == 1))
+        self.assertTrue(wait_until(lambda: len(mgr.discarded) == 1))
+        self.assertEqual(len(pool), 0)
+
+    def test_clear_waits_for_launches(self):
+        mgr = FakeContainerManager(block=True)
+        pool = ContainerPool(mgr, size=2)
+        pool.warm(self.bug)
+
+        cleared = threading.Thread(target=pool.clear)
+        cleared.start()
+        time.sleep(0.05)
+        self.assertTrue(cleared.is_alive())
+
+        # containers that finish launching after the pool was cleared are
+        # destroyed rather than leaked
+        mgr.release.set()
+        cleared.join(5)
+        self.assertFalse(cleared.is_alive())
+        self.assertEqual(len(mgr.launched), 2)
+        self.assertEqual(sorted(mgr.discarded),
+                         sorted('dockerc-{}'.format(u) for u in mgr.launched))
+        self.assertEqual(len(pool), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
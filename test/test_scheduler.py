@@ -0,0 +1,152 @@
+import threading
+import unittest
+from types import SimpleNamespace
+
+from bugzoo.cmd import ExecResponse
+from bugzoo.core.test import TestOutcome, TestSuite
+from bugzoo.mgr.history import HistoryManager
+from bugzoo.mgr.scheduler import TestScheduler
+
+
+class FakeContainerManager(object):
+    """
+    Executes tests in fake containers. Each execution is passed to an
+    optional hook, which may raise an exception or crash the container.
+    """
+    def __init__(self, hook=None) -> None:
+        self.lock = threading.Lock()
+        self.hook = hook
+        self.alive = set()
+        self.provisioned = []
+        self.deleted = []
+        self.executed = []
+
+    def provision(self, bug):
+        with self.lock:
+            uid = 'c{}'.format(len(self.provisioned))
+            self.provisioned.append(uid)
+            self.alive.add(uid)
+        return SimpleNamespace(uid=uid, bug=bug.name)
+
+    def execute(self, container, test):
+        with self.lock:
+            self.executed.append((container.uid, test.name))
+        if self.hook:
+            self.hook(self, container, test)
+        return TestOutcome(ExecResponse(0, 1.0, ''), True)
+
+    def is_alive(self, container):
+        return container.uid in self.alive
+
+    def __delitem__(self, uid):
+        with self.lock:
+            self.deleted.append(uid)
+
+
+class TestSchedulerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.bug = SimpleNamespace(name='bug')
+        suite = TestSuite.from_dict({'tests': ['t1', 't2', 't3', 't4']})
+        self.tests = [suite[name] for name in ('t1', 't2', 't3', 't4')]
+
+    def scheduler(self, mgr):
+        self.history = HistoryManager()
+        installation = SimpleNamespace(containers=mgr, history=self.history)
+        return TestScheduler(installation)
+
+    def record(self, test, duration, passed=True):
+        outcome = TestOutcome(ExecResponse(0, duration, ''), passed)
+        self.history.record(self.bug, test, outcome)
+
+    def test_lpt_order(self):
+        mgr = FakeContainerManager()
+        scheduler = self.scheduler(mgr)
+        (t1, t2, t3, t4) = self.tests
+        self.record(t1, 1.0)
+        self.record(t2, 5.0)
+        self.record(t3, 3.0)
+
+        # t4 hasn't been executed before, and takes the mean duration
+        order = scheduler.order(self.bug, self.tests)
+        self.assertEqual([t.name for t in order], ['t2', 't3', 't4', 't1'])
+
+        outcomes = scheduler.run(self.bug, self.tests, num_containers=1)
+        self.assertEqual(set(outcomes), {'t1', 't2', 't3', 't4'})
+        self.assertEqual([name for (_, name) in mgr.executed],
+                         ['t2', 't3', 't4', 't1'])
+        self.assertEqual(mgr.deleted, ['c0'])
+
+    def test_prioritize(self):
+        scheduler = self.scheduler(FakeContainerManager())
+        (t1, t2, t3, t4) = self.tests
+        for _ in range(4):
+            self.record(t1, 1.0)
+            self.record(t2, 1.0, passed=False)
+            self.record(t3, 10.0, passed=False)
+
+        # t2 fails as often as t3 but is quicker, and t4 hasn't been executed
+        # before, so it is given an even chance of failing
+        order = scheduler.prioritize(self.bug, self.tests)
+        self.assertEqual([t.name for t in order], ['t2', 't1', 't4', 't3'])
+
+    def test_requeues_failed_test(self):
+        failed = []
+
+        def hook(mgr, container, test):
+            if test.name == 't2' and not failed:
+                failed.append(test.name)
+                raise Exception("failed to execute test")
+
+        mgr = FakeContainerManager(hook)
+        scheduler = self.scheduler(mgr)
+        outcomes = scheduler.run(self.bug, self.tests, num_containers=1)
+        self.assertEqual(set(outcomes), {'t1', 't2', 't3', 't4'})
+        self.assertEqual([name for (_, name) in mgr.executed].count('t2'), 2)
+        self.assertEqual(mgr.provisioned, ['c0'])
+
+    def test_gives_up_after_max_attempts(self):
+        def hook(mgr, container, test):
+            if test.name == 't2':
+                raise Exception("failed to execute test")
+
+        mgr = FakeContainerManager(hook)
+        scheduler = self.scheduler(mgr)
+        with self.assertRaises(Exception):
+            scheduler.run(self.bug, self.tests, num_containers=1)
+        self.assertEqual([name for (_, name) in mgr.executed].count('t2'),
+                         TestScheduler.MAX_ATTEMPTS)
+        self.assertEqual(mgr.deleted, ['c0'])
+
+    def test_replaces_crashed_container(self):
+        def hook(mgr, container, test):
+            if container.uid == 'c0' and test.name == 't3':
+                mgr.alive.discard(container.uid)
+                raise Exception("container crashed")
+
+        mgr = FakeContainerManager(hook)
+        scheduler = self.scheduler(mgr)
+        outcomes = scheduler.run(self.bug, self.tests, num_containers=1)
+        self.assertEqual(set(outcomes), {'t1', 't2', 't3', 't4'})
+        self.assertEqual(mgr.provisioned, ['c0', 'c1'])
+        self.assertIn(('c1', 't3'), mgr.executed)
+        self.assertEqual(sorted(mgr.deleted), ['c0', 'c1'])
+
+    def test_borrowed_containers_are_not_replaced(self):
+        def hook(mgr, container, test):
+            if container.uid == 'b0':
+                mgr.alive.discard(container.uid)
+                raise Exception("container crashed")
+
+        mgr = FakeContainerManager(hook)
+        mgr.alive.update({'b0', 'b1'})
+        scheduler = self.scheduler(mgr)
+        borrowed = [SimpleNamespace(uid=uid, bug='bug')
+                    for uid in ('b0', 'b1')]
+        outcomes = scheduler.run(self.bug, self.tests, containers=borrowed)
+        self.assertEqual(set(outcomes), {'t1', 't2', 't3', 't4'})
+        self.assertEqual(mgr.provisioned, [])
+        self.assertEqual(mgr.deleted, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
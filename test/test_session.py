@@ -0,0 +1,70 @@
+import socket
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from bugzoo.core.container import Container
+from bugzoo.mgr.container import ContainerManager
+from bugzoo.mgr.session import ShellSession
+
+
+class HangingDockerAPI(object):
+    """
+    Provides shell sessions that never respond to their commands.
+    """
+    def __init__(self) -> None:
+        self.shells = []
+
+    def ping(self) -> bool:
+        return True
+
+    def exec_create(self, id_container, cmd, **kwargs):
+        return {'Id': str(len(self.shells))}
+
+    def exec_start(self, exec_id, **kwargs):
+        assert kwargs.get('socket')
+        (ours, theirs) = socket.socketpair()
+        self.shells.append(theirs)
+        return ours
+
+
+class ShellSessionTimeoutTestCase(unittest.TestCase):
+    def setUp(self):
+        self.api = HangingDockerAPI()
+        bug = SimpleNamespace(name='bug', source_dir='/experiment/source')
+        installation = SimpleNamespace(docker=SimpleNamespace(api=self.api),
+                                       bugs={'bug': bug})
+        self.mgr = ContainerManager(installation)
+        self.mgr.use_sessions = True
+        self.addCleanup(self.mgr.clear)
+        self.container = Container(bug='bug', uid='c1', tools=[])
+
+    def command(self):
+        return self.mgr.command(self.container, 'sleep 100',
+                                context='/',
+                                time_limit=1,
+                                kill_after=0)
+
+    def is_closed(self, shell) -> bool:
+        shell.settimeout(1)
+        while True:
+            data = shell.recv(4096)
+            if not data:
+                return True
+
+    @mock.patch.object(ShellSession, 'GRACE_PERIOD', 0.0)
+    def test_time_limit_exceeded(self):
+        response = self.command()
+        self.assertEqual(response.code, 137)
+        self.assertEqual(len(self.api.shells), 1)
+        self.assertTrue(self.is_closed(self.api.shells[0]))
+
+        # the next command launches a fresh session
+        self.command()
+        self.assertEqual(len(self.api.shells), 2)
+        for shell in self.api.shells:
+            shell.close()
+
+
+if __name__ == '__main__':
+    unittest.main()